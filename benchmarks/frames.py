@@ -0,0 +1,47 @@
+"""
+Compares copying websocket payloads with handling them as views, on both the sending and receiving side.
+
+Usage: python benchmarks/frames.py
+"""
+import timeit
+import os
+
+from subway.websockets import WebSocketFrame, WebSocketOpcode, WebSocketParser
+
+SIZES = (256, 4096, 65536, 1024 * 1024)
+
+def measure(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+def encode(data: memoryview) -> None:
+    WebSocketFrame.create(data, opcode=WebSocketOpcode.BINARY).encode()
+
+def encode_header(data: memoryview) -> None:
+    WebSocketFrame.create(data, opcode=WebSocketOpcode.BINARY).encode_header(len(data))
+
+def parse(encoded: bytes) -> None:
+    for frame in WebSocketParser().feed(encoded):
+        frame.data
+
+def parse_copy(encoded: bytes) -> None:
+    for frame in WebSocketParser().feed(encoded):
+        frame.payload.tobytes()
+
+def bench() -> None:
+    print(f'{"size":>10} {"encode":>12} {"header":>12} {"parse":>12} {"parse+copy":>12}  (microseconds)')
+    for size in SIZES:
+        data = memoryview(os.urandom(size))
+        encoded = bytes(WebSocketFrame.create(data, opcode=WebSocketOpcode.BINARY).encode(masked=True))
+        number = max(1, 2_000_000 // (size + 64))
+
+        results = [
+            measure(lambda: encode(data), number),
+            measure(lambda: encode_header(data), number),
+            measure(lambda: parse(encoded), number),
+            measure(lambda: parse_copy(encoded), number),
+        ]
+
+        print(f'{size:>10} ' + ' '.join(f'{result:>12.2f}' for result in results))
+
+if __name__ == '__main__':
+    bench()
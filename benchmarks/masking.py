@@ -0,0 +1,47 @@
+"""
+Compares websocket payload masking across payload sizes.
+
+Usage: python benchmarks/masking.py
+"""
+import timeit
+import os
+
+from subway.websockets import frame
+from subway.websockets.frame import WebSocketFrame
+
+SIZES = (16, 256, 4096, 65536, 1024 * 1024)
+
+def bytewise(data: bytes, mask: bytes) -> bytes:
+    return bytes([data[i] ^ mask[i % 4] for i in range(len(data))])
+
+def measure(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+def bench() -> None:
+    mask = os.urandom(4)
+    has_numpy = frame.HAS_NUMPY
+
+    print(f'{"size":>10} {"bytewise":>12} {"int":>12} {"numpy":>12} {"mask_into":>12}  (microseconds)')
+    for size in SIZES:
+        data = os.urandom(size)
+        buffer = bytearray(size)
+        number = max(1, 2_000_000 // (size + 64))
+
+        results = [measure(lambda: bytewise(data, mask), max(1, number // 50))]
+
+        frame.HAS_NUMPY = False
+        results.append(measure(lambda: WebSocketFrame.mask(data, mask), number))
+
+        if has_numpy:
+            frame.HAS_NUMPY = True
+            results.append(measure(lambda: WebSocketFrame.mask(data, mask), number))
+        else:
+            results.append(float('nan'))
+
+        frame.HAS_NUMPY = has_numpy
+        results.append(measure(lambda: WebSocketFrame.mask_into(data, mask, buffer), number))
+
+        print(f'{size:>10} ' + ' '.join(f'{result:>12.2f}' for result in results))
+
+if __name__ == '__main__':
+    bench()
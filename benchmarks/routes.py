@@ -0,0 +1,53 @@
+"""
+Measures how long it takes to register and compile a large amount of routes.
+
+Usage: python benchmarks/routes.py [amount]
+"""
+import time
+import sys
+
+import subway
+
+async def callback(request: subway.Request) -> str:
+    return 'Hello, world!'
+
+def build(router: subway.Router, amount: int):
+    routes = []
+    for i in range(amount):
+        path = f'/static/{i}' if i % 2 else f'/users/{i}/{{id}}'
+        routes.append(router.create_route(callback, path, 'GET', name=f'route_{i}'))
+
+    return routes
+
+def bench(amount: int) -> None:
+    router = subway.Router()
+    routes = build(router, amount)
+
+    start = time.perf_counter()
+    for route in routes:
+        router.add_route(route)
+    single = time.perf_counter() - start
+
+    router = subway.Router()
+    routes = build(router, amount)
+
+    start = time.perf_counter()
+    router.add_routes(routes)
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    router.compile()
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    router.resolve(f'/users/{amount - 2}/1', 'GET')
+    resolved = time.perf_counter() - start
+
+    print(f'{amount} routes')
+    print(f'  add_route:  {single * 1000:.2f}ms')
+    print(f'  add_routes: {bulk * 1000:.2f}ms')
+    print(f'  compile:    {compiled * 1000:.2f}ms')
+    print(f'  resolve:    {resolved * 1000:.2f}ms (worst case, uncached)')
+
+if __name__ == '__main__':
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -21,5 +21,6 @@ from .listeners import *
 from .base import *
 from .blueprints import *
 from .converters import *
+from .accesslog import *
 
 from . import websockets, compat, server, http, models, streams
\ No newline at end of file
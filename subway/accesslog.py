@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, NamedTuple, Optional, TextIO, Union
+import collections
+import threading
+import random
+import time
+import sys
+import os
+
+if TYPE_CHECKING:
+    from .request import Request
+    from .app import Application
+
+__all__ = (
+    'AccessLogRecord',
+    'AccessLogger',
+    'DEFAULT_ACCESS_LOG_FORMAT',
+)
+
+DEFAULT_ACCESS_LOG_FORMAT = '{time} "{method} {path}" {status} {size} {duration:.6f}\n'
+
+class AccessLogRecord(NamedTuple):
+    """
+    A compact record of a single handled request.
+
+    Attributes
+    ----------
+    timestamp: :class:`float`
+        The time the request finished at, as returned by :func:`time.time`.
+    method: :class:`str`
+        The HTTP method of the request.
+    path: :class:`str`
+        The raw request target, including the query string.
+    status: Optional[:class:`int`]
+        The status code sent to the client, ``None`` if nothing was sent.
+    size: :class:`int`
+        The number of bytes sent to the client.
+    duration: :class:`float`
+        The time it took to handle the request, in seconds.
+    """
+    timestamp: float
+    method: str
+    path: str
+    status: Optional[int]
+    size: int
+    duration: float
+
+class AccessLogger:
+    """
+    An access logger that keeps the event loop free of any I/O.
+
+    Records are appended to an in-memory buffer and written out in batches by a background thread.
+
+    Parameters
+    ----------
+    file: Optional[Union[:class:`str`, :class:`os.PathLike`, :class:`typing.TextIO`]]
+        A path to append the logs to or an already opened text stream. Defaults to :data:`sys.stdout`.
+    format: Union[:class:`str`, Callable[[:class:`~.AccessLogRecord`], :class:`str`]]
+        A format string used with :meth:`str.format`, or a callable that takes in a record and returns a line.
+        The format string has access to all of the record's fields along with ``time``, a formatted timestamp.
+    time_format: :class:`str`
+        The format passed into :func:`time.strftime` to build ``time``.
+    buffer_size: :class:`int`
+        The maximum amount of records held in memory before they are flushed.
+    batch_size: :class:`int`
+        The amount of buffered records that wakes up the background thread before ``flush_interval`` elapses.
+    flush_interval: :class:`float`
+        The maximum amount of seconds a record stays in the buffer.
+    sample_rate: :class:`float`
+        The fraction of requests that get logged, between 0 and 1.
+    drop_on_full: :class:`bool`
+        Whether to drop records when the buffer is full. If set to ``False``, the caller waits
+        for the background thread to make room which can stall the event loop.
+
+    Attributes
+    ----------
+    dropped: :class:`int`
+        The amount of records that were dropped because the buffer was full.
+    """
+    def __init__(
+        self,
+        file: Optional[Union[str, os.PathLike[str], TextIO]] = None,
+        *,
+        format: Union[str, Callable[[AccessLogRecord], str]] = DEFAULT_ACCESS_LOG_FORMAT,
+        time_format: str = '%d/%b/%Y:%H:%M:%S',
+        buffer_size: int = 8192,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        sample_rate: float = 1.0,
+        drop_on_full: bool = True
+    ) -> None:
+        if buffer_size <= 0:
+            raise ValueError('buffer_size must be a positive integer')
+
+        if not 0 <= sample_rate <= 1:
+            raise ValueError('sample_rate must be between 0 and 1')
+
+        self.file = file
+        self.format = format
+        self.time_format = time_format
+        self.buffer_size = buffer_size
+        self.batch_size = min(batch_size, buffer_size)
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.drop_on_full = drop_on_full
+        self.dropped = 0
+
+        self._buffer: Deque[AccessLogRecord] = collections.deque()
+        self._wakeup = threading.Event()
+        self._not_full = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stream: Optional[TextIO] = None
+        self._owns_stream = False
+        self._running = False
+
+    def __repr__(self) -> str:
+        return f'<AccessLogger running={self._running} buffered={len(self._buffer)} dropped={self.dropped}>'
+
+    def _open(self) -> TextIO:
+        file = self.file
+        if file is None:
+            return sys.stdout
+
+        if isinstance(file, (str, os.PathLike)):
+            self._owns_stream = True
+            return open(file, 'a', encoding='utf-8')
+
+        return file
+
+    def _format(self, record: AccessLogRecord) -> str:
+        if callable(self.format):
+            return self.format(record)
+
+        values: Dict[str, Any] = record._asdict()
+        values['time'] = time.strftime(self.time_format, time.localtime(record.timestamp))
+
+        if values['status'] is None:
+            values['status'] = '-'
+
+        return self.format.format_map(values)
+
+    def _flush(self) -> None:
+        buffer = self._buffer
+        if not buffer:
+            return
+
+        records: List[AccessLogRecord] = []
+        while buffer:
+            records.append(buffer.popleft())
+
+        if not self.drop_on_full:
+            with self._not_full:
+                self._not_full.notify_all()
+
+        stream = self._stream
+        if stream is None:
+            return
+
+        stream.write(''.join([self._format(record) for record in records]))
+        stream.flush()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            self._flush()
+
+        self._flush()
+
+    def is_running(self) -> bool:
+        """
+        True if the background thread is running.
+        """
+        return self._running
+
+    def start(self) -> None:
+        """
+        Starts the background thread that writes out the records.
+        """
+        if self._running:
+            return
+
+        self._stream = self._open()
+        self._running = True
+
+        self._thread = thread = threading.Thread(target=self._run, name='subway-access-log', daemon=True)
+        thread.start()
+
+    def close(self) -> None:
+        """
+        Stops the background thread after flushing whatever is left in the buffer.
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._wakeup.set()
+
+        with self._not_full:
+            self._not_full.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+
+        self._stream = None
+        self._owns_stream = False
+
+    def log(self, request: Request[Application], duration: float) -> None:
+        """
+        Records a handled request.
+
+        Parameters
+        ----------
+        request: :class:`~subway.Request`
+            The request that was handled.
+        duration: :class:`float`
+            The time it took to handle the request, in seconds.
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+
+        record = AccessLogRecord(
+            time.time(),
+            request.method,
+            request._url,
+            request._response_status,
+            request._response_size,
+            duration
+        )
+        self.append(record)
+
+    def append(self, record: AccessLogRecord) -> None:
+        """
+        Appends a record to the buffer. This never blocks unless ``drop_on_full`` is ``False``.
+
+        Parameters
+        ----------
+        record: :class:`~.AccessLogRecord`
+            The record to append.
+        """
+        buffer = self._buffer
+
+        if len(buffer) >= self.buffer_size:
+            if self.drop_on_full:
+                self.dropped += 1
+                return
+
+            self._wakeup.set()
+            with self._not_full:
+                while len(buffer) >= self.buffer_size and self._running:
+                    self._not_full.wait()
+
+        buffer.append(record)
+        if len(buffer) >= self.batch_size:
+            self._wakeup.set()
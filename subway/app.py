@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Literal, Optional, Set, Type, TypeVar, Union, AsyncIterator, overload
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple, Type, TypeVar, Union, AsyncIterator, overload
 import datetime
 import inspect
 import logging
@@ -27,14 +27,15 @@ from .types import (
 )
 from .errors import BadLiteralArgument, FailedConversion, RequestMiddlewareFailed, RegistrationError
 from .response import Response, JSONResponse, FileResponse, HTMLResponse, StreamResponse
-from .objects import PartialRoute, Route, Listener, WebSocketRoute, Middleware
+from .objects import PartialRoute, Route, Listener, WebSocketRoute, Middleware, MiddlewareType
 from .converters import AbstractParameterConverter, AbstractBodyConverter
 from .responses import redirects, HTTPException, InternalServerError, Redirection
 from .models import Model, IncompatibleType, MissingField
-from .websockets import WebSocket, WebSocketProtocol
+from .websockets import WebSocket, WebSocketProtocol, PerMessageDeflate, WebSocketRegistry, BroadcastBackend
 from .views import HTTPView, WebSocketHTTPView
 from .router import Router, ResolvedRoute
 from .settings import Settings, Config
+from .accesslog import AccessLogger
 from .base import BaseApplication
 from .blueprints import Blueprint
 from .blueprints import Blueprint
@@ -103,6 +104,22 @@ class Application(BaseApplication):
         An optional bool indicating whether to reuse the port.
     connection_read_timeout: :class:`float`
         An optional integer representing the connection read timeout.
+    access_log: :class:`~.AccessLogger`
+        An optional access logger that records every handled request.
+        It is started and closed along with the application.
+    websocket_compression: :class:`~subway.websockets.PerMessageDeflate`
+        Optional permessage-deflate options, used to compress websocket messages with clients that support it.
+    websocket_ping_interval: Optional[:class:`float`]
+        How many seconds a websocket can go without receiving anything before it is pinged. 
+        Defaults to ``None``, meaning websockets are never pinged.
+    websocket_ping_timeout: Optional[:class:`float`]
+        How many seconds a pinged websocket has to respond before it is closed. Defaults to 20 seconds.
+    websocket_shutdown_timeout: Optional[:class:`float`]
+        How many seconds open websockets are given to close when the application shuts down,
+        after which they are aborted. Defaults to 10 seconds.
+    websocket_broadcast_backend: Optional[:class:`~subway.websockets.BroadcastBackend`]
+        A backend used by :attr:`websocket_registry` to deliver broadcasts to the websockets of other processes.
+        It is started and closed along with the application.
 
     Raises
     ------
@@ -135,6 +152,16 @@ class Application(BaseApplication):
         A `ssl.SSLContext` instance.
     cookie_session_callback: Callable[[:class:`~.Request`, :class:`~.Response`], Any]
         A callback that gets called whenever there is a need to generate a cookie header value for responses.
+    access_log: Optional[:class:`~.AccessLogger`]
+        The access logger used to record handled requests.
+    websocket_compression: Optional[:class:`~subway.websockets.PerMessageDeflate`]
+        The permessage-deflate options accepted during websocket handshakes.
+    websocket_ping_interval: Optional[:class:`float`]
+        The ping interval given to new websockets.
+    websocket_ping_timeout: Optional[:class:`float`]
+        The ping timeout given to new websockets.
+    websocket_shutdown_timeout: Optional[:class:`float`]
+        How many seconds open websockets are given to close on shutdown.
     config: :class:`dict`
         A dict letting users store custom configuration.
     """
@@ -170,6 +197,12 @@ class Application(BaseApplication):
         reuse_host: bool = True,
         reuse_port: bool = False,
         connection_read_timeout: float = 5.0,
+        access_log: Optional[AccessLogger] = None,
+        websocket_compression: Optional[PerMessageDeflate] = None,
+        websocket_ping_interval: Optional[float] = None,
+        websocket_ping_timeout: Optional[float] = 20.0,
+        websocket_shutdown_timeout: Optional[float] = 10.0,
+        websocket_broadcast_backend: Optional[BroadcastBackend] = None,
     ) -> None:
         if ipv6 and host is None:
             host = utils.LOCALHOST_V6
@@ -188,6 +221,11 @@ class Application(BaseApplication):
         self.router = Router(url_prefix)
         self.worker_count = self.settings.worker_count if worker_count is None else worker_count
         self.connection_read_timeout = connection_read_timeout
+        self.access_log = access_log
+        self.websocket_compression = websocket_compression
+        self.websocket_ping_interval = websocket_ping_interval
+        self.websocket_ping_timeout = websocket_ping_timeout
+        self.websocket_shutdown_timeout = websocket_shutdown_timeout
         self.config = Config()
 
         if cookie_session_callback is not None and not callable(cookie_session_callback):
@@ -200,6 +238,8 @@ class Application(BaseApplication):
         self._backlog = backlog or self.settings.backlog
         self._use_ssl = ssl
         self._listeners: Dict[str, List[Listener]] = {}
+        self._event_listeners: Dict[str, Tuple[Listener, ...]] = {}
+        self._dispatch_waiter: Optional[asyncio.Future[Any]] = None
         self._resources: Dict[str, Resource] = {}
         self._blueprints: Dict[str, Blueprint] = {}
         self._views: Dict[str, HTTPView] = {}
@@ -211,7 +251,8 @@ class Application(BaseApplication):
         self._reuse_host = reuse_host
         self._reuse_port = reuse_port
         self._response_middlewares: List[ResponseMiddleware] = []
-        self._websockets: Set[WebSocket] = set()
+        self._websockets = WebSocketRegistry(backend=websocket_broadcast_backend)
+        self._base_urls: Dict[Tuple[Any, ...], str] = {}
 
         if not reuse_host:
             self.worker_count = 1
@@ -273,23 +314,30 @@ class Application(BaseApplication):
         if not route:
             raise ValueError(f'Route {path!r} not found for {name!r} resource')
 
-        return route.path
+        return route.raw_path
 
-    def _find_path(self, path: str):
-        if route := self._find_url_from_views(path):
-            return route
+    def _find_route(self, path: str) -> Optional[Route]:
+        router = self.router
 
-        if route := self._find_url_from_resources(path):
+        route = router.get_route_by_path(path) or router.get_route_by_name(path)
+        if route is not None:
             return route
 
-        return path
+        if real := self._find_url_from_views(path):
+            return router.get_route_by_path(real)
 
-    def _build_url(self, path: str, is_websocket: bool = False, ignore: bool = False) -> URL:
-        real = self._find_path(path)
+        if real := self._find_url_from_resources(path):
+            return router.get_route_by_path(real)
 
-        if real not in self.paths:
-            if not ignore:
-                raise ValueError(f'Path {path!r} does not exist')
+        return None
+
+    def _get_base_url(self, is_websocket: bool) -> str:
+        settings = self.settings
+        key = (is_websocket, settings.host, settings.port, settings.ssl, settings.ipv6)
+
+        base = self._base_urls.get(key)
+        if base is not None:
+            return base
 
         scheme = 'ws' if is_websocket else 'http'
         if self.is_ssl():
@@ -300,7 +348,27 @@ class Application(BaseApplication):
         else:
             base = f'{scheme}://{self.host}:{self.port}'
 
-        return URL(base + real)
+        self._base_urls[key] = base
+        return base
+
+    def _build_url(
+        self, 
+        path: str, 
+        is_websocket: bool = False, 
+        ignore: bool = False,
+        params: Optional[Dict[str, Any]] = None
+    ) -> URL:
+        route = self._find_route(path)
+
+        if route is None:
+            if not ignore:
+                raise ValueError(f'Path {path!r} does not exist')
+
+            real = path
+        else:
+            real = route.path_builder.build(params or {})
+
+        return URL(self._get_base_url(is_websocket) + real)
 
     def _create_workers(self):
         workers: Dict[int, Worker] = {}
@@ -429,20 +497,23 @@ class Application(BaseApplication):
         request: Request[Application], 
         route: Route, kwargs: Dict[str, Any]
     ) -> Any:
-        middlewares = route.request_middlewares.copy()
-        middlewares.extend(self.request_middlewares)
+        middlewares = route.get_middleware_chain(MiddlewareType.request, self.router)
+        if not middlewares:
+            return True
 
-        result = await asyncio.gather(*[middleware(request, route, **kwargs) for middleware in middlewares])
-        ret = list(result)
+        for middleware in middlewares:
+            ret = await middleware(request, route, **kwargs)
 
-        response = utils.find(lambda x: isinstance(x, Response), ret)
-        if response:
-            ret.remove(response)
+            if isinstance(ret, Response):
+                await request.send(ret)
+                await request.close()
 
-            await request.send(response)
-            return True
+                return True
 
-        return all(ret)
+            if not ret:
+                return False
+
+        return True
 
     async def _run_response_middlewares(
         self, 
@@ -450,12 +521,10 @@ class Application(BaseApplication):
         response: Response,
         route: Route
     ) -> Any:
-        middlewares = route.response_middlewares.copy()
-        middlewares.extend(self.response_middlewares)
+        middlewares = route.get_middleware_chain(MiddlewareType.response, self.router)
 
-        return await asyncio.gather(
-            *[middleware(request, response, route) for middleware in middlewares],
-        )
+        for middleware in middlewares:
+            await middleware(request, response, route)
 
     async def _handle_websocket_connection(
         self, 
@@ -466,13 +535,19 @@ class Application(BaseApplication):
         reader = request.get_reader()
         proto: Any = request.writer.get_protocol()
 
-        protocol = WebSocketProtocol(reader, request.writer, proto.waiter)
+        protocol = WebSocketProtocol(reader, request.writer, proto.waiter, websocket)
 
         request.writer.set_protocol(protocol)
         await protocol.wait_until_connected()
 
         self._websockets.add(websocket)
 
+        if self.websocket_ping_interval is not None:
+            websocket.ping_interval = self.websocket_ping_interval
+            websocket.ping_timeout = self.websocket_ping_timeout
+
+            request.worker.heartbeat.add(websocket)
+
         self.dispatch('websocket', route, request, websocket)
         self.loop.create_task(route(request, websocket))
 
@@ -495,7 +570,7 @@ class Application(BaseApplication):
 
                 return
 
-        listeners = self._get_listeners('on_error')
+        listeners = self._get_event_listeners('error')
         await asyncio.gather(*[listener(request, exc, route) for listener in listeners], return_exceptions=True)
 
     async def _request_handler(self, request: Request[Application], websocket: Optional[WebSocket]):
@@ -991,7 +1066,7 @@ class Application(BaseApplication):
         A set of all URLs.
         """
         return {
-            self._build_url(route.path, is_websocket=isinstance(route, WebSocketRoute))
+            URL(self._get_base_url(route.is_websocket()) + route.raw_path)
             for route in self.router
         }
 
@@ -1004,11 +1079,24 @@ class Application(BaseApplication):
 
     @property
     def websockets(self) -> List[WebSocket]:
-        return [websocket for websocket in self._websockets if not websocket.is_closed()]
+        """
+        A list of all the open websockets.
+        """
+        return list(self._websockets)
+
+    @property
+    def websocket_registry(self) -> WebSocketRegistry:
+        """
+        The :class:`~subway.websockets.WebSocketRegistry` every websocket accepted by the application is added to.
+        Closed websockets are removed from it automatically.
+        """
+        return self._websockets
 
     def url_for(self, path: str, *, is_websocket: bool = False, **kwargs: Any) -> URL:
         """
         Builds a URL for a given path and returns it.
+        Routes are looked up by their raw path (e.g. ``/users/{id}``), their name, the path of a view or
+        ``resource_name.path`` for resources, without going through the whole route table.
 
         Parameters
         ----------
@@ -1017,9 +1105,14 @@ class Application(BaseApplication):
         is_websocket: :class:`bool`
             Whether the path is a websocket path.
         **kwargs: 
-            Additional arguments to build the URL.
+            The values of the route's path parameters. They are converted to strings and percent-encoded.
+
+        Raises
+        ------
+        ValueError
+            If no route was found for ``path`` or a path parameter is missing.
         """
-        url = self._build_url(path.format(**kwargs), is_websocket=is_websocket)
+        url = self._build_url(path, is_websocket=is_websocket, params=kwargs)
         return url
 
     def is_closed(self) -> bool:
@@ -1093,6 +1186,13 @@ class Application(BaseApplication):
         if not self.workers:
             raise ValueError('No workers have been added to the application')
 
+        self.router.compile()
+
+        if self.access_log is not None:
+            self.access_log.start()
+
+        await self._websockets.start_backend()
+
         for worker in self.workers:
             await worker.serve()
 
@@ -1118,8 +1218,8 @@ class Application(BaseApplication):
         """
         Closes the application with no further cleanup.
         """
-        for websocket in self.websockets:
-            await websocket.close()
+        await self._websockets.close_all(timeout=self.websocket_shutdown_timeout)
+        await self._websockets.close_backend()
 
         for worker in self.workers:
             await worker.close()
@@ -1130,6 +1230,9 @@ class Application(BaseApplication):
         if self.socket and not utils.socket_is_closed(self.socket):
             self.socket.shutdown(socket.SHUT_RDWR)
             self.socket.close()
+
+        if self.access_log is not None:
+            await compat.run_in_thread(self.access_log.close)
         
         self.dispatch('shutdown')
 
@@ -1156,6 +1259,7 @@ class Application(BaseApplication):
         """
         self._workers.clear()
         self._listeners.clear()
+        self._invalidate_event_listeners()
         self._lifespan_tasks.clear()
 
         self.router.clear()
@@ -1256,6 +1360,7 @@ class Application(BaseApplication):
         listeners = self._listeners.setdefault(name, [])
         listeners.append(listener)
 
+        self._invalidate_event_listeners()
         return listener
 
     def remove_event_listener(self, listener: Listener) -> Listener:
@@ -1268,6 +1373,8 @@ class Application(BaseApplication):
             The listener to remove.
         """
         self._listeners[listener.event].remove(listener)
+        self._invalidate_event_listeners()
+
         return listener
 
     def add_status_code_handler(
@@ -1351,11 +1458,15 @@ class Application(BaseApplication):
             await listener(*args, **kwargs)
         except Exception as e:
             try:
-                listeners = self._get_listeners('on_event_error')
+                listeners = self._get_event_listeners('event_error')
                 await asyncio.gather(*[callback(listener, e) for callback in listeners])
             except:
                 pass
 
+    async def _run_listeners(self, listeners: Tuple[Listener, ...], *args: Any, **kwargs: Any):
+        for listener in listeners:
+            await self._run_listener(listener, *args, **kwargs)
+
     def _get_listeners(self, name: str) -> List[Listener]:
         try:
             listeners = self._listeners[name]
@@ -1369,10 +1480,32 @@ class Application(BaseApplication):
 
         return listeners
 
+    def _get_event_listeners(self, name: str) -> Tuple[Listener, ...]:
+        try:
+            return self._event_listeners[name]
+        except KeyError:
+            listeners = self._event_listeners[name] = tuple(self._get_listeners('on_' + name))
+            return listeners
+
+    def _invalidate_event_listeners(self) -> None:
+        self._event_listeners.clear()
+
+    def _get_dispatch_waiter(self) -> asyncio.Future[Any]:
+        future = self._dispatch_waiter
+        if future is None or future.get_loop() is not self.loop:
+            future = self._dispatch_waiter = self.loop.create_future()
+            future.set_result([])
+
+        return future
+
     def dispatch(self, name: str, *args: Any, **kwargs: Any) -> 'asyncio.Future[Any]':
         """
         Dispatches an event.
 
+        The listeners of an event are looked up once and cached until a listener gets added or removed,
+        so dispatching an event nobody listens to costs next to nothing. If there are listeners, they
+        are run one after the other inside of a single task.
+
         Example
         ---------
 
@@ -1401,17 +1534,12 @@ class Application(BaseApplication):
         if not loop:
             raise RuntimeError('No loop bound to the application')
 
-        log.debug(f'[Application] Dispatching event: {name!r}.')
-        name = 'on_' + name
-
-        listeners = self._get_listeners(name)
+        listeners = self._get_event_listeners(name)
         if not listeners:
-            future = self.loop.create_future()
-            future.set_result([])
+            return self._get_dispatch_waiter()
 
-            return future
-
-        return asyncio.gather(*[self._run_listener(listener, *args, **kwargs) for listener in listeners])
+        log.debug('[Application] Dispatching event: %r.', name)
+        return loop.create_task(self._run_listeners(listeners, *args, **kwargs))
 
     def add_view(self, view: Union[HTTPView, Type[HTTPView]], *, path: Optional[str] = None) -> HTTPView:
         """
@@ -1465,7 +1593,7 @@ class Application(BaseApplication):
             fmt = 'Expected WebSocketView but got {0!r} instead.'.format(view.__class__.__name__) # type: ignore
             raise RegistrationError(fmt)
 
-        if view.path in self.paths:
+        if self.router.get_route_by_path(view.path) is not None:
             raise RegistrationError('View already registered')
 
         self.add_route(view._listener, view.path, 'GET', websocket=True)
@@ -1534,7 +1662,8 @@ class Application(BaseApplication):
 
         for route in resource.routes:
             route.parent = resource
-            self.router.add_route(route)
+
+        self.router.add_routes(resource.routes)
 
         for listener in resource.listeners:
             listener.parent = resource
@@ -1542,6 +1671,7 @@ class Application(BaseApplication):
             listeners = self._listeners.setdefault(listener.event, [])
             listeners.append(listener)
 
+        self._invalidate_event_listeners()
         self._resources[resource.name] = resource
         return resource
 
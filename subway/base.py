@@ -293,6 +293,8 @@ class BaseApplication(ABC):
 
         Middlewares must return a boolean value or raise an error.
         If a request middleware returns a :class:`~.Response` object, that response object will be sent to the client.
+        Middlewares are run one after the other, route specific ones first, and the chain stops
+        at the first middleware that returns a falsy value or a :class:`~.Response` object.
 
         Parameters
         ----------
@@ -45,15 +45,19 @@ class StaticFiles:
         async with files.aopen(path) as f:
             return FileResponse(f)
 
-    def create_route(self, filename: str, app: Application) -> Route:
+    def _build_route(self, filename: str, app: Application) -> Route:
         callback = functools.partial(self.route, filename)
         callback.__name__ = f"route_{filename}"  # type: ignore
 
-        return app.add_route(callback, f"/{filename}", 'GET', websocket=False)
+        return app.router.create_route(callback, f"/{filename}", 'GET', name=None)
+
+    def create_route(self, filename: str, app: Application) -> Route:
+        return app.router.add_route(self._build_route(filename, app))
 
     def mount(self, app: Application) -> None:
-        for entry in utils.listdir(self.directory):
-            if self.should_ignore(entry.name):
-                continue
+        routes = [
+            self._build_route(entry.name, app) 
+            for entry in utils.listdir(self.directory) if not self.should_ignore(entry.name)
+        ]
 
-            self.create_route(entry.name, app)
+        app.router.add_routes(routes)
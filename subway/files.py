@@ -74,7 +74,10 @@ class File:
     fp: :class:`io.BufferedIOBase`
         The file object.
     """
-    def __init__(self, source: Union[io.BytesIO, IO[bytes]], *, filename: Optional[str] = None) -> None:
+    def __init__(self, source: Union[io.BytesIO, IO[bytes], BytesLike], *, filename: Optional[str] = None) -> None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+
         self.fp = source
         self.filename: Any = getattr(self.fp, 'name', filename)
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import IO, Any, Dict, Iterator, List, NamedTuple, Optional, TYPE_CHECKING, Tuple, TypeVar, Union, Iterable
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, TYPE_CHECKING, Tuple, TypeVar, Union, Iterable
 import itertools
+import os
 import string
 import random
 import re
@@ -16,6 +17,8 @@ if TYPE_CHECKING:
 T = TypeVar('T')
 
 BOUNDARY_LIMITER = b'--'
+BOUNDARY_LENGTH = 32
+CHUNK_SIZE = 65536
 BOUNDARY_REGEX = re.compile(r'.*;\sboundary=(?P<boundary>\S{1,70})')
 
 __all__ = (
@@ -41,8 +44,9 @@ def find_fields(boundary: bytes, data: bytes) -> Iterator[bytes]:
         end = next.start() if next else len(data)
 
         chunk = data[start:end]  
-        if chunk == boundary + BOUNDARY_LIMITER:
-            continue
+        if chunk.startswith(BOUNDARY_LIMITER):
+            # The closing delimiter, anything after it is ignored.
+            break
 
         yield chunk.strip(CLRF)
 
@@ -52,6 +56,32 @@ def get_boundary(content_type: str) -> bytes:
 
     return match.group('boundary').encode('ascii')
 
+def get_file_size(fp: IO[bytes]) -> Optional[int]:
+    """
+    Returns the amount of bytes left to read in a file object, or ``None`` if it can't be known without reading it.
+    """
+    try:
+        fileno = fp.fileno()
+    except (AttributeError, OSError, ValueError):
+        pass
+    else:
+        try:
+            return max(os.fstat(fileno).st_size - fp.tell(), 0)
+        except OSError:
+            return None
+
+    try:
+        if not fp.seekable():
+            return None
+
+        position = fp.tell()
+        end = fp.seek(0, os.SEEK_END)
+        fp.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    return end - position
+
 def unquote(text: str) -> str:
     return re.sub(r'"|\'', '', text)
 
@@ -214,8 +244,18 @@ class FormData(Dict[str, FormDataField]):
         :class:`str`
             The boundary string.
         """
-        length = random.randint(1, 70)
-        return ''.join([random.choice(string.ascii_letters) for _ in range(length)]).encode()
+        # Long enough that it won't show up in the files by chance.
+        return ''.join([random.choice(string.ascii_letters) for _ in range(BOUNDARY_LENGTH)]).encode()
+
+    @property
+    def content_type(self) -> str:
+        """
+        The Content-Type header to send the form data with. Generates a boundary if there isn't one yet.
+        """
+        if self.boundary is None:
+            self.boundary = self.generate_boundary()
+
+        return f'multipart/form-data; boundary={self.boundary.decode()}'
 
     def add_field(
         self, 
@@ -258,35 +298,79 @@ class FormData(Dict[str, FormDataField]):
         self[field.name] = field
         return field
 
-    async def _prepare_field(self, field: FormDataField) -> bytes:
+    def _get_field_head(self, field: FormDataField) -> bytes:
         assert self.boundary is not None, 'Boundary not set'
         disposition = field.disposition
 
-        boundary = BOUNDARY_LIMITER + self.boundary 
-        headers = [
-            f'Content-Disposition: {disposition.to_header()}',
-            f'Content-Type: {disposition.content_type}',
-        ]
+        headers = {
+            'Content-Disposition': disposition.to_header(),
+            'Content-Type': disposition.content_type,
+        }
+        headers.update(field.headers)
+
+        head = BOUNDARY_LIMITER + self.boundary + CLRF
+        head += CLRF.join(f'{key}: {value}'.encode() for key, value in headers.items()) + (CLRF * 2)
+
+        return head
+
+    def _get_tail(self) -> bytes:
+        assert self.boundary is not None, 'Boundary not set'
+        return BOUNDARY_LIMITER + self.boundary + BOUNDARY_LIMITER + CLRF
+
+    def content_length(self) -> Optional[int]:
+        """
+        The size of the encoded form data, or ``None`` if the size of one of the files can't be known
+        without reading it.
+        """
+        if self.boundary is None:
+            self.boundary = self.generate_boundary()
+
+        length = len(self._get_tail())
+        for field in self.values():
+            size = get_file_size(field.file.fp)
+            if size is None:
+                return None
+
+            length += len(self._get_field_head(field)) + size + len(CLRF)
 
-        body = boundary
-        body += CLRF.join([header.encode() for header in headers]) + (CLRF * 2)
-        body += await field.file.read() + CLRF
+        return length
 
-        return body
+    async def stream(self, *, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Encodes the form data part by part, reading the files ``chunk_size`` bytes at a time,
+        so that only a single chunk is ever held in memory.
+
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            The amount of bytes to read from the files at once.
+        """
+        if self.boundary is None:
+            self.boundary = self.generate_boundary()
+
+        for field in self.values():
+            yield self._get_field_head(field)
+
+            while True:
+                chunk = await field.file.read(chunk_size)
+                if not chunk:
+                    break
+
+                yield chunk
+
+            yield CLRF
+
+        yield self._get_tail()
 
     async def prepare(self) -> Tuple[bytearray, str]:
         """
         Prepare the form data for sending.
         """
-        self.boundary = boundary = self.generate_boundary()
-        content_type = f'multipart/form-data; boundary={boundary}'
+        self.boundary = self.generate_boundary()
+        content_type = self.content_type
 
         body = bytearray()
-
-        for field in self.values():
-            chunk = await self._prepare_field(field)
+        async for chunk in self.stream():
             body.extend(chunk)
 
-        body.extend(BOUNDARY_LIMITER + boundary + BOUNDARY_LIMITER)
         return body, content_type
-            
\ No newline at end of file
@@ -1,5 +1,13 @@
 from .sessions import *
 from .hooker import *
 from .abc import *
+from .pool import *
+from .timeouts import *
+from .bulk import *
+from .resolver import *
+from .connectors import *
+from .payloads import *
+from .retries import *
+from .cache import *
 from .response import HTTPResponse
 from .request import HTTPRequest
\ No newline at end of file
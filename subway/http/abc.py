@@ -7,16 +7,18 @@ import ssl
 import asyncio
 
 from subway.utils import parse_headers
+from subway.errors import PartialRead
 from subway.streams import StreamReader, StreamWriter
 from subway.types import StrURL
 from .errors import HookerAlreadyConnected, HookerClosed
 from .response import HTTPResponse, HTTPStatus
 from .request import HTTPRequest
+from .payloads import Payload
 
 if TYPE_CHECKING:
     from .sessions import HTTPSession
 
-SSL_SCHEMES = ('https', 'wss')
+SSL_SCHEMES = ('https', 'wss', 'https+unix')
 
 __all__ = (
     'SSL_SCHEMES',
@@ -69,19 +71,22 @@ class Hooker(ABC):
         host: str, 
         path: str, 
         headers: Dict[str, Any],
-        body: Optional[str]
+        body: Optional[Payload]
     ) -> HTTPRequest:
         headers.setdefault('Connection', 'close')
         return HTTPRequest(method, path, host, headers, body)
 
-    async def read_response(self) -> HTTPResponse:
+    async def read_response(self, *, method: str = 'GET') -> HTTPResponse:
         if self.reader is None:
             raise RuntimeError('Not connected')
 
-        status_line = await self.reader.readuntil(b'\r\n')
-        version, status_code, _ = status_line.decode().split(' ', 2)
+        if self.reader.at_eof() and not self.reader.buffer:
+            raise PartialRead(b'', None)
 
-        hdrs = await self.reader.readuntil(b'\r\n\r\n')
+        # Reading the status line along with the headers also handles responses without any headers.
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, _, hdrs = head.partition(b'\r\n')
+        version, status_code, *_ = status_line.decode().split(' ', 2)
 
         status = HTTPStatus(int(status_code))
         headers: Dict[str, Any] = dict(parse_headers(hdrs))
@@ -91,6 +96,7 @@ class Hooker(ABC):
             status=status,
             version=version,
             headers=headers,
+            method=method,
         )
 
     @abstractmethod
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+from subway import utils
+from subway.types import StrURL
+
+if TYPE_CHECKING:
+    from subway.url import URL
+    from .response import HTTPResponse
+
+__all__ = (
+    'BulkRequest',
+    'BulkResult',
+)
+
+class BulkRequest:
+    """
+    A request to send with :meth:`~subway.http.HTTPSession.map`.
+
+    Parameters
+    ----------
+    url: Union[:class:`str`, :class:`~subway.url.URL`]
+        The URL to request.
+    method: :class:`str`
+        The HTTP method to use.
+    **kwargs: Any
+        The keyword arguments to pass to :meth:`~subway.http.HTTPSession.request`.
+
+    Attributes
+    ----------
+    url: :class:`~subway.url.URL`
+        The URL to request.
+    method: :class:`str`
+        The HTTP method to use.
+    kwargs: :class:`dict`
+        The keyword arguments to pass to :meth:`~subway.http.HTTPSession.request`.
+    """
+    __slots__ = ('url', 'method', 'kwargs')
+
+    def __init__(self, url: StrURL, method: str = 'GET', **kwargs: Any) -> None:
+        self.url: URL = utils.to_url(url)
+        self.method = method
+        self.kwargs: Dict[str, Any] = kwargs
+
+    def __repr__(self) -> str:
+        return f'<BulkRequest method={self.method!r} url={self.url}>'
+
+    @classmethod
+    def from_value(cls, value: Union[BulkRequest, StrURL]) -> BulkRequest:
+        """
+        Converts a URL into a ``GET`` request. Requests are returned as is.
+
+        Parameters
+        ----------
+        value: Union[:class:`~subway.http.BulkRequest`, :class:`str`, :class:`~subway.url.URL`]
+            The value to convert.
+        """
+        if isinstance(value, cls):
+            return value
+
+        return cls(value)  # type: ignore
+
+    @property
+    def host(self) -> str:
+        """
+        The host the request is sent to, used for per-host concurrency limits.
+        """
+        return f'{self.url.hostname}:{self.url.default_port}'
+
+
+class BulkResult:
+    """
+    The outcome of a request sent with :meth:`~subway.http.HTTPSession.map`.
+
+    Attributes
+    ----------
+    index: :class:`int`
+        The position of the request in the requests passed to :meth:`~subway.http.HTTPSession.map`.
+    request: :class:`~subway.http.BulkRequest`
+        The request.
+    response: Optional[:class:`~subway.http.HTTPResponse`]
+        The response, with its body already read. ``None`` if the request failed.
+    exception: Optional[:class:`BaseException`]
+        The exception the request failed with, if any.
+    """
+    __slots__ = ('index', 'request', 'response', 'exception')
+
+    def __init__(
+        self,
+        index: int,
+        request: BulkRequest,
+        *,
+        response: Optional[HTTPResponse] = None,
+        exception: Optional[BaseException] = None
+    ) -> None:
+        self.index = index
+        self.request = request
+        self.response = response
+        self.exception = exception
+
+    def __repr__(self) -> str:
+        return f'<BulkResult index={self.index} ok={self.ok} request={self.request!r}>'
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the request got a response.
+        """
+        return self.exception is None
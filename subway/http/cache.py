@@ -0,0 +1,621 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+import email.utils
+import collections
+import asyncio
+import time
+
+from subway import HTTPStatus
+from .response import HTTPResponse
+
+if TYPE_CHECKING:
+    from .sessions import HTTPSession
+
+__all__ = (
+    'CacheEntry',
+    'CacheStorage',
+    'MemoryCacheStorage',
+    'HTTPCache',
+)
+
+# The statuses that can be stored without being explicitly marked as cacheable, RFC 9110 section 15.1.
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Headers that describe the connection or the message framing, which a 304 response must not update.
+HOP_BY_HOP_HEADERS = frozenset({
+    'connection', 'keep-alive', 'transfer-encoding', 'content-length', 'te', 'trailer', 'upgrade'
+})
+
+# Requests carrying credentials get responses meant for whoever they identify, so they skip the cache.
+CREDENTIAL_HEADERS = ('Authorization', 'Cookie')
+
+Send = Callable[[Dict[str, Any]], Awaitable[HTTPResponse]]
+
+def get_header(headers: Mapping[str, Any], name: str) -> Optional[str]:
+    """
+    Looks up a header without caring about the case of its name.
+    """
+    value = headers.get(name)
+    if value is not None:
+        return str(value)
+
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return str(value)
+
+    return None
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parses a ``Cache-Control`` header into a mapping of lowercase directives to their arguments.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+
+    for directive in value.split(','):
+        name, sep, argument = directive.strip().partition('=')
+        if not name:
+            continue
+
+        directives[name.strip().lower()] = argument.strip().strip('"') if sep else None
+
+    return directives
+
+def _parse_seconds(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return None
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class CacheEntry:
+    """
+    A response stored in an :class:`~subway.http.HTTPCache`.
+
+    Attributes
+    ----------
+    status: :class:`int`
+        The status of the response.
+    version: :class:`str`
+        The HTTP version of the response.
+    headers: Dict[:class:`str`, :class:`str`]
+        The headers of the response.
+    body: :class:`bytes`
+        The body of the response, as it was received. It is still compressed if the response was.
+    stored_at: :class:`float`
+        The UNIX timestamp at which the response was received or last revalidated.
+    vary: Dict[:class:`str`, Optional[:class:`str`]]
+        The values the request headers named by the ``Vary`` header had, with lowercase names.
+    """
+    __slots__ = ('status', 'version', 'headers', 'body', 'stored_at', 'vary')
+
+    def __init__(
+        self,
+        *,
+        status: int,
+        version: str,
+        headers: Dict[str, str],
+        body: bytes,
+        stored_at: float,
+        vary: Optional[Dict[str, Optional[str]]] = None
+    ) -> None:
+        self.status = status
+        self.version = version
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.vary = vary or {}
+
+    def __repr__(self) -> str:
+        return f'<CacheEntry status={self.status} size={self.size} stored_at={self.stored_at}>'
+
+    @property
+    def size(self) -> int:
+        """
+        Roughly how many bytes the entry takes up.
+        """
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers.items())
+
+    @property
+    def etag(self) -> Optional[str]:
+        """
+        The entity tag of the response, if any.
+        """
+        return get_header(self.headers, 'ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """
+        The ``Last-Modified`` header of the response, if any.
+        """
+        return get_header(self.headers, 'Last-Modified')
+
+    def get_age(self, now: float) -> float:
+        """
+        How many seconds old the response is, including the age it had when it was received.
+
+        Parameters
+        ----------
+        now: :class:`float`
+            The current UNIX timestamp.
+        """
+        age = _parse_seconds(get_header(self.headers, 'Age')) or 0
+        return age + max(now - self.stored_at, 0)
+
+    def get_lifetime(self, *, shared: bool = False) -> float:
+        """
+        How many seconds the response is fresh for, ``0`` if it has to be revalidated before every use.
+
+        Parameters
+        ----------
+        shared: :class:`bool`
+            Whether the lifetime is for a shared cache, which uses ``s-maxage`` over ``max-age``.
+        """
+        directives = parse_cache_control(get_header(self.headers, 'Cache-Control'))
+        if 'no-cache' in directives:
+            return 0
+
+        if shared and 's-maxage' in directives:
+            return _parse_seconds(directives['s-maxage']) or 0
+
+        if 'max-age' in directives:
+            return _parse_seconds(directives['max-age']) or 0
+
+        expires = _parse_date(get_header(self.headers, 'Expires'))
+        if expires is not None:
+            date = _parse_date(get_header(self.headers, 'Date')) or self.stored_at
+            return max(expires - date, 0)
+
+        return 0
+
+    def matches(self, headers: Mapping[str, Any]) -> bool:
+        """
+        Whether a request with the given headers selects this response, according to its ``Vary`` header.
+
+        Parameters
+        ----------
+        headers: Mapping[:class:`str`, Any]
+            The headers of the request.
+        """
+        return all(get_header(headers, name) == value for name, value in self.vary.items())
+
+
+class CacheStorage(ABC):
+    """
+    The base class of the storages used by :class:`~subway.http.HTTPCache` to keep responses.
+    Storages that keep responses elsewhere than in memory, like on disk, can implement it.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored under ``key``, if any.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Stores an entry, replacing the one under the same key.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+        entry: :class:`~subway.http.CacheEntry`
+            The entry.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Removes the entry stored under ``key``, if any.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The key of the entry.
+        """
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Releases the resources used by the storage.
+        """
+        pass
+
+
+class MemoryCacheStorage(CacheStorage):
+    """
+    A storage that keeps entries in memory, evicting the least recently used ones once
+    their total size goes over ``max_size``.
+
+    Parameters
+    ----------
+    max_size: :class:`int`
+        The maximum total size of the entries, in bytes.
+
+    Attributes
+    ----------
+    size: :class:`int`
+        The total size of the stored entries, in bytes.
+    """
+    def __init__(self, *, max_size: int = 64 * 1024 * 1024) -> None:
+        if max_size <= 0:
+            raise ValueError('max_size must be a positive integer')
+
+        self.max_size = max_size
+        self.size = 0
+
+        self._entries: collections.OrderedDict[str, CacheEntry] = collections.OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'<MemoryCacheStorage entries={len(self._entries)} size={self.size} max_size={self.max_size}>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.delete(key)
+
+        if entry.size > self.max_size:
+            return
+
+        self._entries[key] = entry
+        self.size += entry.size
+
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    async def close(self) -> None:
+        await self.clear()
+
+
+class CachedHTTPResponse(HTTPResponse):
+    """
+    A response served from a :class:`~subway.http.CacheEntry`, without a connection.
+    """
+    def __init__(self, entry: CacheEntry, *, session: HTTPSession, method: str = 'GET') -> None:
+        super().__init__(
+            hooker=None,  # type: ignore
+            status=HTTPStatus(entry.status),
+            version=entry.version,
+            headers=entry.headers.copy(),
+            method=method
+        )
+
+        self._session = session
+        self.auto_decompress = session.auto_decompress
+        self.from_cache = True
+
+        if entry.body:
+            self._unread.append(entry.body)
+
+        self._consumed = True
+        self._released = True
+
+    @property
+    def session(self) -> HTTPSession:
+        return self._session
+
+    def is_closed(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        self._unread.clear()
+
+
+class HTTPCache:
+    """
+    A private client-side cache of ``GET`` responses, following the parts of RFC 9111 that matter to a client.
+
+    Responses are stored if their status allows it, unless they have ``Cache-Control: no-store``,
+    or ``private`` when the cache is ``shared``. A stored response is served without a request for as long as
+    ``max-age``, ``s-maxage`` or ``Expires`` says it is fresh. Once it is stale, it is revalidated with
+    ``If-None-Match`` and ``If-Modified-Since`` and a ``304 Not Modified`` response refreshes it, so its body
+    is never downloaded again while it doesn't change. Requests with ``Cache-Control: no-cache`` always
+    revalidate, and requests with ``no-store``, their own conditional headers, ``Authorization`` or ``Cookie``
+    skip the cache.
+
+    Concurrent requests for the same URL are coalesced: only the first one is sent and the others
+    get a copy of its response, as long as it can be stored and its body isn't larger than ``max_entry_size``.
+
+    Parameters
+    ----------
+    storage: Optional[:class:`~subway.http.CacheStorage`]
+        Where responses are kept. Defaults to a :class:`~subway.http.MemoryCacheStorage`.
+    shared: :class:`bool`
+        Whether the cache is shared between users, like in a proxy, which must not store ``private`` responses.
+    max_entry_size: :class:`int`
+        The largest body that is stored or shared between coalesced requests, in bytes.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The amount of requests served from the cache without contacting the server.
+    revalidations: :class:`int`
+        The amount of stored responses that the server confirmed were still valid.
+    misses: :class:`int`
+        The amount of requests sent to the server that didn't revalidate a stored response.
+    coalesced: :class:`int`
+        The amount of requests that waited for an identical request instead of being sent.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        session = HTTPSession(cache=HTTPCache(storage=MemoryCacheStorage(max_size=16 * 1024 * 1024)))
+    """
+    def __init__(
+        self,
+        storage: Optional[CacheStorage] = None,
+        *,
+        shared: bool = False,
+        max_entry_size: int = 1024 * 1024
+    ) -> None:
+        if max_entry_size <= 0:
+            raise ValueError('max_entry_size must be a positive integer')
+
+        self.storage = storage or MemoryCacheStorage()
+        self.shared = shared
+        self.max_entry_size = max_entry_size
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._pending: Dict[str, asyncio.Future[Optional[CacheEntry]]] = {}
+
+    def __repr__(self) -> str:
+        return f'<HTTPCache storage={self.storage!r} shared={self.shared}>'
+
+    def get_key(self, method: str, url: Any) -> str:
+        """
+        Returns the key requests are stored under.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method of the request.
+        url: :class:`~subway.url.URL`
+            The URL of the request.
+        """
+        return f'{method.upper()} {url}'
+
+    def is_storable(self, response: HTTPResponse, entry: CacheEntry) -> bool:
+        """
+        Whether a response can be stored.
+
+        Parameters
+        ----------
+        response: :class:`~subway.http.HTTPResponse`
+            The response.
+        entry: :class:`~subway.http.CacheEntry`
+            The entry the response would be stored as.
+        """
+        if entry.status not in CACHEABLE_STATUSES:
+            return False
+
+        directives = parse_cache_control(get_header(response.headers, 'Cache-Control'))
+        if 'no-store' in directives or (self.shared and 'private' in directives):
+            return False
+
+        if get_header(response.headers, 'Vary') == '*':
+            return False
+
+        # A response that is never fresh is only worth storing if it can be revalidated.
+        return entry.get_lifetime(shared=self.shared) > 0 or entry.etag is not None or entry.last_modified is not None
+
+    def is_fresh(self, entry: CacheEntry, *, now: Optional[float] = None) -> bool:
+        """
+        Whether an entry can be used without revalidating it.
+
+        Parameters
+        ----------
+        entry: :class:`~subway.http.CacheEntry`
+            The entry.
+        now: Optional[:class:`float`]
+            The current UNIX timestamp.
+        """
+        now = time.time() if now is None else now
+        return entry.get_age(now) < entry.get_lifetime(shared=self.shared)
+
+    async def request(
+        self,
+        session: HTTPSession,
+        method: str,
+        url: Any,
+        headers: Dict[str, Any],
+        send: Send
+    ) -> HTTPResponse:
+        """
+        Answers a request from the cache, revalidating or sending it when needed.
+        This is called by :class:`~subway.http.HTTPSession` for every ``GET`` request without a body.
+
+        Parameters
+        ----------
+        session: :class:`~subway.http.HTTPSession`
+            The session the request is sent with.
+        method: :class:`str`
+            The method of the request.
+        url: :class:`~subway.url.URL`
+            The URL of the request.
+        headers: Dict[:class:`str`, Any]
+            The headers of the request.
+        send: Callable[[Dict[:class:`str`, Any]], Awaitable[:class:`~subway.http.HTTPResponse`]]
+            Sends the request with the given headers.
+        """
+        directives = parse_cache_control(get_header(headers, 'Cache-Control'))
+        conditional = get_header(headers, 'If-None-Match') or get_header(headers, 'If-Modified-Since')
+
+        if 'no-store' in directives or conditional is not None:
+            return await send(headers)
+
+        if any(get_header(headers, name) is not None for name in CREDENTIAL_HEADERS):
+            return await send(headers)
+
+        key = self.get_key(method, url)
+        revalidate = 'no-cache' in directives or directives.get('max-age') == '0'
+
+        entry = await self.storage.get(key)
+        if entry is not None and not entry.matches(headers):
+            entry = None
+
+        if entry is not None and not revalidate and self.is_fresh(entry):
+            self.hits += 1
+            return CachedHTTPResponse(entry, session=session, method=method)
+
+        future = self._pending.get(key)
+        if future is not None:
+            # A caller that gets cancelled must not cancel the request the others are waiting on.
+            shared = await asyncio.shield(future)
+            if shared is not None and shared.matches(headers):
+                self.coalesced += 1
+                return CachedHTTPResponse(shared, session=session, method=method)
+
+            return await send(headers)
+
+        future = self._pending[key] = session.loop.create_future()
+        result: Optional[CacheEntry] = None
+
+        try:
+            response, result = await self._fetch(session, key, method, headers, entry, send)
+            return response
+        except BaseException as exc:
+            if not future.done():
+                if isinstance(exc, Exception):
+                    future.set_exception(exc)
+                    # Retrieves the exception so it isn't reported when nobody was waiting.
+                    future.exception()
+                else:
+                    future.set_result(None)
+
+            raise
+        finally:
+            if not future.done():
+                future.set_result(result)
+
+            del self._pending[key]
+
+    async def _fetch(
+        self,
+        session: HTTPSession,
+        key: str,
+        method: str,
+        headers: Dict[str, Any],
+        entry: Optional[CacheEntry],
+        send: Send
+    ) -> Tuple[HTTPResponse, Optional[CacheEntry]]:
+        if entry is not None:
+            headers = headers.copy()
+
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = await send(headers)
+
+        if entry is not None and response.status == 304:
+            await response.close()
+            self.revalidations += 1
+
+            for name, value in response.headers.items():
+                if name.lower() not in HOP_BY_HOP_HEADERS:
+                    for existing in [existing for existing in entry.headers if existing.lower() == name.lower()]:
+                        del entry.headers[existing]
+
+                    entry.headers[name] = value
+
+            entry.stored_at = time.time()
+            await self.storage.set(key, entry)
+
+            return CachedHTTPResponse(entry, session=session, method=method), entry
+
+        self.misses += 1
+
+        body = await response.buffer_body(limit=self.max_entry_size)
+        if body is None:
+            return response, None
+
+        vary: Dict[str, Optional[str]] = {}
+        for name in (get_header(response.headers, 'Vary') or '').split(','):
+            name = name.strip().lower()
+            if name and name != '*':
+                vary[name] = get_header(headers, name)
+
+        result = CacheEntry(
+            status=int(response.status),
+            version=response.version,
+            headers=dict(response.headers),
+            body=body,
+            stored_at=time.time(),
+            vary=vary
+        )
+
+        if not self.is_storable(response, result):
+            if entry is not None:
+                await self.storage.delete(key)
+
+            # Waiting requests send their own request instead of sharing a response that can't be stored.
+            return response, None
+
+        await self.storage.set(key, result)
+        return response, result
+
+    async def clear(self) -> None:
+        """
+        Removes every stored response.
+        """
+        await self.storage.clear()
+
+    async def close(self) -> None:
+        """
+        Closes the storage.
+        """
+        await self.storage.close()
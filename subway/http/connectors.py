@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+from urllib.parse import unquote
+import socket
+import ssl
+
+from subway import utils
+from subway.streams import StreamReader, StreamWriter, open_connection, open_unix_connection
+from subway.url import URL
+from .resolver import AbstractResolver
+
+__all__ = (
+    'UNIX_SCHEMES',
+    'Connector',
+    'TCPConnector',
+    'UnixConnector',
+)
+
+UNIX_SCHEMES = ('http+unix', 'https+unix')
+
+ConnectorKey = Tuple[str, str, int]
+
+class Connector(ABC):
+    """
+    The base class of the connectors used by :class:`~subway.http.HTTPSession` to open connections.
+    A connector decides where the connection for a URL goes and which connections can be shared
+    in the session's :class:`~subway.http.ConnectionPool`.
+    """
+
+    @abstractmethod
+    def get_key(self, url: URL) -> ConnectorKey:
+        """
+        Returns the key connections for a URL are pooled under.
+        Connections with the same key can be reused for each other's requests.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL.
+        """
+        raise NotImplementedError
+
+    def get_host(self, url: URL) -> str:
+        """
+        Returns the value of the ``Host`` header of requests to a URL.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL.
+        """
+        assert url.hostname is not None, 'url must have a hostname'
+        return url.hostname
+
+    @abstractmethod
+    async def connect(
+        self, url: URL, *, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> Tuple[StreamReader, StreamWriter]:
+        """
+        Opens a connection for a URL.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL to connect for.
+        ssl_context: Optional[:class:`ssl.SSLContext`]
+            The SSL context to wrap the connection in, if any.
+
+        Raises
+        ------
+        OSError
+            If the connection could not be opened.
+        """
+        raise NotImplementedError
+
+
+class TCPConnector(Connector):
+    """
+    A connector that opens TCP connections to the host and port of the URL.
+
+    Parameters
+    ----------
+    resolver: :class:`~subway.http.AbstractResolver`
+        The resolver used to look up host names. Every address is tried in turn until one accepts the connection.
+    """
+    def __init__(self, resolver: AbstractResolver) -> None:
+        self.resolver = resolver
+
+    def __repr__(self) -> str:
+        return f'<TCPConnector resolver={self.resolver!r}>'
+
+    def get_key(self, url: URL) -> ConnectorKey:
+        assert url.hostname is not None, 'url must have a hostname'
+        return url.scheme, url.hostname, url.default_port or 80
+
+    async def connect(
+        self, url: URL, *, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> Tuple[StreamReader, StreamWriter]:
+        host = url.hostname
+        port = url.default_port
+
+        assert host is not None and port is not None, 'url must have a hostname'
+        if utils.is_ipv4(host) or utils.is_ipv6(host):
+            return await open_connection(host=host, port=port, ssl=ssl_context)
+
+        addresses = await self.resolver.resolve(host, port)
+        exception: Optional[OSError] = None
+
+        for address in addresses:
+            try:
+                return await open_connection(
+                    host=address.address,
+                    port=address.port,
+                    family=address.family,
+                    ssl=ssl_context,
+                    server_hostname=host if ssl_context is not None else None
+                )
+            except OSError as exc:
+                exception = exc
+
+        if exception is None:
+            raise OSError(f'Could not resolve {host!r}')
+
+        raise exception
+
+
+class UnixConnector(Connector):
+    """
+    A connector that opens connections to a Unix domain socket, for servers on the same machine.
+    Requests don't go through the TCP stack at all.
+
+    Parameters
+    ----------
+    path: Optional[:class:`str`]
+        The path of the socket every request is sent to, whatever the host of its URL.
+        If not given, the path is taken from the host of ``http+unix://`` URLs, where it is percent-encoded,
+        e.g. ``http+unix://%2Fvar%2Frun%2Fagent.sock/metrics``.
+
+    Raises
+    ------
+    RuntimeError
+        If Unix domain sockets aren't supported on this platform.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        session = HTTPSession(connector=UnixConnector('/var/run/agent.sock'))
+
+        async with session.get('http://agent/metrics') as response:
+            ...
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('Unix sockets are not supported on this platform')
+
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f'<UnixConnector path={self.path!r}>'
+
+    def get_path(self, url: URL) -> str:
+        """
+        Returns the path of the socket requests to a URL are sent to.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL.
+
+        Raises
+        ------
+        ValueError
+            If the connector has no path and the URL is not an ``http+unix://`` URL.
+        """
+        if self.path is not None:
+            return self.path
+
+        if url.scheme not in UNIX_SCHEMES:
+            raise ValueError(f'Expected an http+unix URL, got {url.scheme!r}')
+
+        # The host name is lowercased by urlsplit, the netloc keeps the path as it was written.
+        return unquote(url.netloc)
+
+    def get_key(self, url: URL) -> ConnectorKey:
+        return url.scheme, self.get_path(url), 0
+
+    def get_host(self, url: URL) -> str:
+        if self.path is None:
+            return 'localhost'
+
+        return super().get_host(url)
+
+    async def connect(
+        self, url: URL, *, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> Tuple[StreamReader, StreamWriter]:
+        return await open_unix_connection(
+            self.get_path(url),
+            ssl=ssl_context,
+            server_hostname=self.get_host(url) if ssl_context is not None else None
+        )
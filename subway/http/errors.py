@@ -23,4 +23,13 @@ class HookerClosed(HookerError):
     pass
 
 class HandshakeError(HookerError):
-    pass
\ No newline at end of file
+    pass
+
+class IncompleteResponseBody(HookerError):
+    pass
+
+class InvalidChunkedBody(HookerError):
+    pass
+
+class ContentDecodingError(HookerError):
+    pass
@@ -1,19 +1,21 @@
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 import os
 import base64
 
-from subway.streams import open_connection
 from subway.url import URL
 from subway.types import StrURL
 from subway.response import HTTPStatus
-from subway.websockets import ClientWebSocket as WebSocket, WebSocketCloseCode
+from subway.websockets import ClientWebSocket as WebSocket, WebSocketCloseCode, WebSocketProtocol, PerMessageDeflate
 from .request import HTTPRequest
-from .abc import Hooker
+from .payloads import Payload
+from .abc import Hooker, SSL_SCHEMES
+from .connectors import Connector
 from .errors import HandshakeError
 from .response import HTTPResponse
 
 if TYPE_CHECKING:
     from .sessions import HTTPSession
+    from .pool import ConnectionPool
 
 __all__ = (
     'WebSocket',
@@ -22,24 +24,27 @@ __all__ = (
 )
 
 class TCPHooker(Hooker):
-    def __init__(self, session: 'HTTPSession') -> None:
+    def __init__(self, session: 'HTTPSession', *, connector: Optional[Connector] = None) -> None:
         super().__init__(session)
 
+        self.connector = connector
+        self.pool: Optional['ConnectionPool'] = None
+        self.key: Optional[Tuple[str, str, int]] = None
+        self.requests = 0
+
     async def connect(self, url: StrURL) -> Any:
         self.ensure()
 
         if isinstance(url, str):
             url = URL(url)
 
-        port = url.default_port
-        host = url.hostname
-        ssl_context = self.create_default_ssl_context() if port == 443 else None
+        connector = self.connector or self.session.get_connector(url)
+
+        ssl_context = None
+        if url.scheme in SSL_SCHEMES or url.default_port == 443:
+            ssl_context = self.create_default_ssl_context()
 
-        reader, writer = await open_connection(
-            host=host,
-            port=port,
-            ssl=ssl_context
-        )
+        reader, writer = await connector.connect(url, ssl_context=ssl_context)
 
         self.connected = True
         self.reader = reader
@@ -49,7 +54,22 @@ class TCPHooker(Hooker):
         if not self.writer:
             raise RuntimeError('Not connected')
 
-        await self.writer.write(data.prepare(), drain=True)
+        if not data.is_streamed():
+            return await self.writer.write(data.prepare(), drain=True)
+
+        payload: Payload = data.body
+        self.writer.write(data.prepare_head())
+
+        if payload.size is not None:
+            async for chunk in payload:
+                await self.writer.write(chunk, drain=True)
+
+            return
+
+        async for chunk in payload:
+            await self.writer.writelines([b'%x\r\n' % len(chunk), chunk, b'\r\n'], drain=True)
+
+        await self.writer.write(b'0\r\n\r\n', drain=True)
 
     async def close(self) -> None:
         if not self.writer:
@@ -62,9 +82,10 @@ class TCPHooker(Hooker):
         self.closed = True
 
 class WebSocketHooker(TCPHooker):
-    def __init__(self, session: 'HTTPSession') -> None:
+    def __init__(self, session: 'HTTPSession', *, compression: Optional[PerMessageDeflate] = None) -> None:
         super().__init__(session)
 
+        self.compression = compression
         self._task = None
 
     async def connect(self, url: StrURL) -> WebSocket:
@@ -94,6 +115,9 @@ class WebSocketHooker(TCPHooker):
             'Sec-WebSocket-Version': 13
         }
 
+        if self.compression is not None:
+            headers['Sec-WebSocket-Extensions'] = self.compression.offer()
+
         request = self.build_request('GET', host, path, headers, None)
         await self.write(request)
 
@@ -102,6 +126,29 @@ class WebSocketHooker(TCPHooker):
         self.websocket = self.create_websocket()
         await self.verify_handshake(response)
 
+        extensions = response.headers.get('Sec-WebSocket-Extensions')
+        if extensions:
+            if self.compression is None:
+                return await self._close(
+                    HandshakeError(
+                        message=f"Server selected extensions that were not offered: {extensions!r}",
+                        hooker=self
+                    )
+                )
+
+            try:
+                self.websocket._compression = self.compression.confirm(extensions)
+            except ValueError as exc:
+                return await self._close(HandshakeError(message=str(exc), hooker=self))
+
+        # Like on the server, frames are parsed as they arrive so that pongs are seen by the heartbeat
+        # even if nothing is receiving from the websocket.
+        assert self.writer is not None and self.reader is not None
+        proto: Any = self.writer.get_protocol()
+
+        protocol = WebSocketProtocol(self.reader, self.writer, proto.waiter, self.websocket)
+        self.writer.set_protocol(protocol)
+
         return self.websocket
 
     async def verify_handshake(self, response: HTTPResponse) -> None:
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import IO, Any, AsyncIterable, AsyncIterator, Optional, Union
+import concurrent.futures
+
+from subway import compat
+from subway.files import File
+from subway.formdata import FormData, get_file_size
+from subway.types import BytesLike
+
+__all__ = (
+    'Payload',
+    'BytesPayload',
+    'FilePayload',
+    'AsyncIterablePayload',
+    'FormDataPayload',
+    'get_payload',
+)
+
+CHUNK_SIZE = 65536
+
+class Payload(ABC):
+    """
+    The body of a client request, sent in chunks.
+
+    Attributes
+    ----------
+    size: Optional[:class:`int`]
+        The size of the body. If ``None``, the body is sent with chunked transfer encoding.
+    content_type: Optional[:class:`str`]
+        The content type to send the body with, unless the request sets one.
+    """
+    size: Optional[int] = None
+    content_type: Optional[str] = None
+
+    def __init__(self) -> None:
+        self._consumed = False
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} size={self.size}>'
+
+    @property
+    def replayable(self) -> bool:
+        """
+        Whether the body can be sent more than once, for retries and redirects.
+        """
+        return False
+
+    async def rewind(self) -> None:
+        """
+        Goes back to the start of the body so it can be sent again.
+
+        Raises
+        ------
+        RuntimeError
+            If the body is not :attr:`replayable`.
+        """
+        raise RuntimeError(f'{self.__class__.__name__} can only be sent once')
+
+    def get_bytes(self) -> Optional[bytes]:
+        """
+        The whole body, if it is already in memory. ``None`` otherwise.
+        """
+        return None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self._consumed:
+            await self.rewind()
+
+        self._consumed = True
+        async for chunk in self.iterate():
+            if chunk:
+                yield chunk
+
+    @abstractmethod
+    def iterate(self) -> AsyncIterator[bytes]:
+        """
+        Yields the chunks of the body. Subclasses must implement this.
+        """
+        raise NotImplementedError
+
+
+class BytesPayload(Payload):
+    """
+    A body that is already in memory.
+
+    Parameters
+    ----------
+    data: Union[:class:`bytes`, :class:`bytearray`, :class:`memoryview`, :class:`str`]
+        The body. Strings are encoded with ``encoding``.
+    encoding: :class:`str`
+        The encoding to use for strings.
+    content_type: Optional[:class:`str`]
+        The content type of the body.
+    """
+    def __init__(
+        self,
+        data: Union[BytesLike, str],
+        *,
+        encoding: str = 'utf-8',
+        content_type: Optional[str] = None
+    ) -> None:
+        super().__init__()
+
+        if isinstance(data, str):
+            self.data = data.encode(encoding)
+            self.content_type = content_type or f'text/plain; charset={encoding}'
+        else:
+            self.data = bytes(data) if isinstance(data, bytearray) else data
+            self.content_type = content_type or 'application/octet-stream'
+
+        self.size = len(self.data) if not isinstance(self.data, memoryview) else self.data.nbytes
+
+    @property
+    def replayable(self) -> bool:
+        return True
+
+    async def rewind(self) -> None:
+        pass
+
+    def get_bytes(self) -> bytes:
+        return bytes(self.data)
+
+    async def iterate(self) -> AsyncIterator[bytes]:
+        yield self.data  # type: ignore
+
+
+class FilePayload(Payload):
+    """
+    A body read from a file, one chunk at a time in a thread.
+    The file is read from its current position.
+
+    Parameters
+    ----------
+    file: Union[:class:`~subway.files.File`, :class:`io.IOBase`]
+        The file to send. It is not closed once it has been sent.
+    chunk_size: :class:`int`
+        The amount of bytes to read at once.
+    executor: Optional[:class:`concurrent.futures.Executor`]
+        The executor to read the file in. Defaults to the event loop's default executor.
+    content_type: Optional[:class:`str`]
+        The content type of the body.
+    """
+    def __init__(
+        self,
+        file: Union[File, IO[bytes]],
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        executor: Optional[concurrent.futures.Executor] = None,
+        content_type: Optional[str] = None
+    ) -> None:
+        super().__init__()
+
+        # The file object is used directly, wrapping it in a File would close it once the payload is gone.
+        self.fp: IO[bytes] = file.fp if isinstance(file, File) else file
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.content_type = content_type or 'application/octet-stream'
+        self.size = get_file_size(self.fp)
+
+        try:
+            self._start: Optional[int] = self.fp.tell() if self.fp.seekable() else None
+        except (AttributeError, OSError, ValueError):
+            self._start = None
+
+    @property
+    def replayable(self) -> bool:
+        return self._start is not None
+
+    async def rewind(self) -> None:
+        if self._start is None:
+            return await super().rewind()
+
+        await self._run(self.fp.seek, self._start)
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        if self.executor is None:
+            return await compat.run_in_thread(func, *args)
+
+        loop = compat.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def iterate(self) -> AsyncIterator[bytes]:
+        read = self.fp.read
+        remaining = self.size
+
+        while remaining is None or remaining > 0:
+            size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+
+            chunk = await self._run(read, size)
+            if not chunk:
+                break
+
+            if remaining is not None:
+                remaining -= len(chunk)
+
+            yield chunk
+
+        if remaining:
+            raise RuntimeError(f'File ended {remaining} bytes before its expected size')
+
+
+class AsyncIterablePayload(Payload):
+    """
+    A body produced by an async iterable, sent with chunked transfer encoding.
+    It can only be sent once.
+
+    Parameters
+    ----------
+    iterable: AsyncIterable[:class:`bytes`]
+        The async iterable.
+    content_type: Optional[:class:`str`]
+        The content type of the body.
+    """
+    def __init__(self, iterable: AsyncIterable[BytesLike], *, content_type: Optional[str] = None) -> None:
+        super().__init__()
+
+        self.iterable = iterable
+        self.content_type = content_type or 'application/octet-stream'
+
+    async def iterate(self) -> AsyncIterator[bytes]:
+        async for chunk in self.iterable:
+            if isinstance(chunk, str):
+                raise TypeError('async iterable bodies must yield bytes, not str')
+
+            yield chunk  # type: ignore
+
+
+class FormDataPayload(Payload):
+    """
+    A multipart body, encoded part by part while it is sent.
+
+    Parameters
+    ----------
+    form: :class:`~subway.formdata.FormData`
+        The form data.
+    chunk_size: :class:`int`
+        The amount of bytes to read from the files at once.
+    """
+    def __init__(self, form: FormData, *, chunk_size: int = CHUNK_SIZE) -> None:
+        super().__init__()
+
+        self.form = form
+        self.chunk_size = chunk_size
+        self.content_type = form.content_type
+        self.size = form.content_length()
+
+        self._starts = []
+        for field in form.values():
+            try:
+                self._starts.append(field.file.tell() if field.file.seekable() else None)
+            except (OSError, ValueError):
+                self._starts.append(None)
+
+    @property
+    def replayable(self) -> bool:
+        return None not in self._starts
+
+    async def rewind(self) -> None:
+        if not self.replayable:
+            return await super().rewind()
+
+        for field, start in zip(self.form.values(), self._starts):
+            await field.file.seek(start)  # type: ignore
+
+    def iterate(self) -> AsyncIterator[bytes]:
+        return self.form.stream(chunk_size=self.chunk_size)
+
+
+def get_payload(body: Any, *, executor: Optional[concurrent.futures.Executor] = None) -> Payload:
+    """
+    Wraps a request body in the matching :class:`~subway.http.Payload`.
+
+    Parameters
+    ----------
+    body: Any
+        The body. Can be a :class:`str`, a bytes-like object, a file object, an async iterable of bytes,
+        a :class:`~subway.formdata.FormData` or a :class:`~subway.http.Payload`, which is returned as is.
+    executor: Optional[:class:`concurrent.futures.Executor`]
+        The executor files are read in.
+
+    Raises
+    ------
+    TypeError
+        If the body is of an unsupported type.
+    """
+    if isinstance(body, Payload):
+        return body
+
+    if isinstance(body, (str, bytes, bytearray, memoryview)):
+        return BytesPayload(body)
+
+    if isinstance(body, FormData):
+        return FormDataPayload(body)
+
+    if isinstance(body, File) or hasattr(body, 'read'):
+        return FilePayload(body, executor=executor)
+
+    if hasattr(body, '__aiter__'):
+        return AsyncIterablePayload(body)
+
+    raise TypeError(f'Unsupported body type: {body.__class__.__name__!r}')
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+import collections
+import asyncio
+import logging
+import time
+
+from subway.url import URL
+from .hooker import TCPHooker
+
+if TYPE_CHECKING:
+    from .sessions import HTTPSession
+
+__all__ = (
+    'ConnectionPool',
+)
+
+log = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, int]
+
+class ConnectionPool:
+    """
+    A pool of keep-alive connections, shared by all the requests of an :class:`~subway.http.HTTPSession`.
+
+    Connections are kept per ``(scheme, host, port)``, or whatever key the :class:`~subway.http.Connector`
+    used for a URL returns, e.g. the socket path for Unix sockets. A connection is handed back to the pool once the body
+    of its response has been fully read and the server allowed it to be kept alive,
+    otherwise it is closed. The most recently used idle connection is always checked out first.
+
+    Parameters
+    ----------
+    session: :class:`~subway.http.HTTPSession`
+        The session the pool belongs to.
+    limit: Optional[:class:`int`]
+        The maximum amount of connections, idle or not. ``None`` means no limit.
+    limit_per_host: Optional[:class:`int`]
+        The maximum amount of connections to a single ``(scheme, host, port)``. ``None`` means no limit.
+    keepalive_timeout: :class:`float`
+        How many seconds a connection can stay idle before it is closed.
+
+    Attributes
+    ----------
+    created: :class:`int`
+        The amount of connections opened.
+    reused: :class:`int`
+        The amount of times an idle connection was checked out instead of opening a new one.
+    """
+    def __init__(
+        self,
+        session: HTTPSession,
+        *,
+        limit: Optional[int] = 100,
+        limit_per_host: Optional[int] = 10,
+        keepalive_timeout: float = 15.0
+    ) -> None:
+        if limit is not None and limit <= 0:
+            raise ValueError('limit must be a positive integer')
+
+        if limit_per_host is not None and limit_per_host <= 0:
+            raise ValueError('limit_per_host must be a positive integer')
+
+        self.session = session
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.created = 0
+        self.reused = 0
+
+        self._idle: Dict[PoolKey, Deque[Tuple[TCPHooker, float]]] = {}
+        self._acquired: Dict[PoolKey, int] = {}
+        self._size = 0
+        self._waiters: Deque[Tuple[PoolKey, asyncio.Future[None]]] = collections.deque()
+        self._cleanup_handle: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f'<ConnectionPool size={self._size} idle={self.idle} limit={self.limit} limit_per_host={self.limit_per_host}>'
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """
+        The amount of idle connections.
+        """
+        return sum(len(connections) for connections in self._idle.values())
+
+    def is_closed(self) -> bool:
+        """
+        True if the pool was closed.
+        """
+        return self._closed
+
+    def get_key(self, url: URL) -> PoolKey:
+        """
+        Returns the key connections to a URL are pooled under.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL.
+        """
+        return self.session.get_connector(url).get_key(url)
+
+    @staticmethod
+    def is_healthy(hooker: TCPHooker) -> bool:
+        """
+        Checks whether an idle connection can still be used.
+        A connection isn't usable once the server closed it or if it sent anything while it was idle.
+
+        Parameters
+        ----------
+        hooker: :class:`~subway.http.TCPHooker`
+            The connection to check.
+        """
+        if hooker.closed or hooker.reader is None or hooker.writer is None:
+            return False
+
+        if hooker.writer.transport.is_closing() or hooker.reader.at_eof():
+            return False
+
+        return not hooker.reader.buffer
+
+    def _connections_to(self, key: PoolKey) -> int:
+        return self._acquired.get(key, 0) + len(self._idle.get(key, ()))
+
+    def _can_connect(self, key: PoolKey) -> bool:
+        if self.limit_per_host is not None and self._connections_to(key) >= self.limit_per_host:
+            return False
+
+        if self.limit is not None and self._size >= self.limit:
+            # Make room by closing the least recently used idle connection to another host.
+            for other, connections in self._idle.items():
+                if other != key and connections:
+                    hooker, _ = connections.popleft()
+                    self._discard(hooker)
+
+                    break
+            else:
+                return False
+
+        return True
+
+    def _checkout(self, key: PoolKey) -> Optional[TCPHooker]:
+        connections = self._idle.get(key)
+        if not connections:
+            return None
+
+        now = time.monotonic()
+        while connections:
+            hooker, released_at = connections.pop()
+
+            if now - released_at >= self.keepalive_timeout or not self.is_healthy(hooker):
+                self._discard(hooker)
+                continue
+
+            self._acquired[key] = self._acquired.get(key, 0) + 1
+            self.reused += 1
+
+            return hooker
+
+        return None
+
+    def _discard(self, hooker: TCPHooker) -> None:
+        self._size -= 1
+        self._close_hooker(hooker)
+
+    @staticmethod
+    def _close_hooker(hooker: TCPHooker) -> None:
+        if hooker.writer is not None:
+            hooker.writer.close()
+
+        hooker.connected = False
+        hooker.closed = True
+
+    def _wakeup(self) -> None:
+        waiters = self._waiters
+        for _ in range(len(waiters)):
+            key, waiter = waiters.popleft()
+            if waiter.done():
+                continue
+
+            if self._idle.get(key) or self._can_connect(key):
+                waiter.set_result(None)
+                return
+
+            waiters.append((key, waiter))
+
+    async def acquire(self, url: URL) -> TCPHooker:
+        """
+        Checks out a connection to a URL, opening a new one if there are no idle ones.
+        If the pool is full, this waits until a connection is released.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL to connect to.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is closed.
+        """
+        if self._closed:
+            raise RuntimeError('Connection pool is closed')
+
+        connector = self.session.get_connector(url)
+        key = connector.get_key(url)
+
+        while True:
+            hooker = self._checkout(key)
+            if hooker is not None:
+                return hooker
+
+            if self._can_connect(key):
+                break
+
+            waiter = self.session.loop.create_future()
+            self._waiters.append((key, waiter))
+
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # We were woken up but won't use the slot, pass it on.
+                    self._wakeup()
+
+                raise
+
+            if self._closed:
+                raise RuntimeError('Connection pool is closed')
+
+        self._acquired[key] = self._acquired.get(key, 0) + 1
+        self._size += 1
+
+        hooker = TCPHooker(self.session, connector=connector)
+        hooker.pool = self
+        hooker.key = key
+
+        try:
+            await hooker.connect(url)
+        except BaseException:
+            self._acquired[key] -= 1
+            self._size -= 1
+            self._wakeup()
+
+            raise
+
+        self.created += 1
+        return hooker
+
+    def release(self, hooker: TCPHooker, *, reuse: bool = True) -> None:
+        """
+        Hands a connection back to the pool.
+
+        Parameters
+        ----------
+        hooker: :class:`~subway.http.TCPHooker`
+            The connection.
+        reuse: :class:`bool`
+            Whether the connection can be reused. If not, it is closed.
+        """
+        key = hooker.key
+        assert key is not None, 'hooker does not belong to a pool'
+
+        self._acquired[key] -= 1
+        if not self._acquired[key]:
+            del self._acquired[key]
+
+        if reuse and not self._closed and self.is_healthy(hooker):
+            self._idle.setdefault(key, collections.deque()).append((hooker, time.monotonic()))
+            self._schedule_cleanup()
+        else:
+            self._discard(hooker)
+
+        self._wakeup()
+
+    def _schedule_cleanup(self) -> None:
+        if self._cleanup_handle is None:
+            self._cleanup_handle = self.session.loop.call_later(self.keepalive_timeout, self._cleanup)
+
+    def _cleanup(self) -> None:
+        self._cleanup_handle = None
+        deadline = time.monotonic() - self.keepalive_timeout
+
+        for key in list(self._idle):
+            connections = self._idle[key]
+
+            # Connections are appended as they are released, so the oldest ones are on the left.
+            while connections and connections[0][1] <= deadline:
+                hooker, _ = connections.popleft()
+                self._discard(hooker)
+
+            if not connections:
+                del self._idle[key]
+
+        if self._idle:
+            self._schedule_cleanup()
+
+        self._wakeup()
+
+    async def close(self) -> None:
+        """
+        Closes every idle connection. Connections that are checked out are closed once they are released.
+        """
+        self._closed = True
+
+        if self._cleanup_handle is not None:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
+
+        hookers: List[TCPHooker] = []
+        for connections in self._idle.values():
+            hookers.extend(hooker for hooker, _ in connections)
+
+        self._idle.clear()
+
+        for hooker in hookers:
+            self._discard(hooker)
+
+        for _, waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        self._waiters.clear()
@@ -1,4 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from .payloads import Payload
 
 class HTTPRequest:
     """
@@ -14,7 +16,7 @@ class HTTPRequest:
         The host of the request.
     headers: :class:`dict`
         The headers of the request.
-    body: Any
+    body: Optional[Union[:class:`~subway.http.Payload`, :class:`str`, :class:`bytes`]]
         The body of the request.
     """
     def __init__(
@@ -36,16 +38,45 @@ class HTTPRequest:
     def __repr__(self) -> str:
         return '<Request method={0.method!r} host={0.host!r} path={0.path!r}>'.format(self)
 
-    def prepare(self) -> bytes:
+    def prepare_head(self) -> bytes:
         """
-        Encodes the request into a bytes object.
+        Encodes the request line and the headers into a bytes object.
         """
         request = [f'{self.method} {self.path} HTTP/1.1']
-
         request.extend(f'{k}: {v}' for k, v in self.headers.items())
-        request.append('\r\n')
 
-        if self.body is not None:
-            request.append(self.body)
+        return ('\r\n'.join(request) + '\r\n\r\n').encode()
+
+    def get_body(self) -> Optional[bytes]:
+        """
+        The body of the request if it is already in memory, ``None`` if it has to be streamed or if there is none.
+        """
+        body = self.body
+        if body is None:
+            return None
+
+        if isinstance(body, Payload):
+            return body.get_bytes()
+
+        if isinstance(body, str):
+            return body.encode()
+
+        return bytes(body)
+
+    def is_streamed(self) -> bool:
+        """
+        Whether the body has to be sent in chunks instead of along with the headers.
+        """
+        return isinstance(self.body, Payload) and self.body.get_bytes() is None
+
+    def prepare(self) -> bytes:
+        """
+        Encodes the request into a bytes object. Streamed bodies are not included.
+        """
+        head = self.prepare_head()
+        body = self.get_body()
+
+        if body:
+            return head + body
 
-        return b'\r\n'.join(part.encode() for part in request)
+        return head
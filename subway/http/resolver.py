@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import collections
+import itertools
+import asyncio
+import socket
+
+from subway import compat, utils
+
+__all__ = (
+    'ResolvedAddress',
+    'AbstractResolver',
+    'DefaultResolver',
+    'StaticResolver',
+    'CachingResolver',
+)
+
+CacheKey = Tuple[str, int, int]
+
+class ResolvedAddress:
+    """
+    An address a host name resolved to.
+
+    Attributes
+    ----------
+    host: :class:`str`
+        The host name that was resolved.
+    address: :class:`str`
+        The IP address.
+    port: :class:`int`
+        The port.
+    family: :class:`int`
+        The address family, either :attr:`socket.AF_INET` or :attr:`socket.AF_INET6`.
+    """
+    __slots__ = ('host', 'address', 'port', 'family')
+
+    def __init__(self, host: str, address: str, port: int, family: int) -> None:
+        self.host = host
+        self.address = address
+        self.port = port
+        self.family = family
+
+    def __repr__(self) -> str:
+        return f'<ResolvedAddress host={self.host!r} address={self.address!r} port={self.port}>'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ResolvedAddress):
+            return NotImplemented
+
+        return (self.address, self.port, self.family) == (other.address, other.port, other.family)
+
+    def __hash__(self) -> int:
+        return hash((self.address, self.port, self.family))
+
+
+class AbstractResolver(ABC):
+    """
+    The base class of the resolvers used by :class:`~subway.http.HTTPSession` to look up host names.
+    """
+
+    @abstractmethod
+    async def resolve(self, host: str, port: int, *, family: int = socket.AF_UNSPEC) -> List[ResolvedAddress]:
+        """
+        Resolves a host name.
+
+        Parameters
+        ----------
+        host: :class:`str`
+            The host name.
+        port: :class:`int`
+            The port to connect to.
+        family: :class:`int`
+            The address family to look up. Defaults to both IPv4 and IPv6.
+
+        Raises
+        ------
+        OSError
+            If the host name could not be resolved.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        Releases the resources used by the resolver.
+        """
+        pass
+
+
+class DefaultResolver(AbstractResolver):
+    """
+    A resolver that uses :meth:`asyncio.loop.getaddrinfo`, which runs in the loop's default executor.
+
+    Parameters
+    ----------
+    loop: Optional[:class:`asyncio.AbstractEventLoop`]
+        The event loop to use.
+    """
+    def __init__(self, *, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop or compat.get_event_loop()
+
+    async def resolve(self, host: str, port: int, *, family: int = socket.AF_UNSPEC) -> List[ResolvedAddress]:
+        infos = await self.loop.getaddrinfo(host, port, family=family, type=socket.SOCK_STREAM)
+
+        addresses: List[ResolvedAddress] = []
+        for info_family, _, _, _, sockaddr in infos:
+            address = ResolvedAddress(host, sockaddr[0], sockaddr[1], info_family)
+            if address not in addresses:
+                addresses.append(address)
+
+        return addresses
+
+
+class StaticResolver(AbstractResolver):
+    """
+    A resolver that looks host names up in a fixed mapping, like a hosts file.
+
+    Parameters
+    ----------
+    hosts: Mapping[:class:`str`, Union[:class:`str`, Iterable[:class:`str`]]]
+        A mapping of host names to one or more IP addresses.
+    fallback: Optional[:class:`~subway.http.AbstractResolver`]
+        The resolver used for host names that aren't in the mapping.
+        If not given, they fail to resolve.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        resolver = StaticResolver({'api.example.com': ['127.0.0.1', '::1']})
+        session = HTTPSession(resolver=resolver)
+    """
+    def __init__(
+        self,
+        hosts: Mapping[str, Union[str, Iterable[str]]],
+        *,
+        fallback: Optional[AbstractResolver] = None
+    ) -> None:
+        self.hosts: Dict[str, List[str]] = {}
+        self.fallback = fallback
+
+        for host, addresses in hosts.items():
+            if isinstance(addresses, str):
+                addresses = [addresses]
+
+            self.hosts[host.lower()] = list(addresses)
+
+    async def resolve(self, host: str, port: int, *, family: int = socket.AF_UNSPEC) -> List[ResolvedAddress]:
+        entries = self.hosts.get(host.lower())
+        if entries is None:
+            if self.fallback is not None:
+                return await self.fallback.resolve(host, port, family=family)
+
+            raise socket.gaierror(socket.EAI_NONAME, f'Could not resolve {host!r}')
+
+        addresses: List[ResolvedAddress] = []
+        for entry in entries:
+            entry_family = socket.AF_INET6 if utils.is_ipv6(entry) else socket.AF_INET
+            if family in (socket.AF_UNSPEC, entry_family):
+                addresses.append(ResolvedAddress(host, entry, port, entry_family))
+
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f'Could not resolve {host!r}')
+
+        return addresses
+
+    async def close(self) -> None:
+        if self.fallback is not None:
+            await self.fallback.close()
+
+
+class _CacheEntry:
+    __slots__ = ('addresses', 'exception', 'expires_at', 'counter')
+
+    def __init__(
+        self,
+        addresses: List[ResolvedAddress],
+        exception: Optional[OSError],
+        expires_at: float
+    ) -> None:
+        self.addresses = addresses
+        self.exception = exception
+        self.expires_at = expires_at
+        self.counter = itertools.count()
+
+
+class CachingResolver(AbstractResolver):
+    """
+    A resolver that caches the results of another one.
+
+    Concurrent lookups of the same host name share a single lookup, failed lookups are cached too
+    so a host that doesn't resolve isn't looked up on every request, and every call rotates the returned
+    addresses so connections are spread over all of them.
+
+    Parameters
+    ----------
+    resolver: Optional[:class:`~subway.http.AbstractResolver`]
+        The resolver to cache the results of. Defaults to :class:`~subway.http.DefaultResolver`.
+    ttl: :class:`float`
+        How many seconds resolved addresses are cached for.
+    negative_ttl: :class:`float`
+        How many seconds failed lookups are cached for. ``0`` disables caching them.
+    max_size: :class:`int`
+        The maximum amount of cached host names. The least recently looked up ones are evicted first.
+    loop: Optional[:class:`asyncio.AbstractEventLoop`]
+        The event loop to use.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        The amount of lookups answered from the cache.
+    misses: :class:`int`
+        The amount of lookups passed on to the underlying resolver.
+    """
+    def __init__(
+        self,
+        resolver: Optional[AbstractResolver] = None,
+        *,
+        ttl: float = 10.0,
+        negative_ttl: float = 1.0,
+        max_size: int = 1024,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        if ttl < 0 or negative_ttl < 0:
+            raise ValueError('ttl and negative_ttl must not be negative')
+
+        if max_size <= 0:
+            raise ValueError('max_size must be a positive integer')
+
+        self.loop = loop or compat.get_event_loop()
+        self.resolver = resolver or DefaultResolver(loop=self.loop)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: collections.OrderedDict[CacheKey, _CacheEntry] = collections.OrderedDict()
+        self._pending: Dict[CacheKey, asyncio.Task[_CacheEntry]] = {}
+
+    def __repr__(self) -> str:
+        return f'<CachingResolver size={len(self._cache)} ttl={self.ttl} negative_ttl={self.negative_ttl}>'
+
+    def clear(self, host: Optional[str] = None) -> None:
+        """
+        Removes cached lookups.
+
+        Parameters
+        ----------
+        host: Optional[:class:`str`]
+            The host name to forget. If not given, the whole cache is cleared.
+        """
+        if host is None:
+            return self._cache.clear()
+
+        for key in [key for key in self._cache if key[0] == host]:
+            del self._cache[key]
+
+    async def resolve(self, host: str, port: int, *, family: int = socket.AF_UNSPEC) -> List[ResolvedAddress]:
+        key = (host, port, family)
+
+        entry = self._cache.get(key)
+        if entry is not None and entry.expires_at > self.loop.time():
+            self._cache.move_to_end(key)
+            self.hits += 1
+        else:
+            task = self._pending.get(key)
+            if task is None:
+                self.misses += 1
+
+                task = self._pending[key] = self.loop.create_task(self._lookup(key))
+                task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+            # A caller that gets cancelled must not cancel the lookup the others are waiting on.
+            entry = await asyncio.shield(task)
+
+        if entry.exception is not None:
+            raise type(entry.exception)(*entry.exception.args)
+
+        addresses = entry.addresses
+        if len(addresses) == 1:
+            return addresses.copy()
+
+        offset = next(entry.counter) % len(addresses)
+        return addresses[offset:] + addresses[:offset]
+
+    async def _lookup(self, key: CacheKey) -> _CacheEntry:
+        host, port, family = key
+
+        try:
+            addresses = await self.resolver.resolve(host, port, family=family)
+        except OSError as exc:
+            entry = _CacheEntry([], exc, self.loop.time() + self.negative_ttl)
+            ttl = self.negative_ttl
+        else:
+            entry = _CacheEntry(addresses, None, self.loop.time() + self.ttl)
+            ttl = self.ttl
+
+        if ttl > 0:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.pop(key, None)
+
+        return entry
+
+    async def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+
+        self._pending.clear()
+        self._cache.clear()
+
+        await self.resolver.close()
@@ -1,14 +1,69 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import AsyncIterator, Awaitable, Deque, Dict, Iterator, Literal, Optional, TYPE_CHECKING, TypeVar, Union
+import collections
+import asyncio
+import os
+import zlib
 
 from subway import HTTPStatus
+from subway.errors import PartialRead
 from subway.headers import Headers
 from subway.streams import StreamReader
 from subway.request import HTTPConnection
+from .errors import ContentDecodingError, IncompleteResponseBody, InvalidChunkedBody
 
 if TYPE_CHECKING:
     from .abc import Hooker
+    from .sessions import HTTPSession
+
+T = TypeVar('T')
+
+Framing = Literal['none', 'length', 'chunked', 'close']
+
+CHUNK_SIZE = 65536
+MAX_CHUNK_LINE = 8192
+
+SUPPORTED_ENCODINGS = ('gzip', 'x-gzip', 'deflate')
+
+class _ContentDecoder:
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        self._started = False
+
+        if encoding == 'deflate':
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+        else:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self._started or self.encoding != 'deflate':
+            return self._decompressor.decompress(data, CHUNK_SIZE)
+
+        self._started = True
+
+        try:
+            return self._decompressor.decompress(data, CHUNK_SIZE)
+        except zlib.error:
+            # Some servers send raw deflate streams, without the zlib header.
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decompressor.decompress(data, CHUNK_SIZE)
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        # The output is limited so a small, highly compressed chunk can't produce an unbounded amount of data at once.
+        chunk = self._decompress(data)
+        while True:
+            if chunk:
+                yield chunk
+
+            tail = self._decompressor.unconsumed_tail
+            if not tail:
+                break
+
+            chunk = self._decompressor.decompress(tail, CHUNK_SIZE)
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
 
 
 class HTTPResponse(HTTPConnection):
@@ -23,6 +78,12 @@ class HTTPResponse(HTTPConnection):
         The HTTP version of the response.
     headers: :class:`dict`
         The headers of the response.
+    method: :class:`str`
+        The method of the request this response is for.
+    auto_decompress: :class:`bool`
+        Whether bodies with a ``gzip`` or ``deflate`` ``Content-Encoding`` are decompressed while they are read.
+    from_cache: :class:`bool`
+        Whether the response was served from the session's :class:`~subway.http.HTTPCache`.
     """
     def __init__(
         self,
@@ -31,14 +92,40 @@ class HTTPResponse(HTTPConnection):
         status: HTTPStatus,
         version: str,
         headers: Dict[str, str],
+        method: str = 'GET',
     ) -> None:
         self._hooker = hooker
 
         self.status = status
         self.version = version
         self.headers = Headers(headers)
+        self.method = method
+        self.auto_decompress = True
+        self.from_cache = False
 
         self._body: bytes = b''
+        # Raw body data that was read ahead of time, see buffer_body.
+        self._unread: Deque[bytes] = collections.deque()
+        self._raw: Optional[AsyncIterator[bytes]] = None
+        self._released = False
+        self._consumed = False
+        self._remaining = 0
+        self._read_timeout: Optional[float] = None
+        self._deadline: Optional[float] = None
+
+        transfer_encoding = (self.headers.get('Transfer-Encoding') or '').lower()
+
+        self._framing: Framing
+        if not self.has_body():
+            self._framing = 'none'
+            self._consumed = True
+        elif 'chunked' in transfer_encoding:
+            self._framing = 'chunked'
+        elif self.headers.content_length is not None:
+            self._framing = 'length'
+            self._remaining = self.headers.content_length
+        else:
+            self._framing = 'close'
 
     @property
     def hooker(self) -> Hooker:
@@ -47,6 +134,13 @@ class HTTPResponse(HTTPConnection):
         """
         return self._hooker
 
+    @property
+    def session(self) -> HTTPSession:
+        """
+        The session the response belongs to.
+        """
+        return self.hooker.session
+
     @property
     def charset(self) -> Optional[str]:
         """
@@ -61,18 +155,402 @@ class HTTPResponse(HTTPConnection):
         """
         return self.headers.content_type
 
+    def has_body(self) -> bool:
+        """
+        Whether the response can have a body at all.
+        Responses to ``HEAD`` requests and ``1xx``, ``204`` and ``304`` responses never do.
+        """
+        status = int(self.status)
+        return self.method != 'HEAD' and status >= 200 and status not in (204, 304)
+
+    def is_body_consumed(self) -> bool:
+        """
+        Whether the whole body of the response has been read.
+        """
+        return self._consumed
+
+    def should_keep_alive(self) -> bool:
+        """
+        Whether the server allows the connection to be reused for another request.
+        Responses without a length, which end when the connection is closed, never allow it.
+        """
+        if self._framing == 'close':
+            return False
+
+        connection = (self.headers.get('Connection') or '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+
+        return connection != 'close'
+
+    def set_timeouts(self, *, read: Optional[float] = None, deadline: Optional[float] = None) -> None:
+        """
+        Sets the timeouts used while reading the body.
+
+        Parameters
+        ----------
+        read: Optional[:class:`float`]
+            How long to wait for more of the body to arrive.
+        deadline: Optional[:class:`float`]
+            The time, according to the event loop's clock, by which the whole body must be read.
+        """
+        self._read_timeout = read
+        self._deadline = deadline
+
+    def _get_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return self._read_timeout if timeout is None else timeout
+
+    async def _wait(self, aw: Awaitable[T]) -> T:
+        if self._deadline is None:
+            return await aw
+
+        # The reader's timeout only limits how long it waits for each piece of data,
+        # a body that keeps trickling in would never hit it.
+        return await asyncio.wait_for(aw, max(self._deadline - self.hooker.loop.time(), 0))
+
     def get_reader(self) -> StreamReader:
         assert self.hooker.reader is not None
         return self.hooker.reader
 
+    @property
+    def content_encoding(self) -> Optional[str]:
+        """
+        The content encoding of the response, if any.
+        """
+        encoding = self.headers.get('Content-Encoding')
+        if encoding is None:
+            return None
+
+        return encoding.strip().lower() or None
+
+    async def stream(self, *, timeout: Optional[float] = None) -> AsyncIterator[bytes]:
+        """
+        The body of the response as a stream.
+
+        The body is delimited by its ``Content-Length``, decoded if it uses chunked transfer encoding,
+        or read until the server closes the connection if it has neither.
+        If :attr:`auto_decompress` is set, ``gzip`` and ``deflate`` bodies are decompressed incrementally.
+        Once the whole body is read, the connection is handed back to the session's pool.
+        If reading fails, times out or is cancelled, the connection is closed instead.
+
+        Parameters
+        ----------
+        timeout: Optional[:class:`float`]
+            How long to wait for more of the body to arrive. Defaults to the read timeout of the request.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If more of the body didn't arrive in time or the total timeout of the request expired.
+        IncompleteResponseBody
+            If the connection was closed before the whole body was received.
+        InvalidChunkedBody
+            If a chunked body is malformed.
+        ContentDecodingError
+            If a compressed body could not be decompressed.
+        """
+        if self._consumed and not self._unread:
+            return
+
+        encoding = self.content_encoding
+        iterator = self._stream(timeout)
+
+        try:
+            if not self.auto_decompress or encoding not in SUPPORTED_ENCODINGS:
+                async for chunk in iterator:
+                    yield chunk
+
+                return
+
+            decoder = _ContentDecoder('deflate' if encoding == 'deflate' else 'gzip')
+
+            try:
+                async for data in iterator:
+                    for chunk in decoder.decompress(data):
+                        yield chunk
+
+                chunk = decoder.flush()
+            except zlib.error as exc:
+                raise ContentDecodingError(f'Could not decode {encoding} body: {exc}', hooker=self.hooker) from None
+
+            if chunk:
+                yield chunk
+        finally:
+            # Hands the connection back right away when the body isn't read to the end.
+            await iterator.aclose()
+
+    async def iter_chunks(self, size: int = CHUNK_SIZE, *, timeout: Optional[float] = None) -> AsyncIterator[bytes]:
+        """
+        Iterates over the body in chunks of ``size`` bytes, the last one may be smaller.
+        The body is only received from the server as it is iterated over.
+
+        Parameters
+        ----------
+        size: :class:`int`
+            The size of the chunks.
+        timeout: Optional[:class:`float`]
+            How long to wait for more of the body to arrive. Defaults to the read timeout of the request.
+
+        Raises
+        ------
+        ValueError
+            If ``size`` is not a positive integer.
+        """
+        if size <= 0:
+            raise ValueError('size must be a positive integer')
+
+        buffer = bytearray()
+        async for data in self.stream(timeout=timeout):
+            if not buffer and len(data) == size:
+                yield data
+                continue
+
+            buffer += data
+            while len(buffer) >= size:
+                chunk = bytes(buffer[:size])
+                del buffer[:size]
+
+                yield chunk
+
+        if buffer:
+            yield bytes(buffer)
+
+    async def save_to(
+        self,
+        path: Union[str, os.PathLike[str]],
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Streams the body into a file, without holding all of it in memory.
+        Writes happen in the session's thread pool, the next chunk is received while the previous one is written.
+
+        Parameters
+        ----------
+        path: Union[:class:`str`, :class:`os.PathLike`]
+            The path of the file. It is created or truncated.
+        chunk_size: :class:`int`
+            The size of the chunks written to the file.
+        timeout: Optional[:class:`float`]
+            How long to wait for more of the body to arrive. Defaults to the read timeout of the request.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of bytes written.
+        """
+        loop = self.session.loop
+        executor = self.session.executor
+
+        file = await loop.run_in_executor(executor, open, path, 'wb')
+        written = 0
+        pending: Optional[asyncio.Future[int]] = None
+
+        try:
+            async for chunk in self.iter_chunks(chunk_size, timeout=timeout):
+                if pending is not None:
+                    await pending
+
+                pending = loop.run_in_executor(executor, file.write, chunk)
+                written += len(chunk)
+
+            if pending is not None:
+                await pending
+        finally:
+            if pending is not None and not pending.done():
+                # The file can't be closed while it's being written to.
+                await asyncio.wait([pending])
+
+            await loop.run_in_executor(executor, file.close)
+
+        return written
+
+    async def buffer_body(self, *, limit: int) -> Optional[bytes]:
+        """
+        Reads the raw body into memory ahead of time, without decompressing it.
+        The body can still be read afterwards as usual.
+
+        Parameters
+        ----------
+        limit: :class:`int`
+            The largest body that is buffered. Once a body goes over it, buffering stops
+            and the rest of it is received when the body is read.
+
+        Returns
+        -------
+        Optional[:class:`bytes`]
+            The whole raw body, or ``None`` if it is larger than ``limit``.
+        """
+        if self._consumed:
+            return b''.join(self._unread)
+
+        if self._raw is None:
+            self._raw = self._iter_raw(None)
+
+        size = sum(len(chunk) for chunk in self._unread)
+
+        try:
+            async for chunk in self._raw:
+                self._unread.append(chunk)
+
+                size += len(chunk)
+                if size > limit:
+                    return None
+        except BaseException:
+            self._release()
+            raise
+
+        self._raw = None
+        self._consumed = True
+        self._release()
+
+        return b''.join(self._unread)
+
+    def _iter_raw(self, timeout: Optional[float]) -> AsyncIterator[bytes]:
+        if self._framing == 'length':
+            return self._read_length(timeout)
+        elif self._framing == 'chunked':
+            return self._read_chunked(timeout)
+        else:
+            return self._read_until_close(timeout)
+
+    async def _stream(self, timeout: Optional[float]) -> AsyncIterator[bytes]:
+        try:
+            while self._unread:
+                yield self._unread.popleft()
+
+            if self._consumed:
+                return
+
+            # A body that was partly buffered has to be continued by the same reader, it holds the chunked state.
+            iterator = self._raw or self._iter_raw(timeout)
+            async for chunk in iterator:
+                yield chunk
+        except BaseException:
+            self._release()
+            raise
+
+        self._raw = None
+        self._consumed = True
+        self._release()
+
+    async def _read(self, size: int, timeout: Optional[float]) -> bytes:
+        reader = self.get_reader()
+        if reader.at_eof() and not reader.buffer:
+            raise IncompleteResponseBody('Connection closed before the response body was received', hooker=self.hooker)
+
+        try:
+            return await self._wait(reader.read(size, timeout=self._get_timeout(timeout)))
+        except PartialRead as exc:
+            raise IncompleteResponseBody(str(exc), hooker=self.hooker) from None
+
+    async def _read_line(self, timeout: Optional[float]) -> bytes:
+        reader = self.get_reader()
+        if reader.at_eof() and not reader.buffer:
+            raise IncompleteResponseBody('Connection closed before the response body was received', hooker=self.hooker)
+
+        try:
+            line = await self._wait(reader.readuntil(b'\r\n', timeout=self._get_timeout(timeout)))
+        except PartialRead:
+            raise IncompleteResponseBody('Connection closed in the middle of a chunk', hooker=self.hooker) from None
+
+        if len(line) > MAX_CHUNK_LINE:
+            raise InvalidChunkedBody('Chunk size line is too long', hooker=self.hooker)
+
+        return line
+
+    async def _read_length(self, timeout: Optional[float]) -> AsyncIterator[bytes]:
+        while self._remaining:
+            chunk = await self._read(min(self._remaining, CHUNK_SIZE), timeout)
+
+            self._remaining -= len(chunk)
+            yield chunk
+
+    async def _read_chunked(self, timeout: Optional[float]) -> AsyncIterator[bytes]:
+        while True:
+            line = await self._read_line(timeout)
+            size, _, _ = line.partition(b';')
+
+            try:
+                remaining = int(size.strip(), 16)
+            except ValueError:
+                raise InvalidChunkedBody(f'Invalid chunk size: {size!r}', hooker=self.hooker) from None
+
+            if remaining < 0:
+                raise InvalidChunkedBody(f'Invalid chunk size: {size!r}', hooker=self.hooker)
+
+            if remaining == 0:
+                break
+
+            while remaining:
+                chunk = await self._read(min(remaining, CHUNK_SIZE), timeout)
+
+                remaining -= len(chunk)
+                yield chunk
+
+            if await self._read(2, timeout) != b'\r\n':
+                raise InvalidChunkedBody('Chunk data is not followed by CRLF', hooker=self.hooker)
+
+        # Trailers are discarded, they end with an empty line.
+        while await self._read_line(timeout):
+            pass
+
+    async def _read_until_close(self, timeout: Optional[float]) -> AsyncIterator[bytes]:
+        reader = self.get_reader()
+
+        while reader.buffer or not reader.at_eof():
+            chunk = await self._wait(reader.read(timeout=self._get_timeout(timeout)))
+            if chunk:
+                yield chunk
+
+    def _release(self) -> None:
+        if self._released:
+            return
+
+        self._released = True
+
+        hooker = self.hooker
+        pool = getattr(hooker, 'pool', None)
+        if pool is not None:
+            pool.release(hooker, reuse=self._consumed and self.should_keep_alive())  # type: ignore
+        elif not self._consumed and hooker.writer is not None:
+            # Whatever is left of the body can't be told apart from the next response.
+            hooker.writer.close()
+            hooker.connected = False
+            hooker.closed = True
+
+    async def discard(self, *, limit: int = CHUNK_SIZE) -> None:
+        """
+        Throws away the rest of the body. A small body with a known length is read so the connection
+        can be reused, otherwise the connection is closed.
+
+        Parameters
+        ----------
+        limit: :class:`int`
+            The largest body that is read.
+        """
+        if not self._consumed and self._framing == 'length' and self._remaining <= limit:
+            try:
+                async for _ in self._stream(self._read_timeout):
+                    pass
+            except Exception:
+                pass
+
+        await self.close()
+
     def is_closed(self) -> bool:
         """
         Whether the response is closed.
         """
-        return self.hooker.closed
+        return self._released or self.hooker.closed
 
     async def close(self) -> None:
         """
-        Close the response.
+        Close the response. If the connection is pooled, it is handed back to the pool
+        and only closed if it can't be reused.
         """
-        await self.hooker.close()
\ No newline at end of file
+        if getattr(self.hooker, 'pool', None) is not None:
+            return self._release()
+
+        await self.hooker.close()
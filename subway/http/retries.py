@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Collection, Deque, Dict, Optional, Tuple, Type
+import collections
+import asyncio
+import random
+import math
+import time
+
+from subway.errors import PartialRead
+from .errors import IncompleteResponseBody
+
+if TYPE_CHECKING:
+    from .response import HTTPResponse
+
+__all__ = (
+    'IDEMPOTENT_METHODS',
+    'SAFE_METHODS',
+    'RetryBudget',
+    'RetryPolicy',
+    'HedgePolicy',
+)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'})
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE'})
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    OSError, asyncio.TimeoutError, PartialRead, IncompleteResponseBody
+)
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the requests sent recently, so that retries can't multiply the load
+    on a dependency that is already struggling.
+
+    Parameters
+    ----------
+    ratio: :class:`float`
+        The amount of retries allowed per request sent, e.g. ``0.2`` allows one retry for every five requests.
+    min_per_second: :class:`float`
+        The amount of retries allowed per second regardless of how many requests were sent,
+        so that retries still happen when there is little traffic.
+    window: :class:`int`
+        How many seconds requests and retries are remembered for.
+
+    Attributes
+    ----------
+    exhausted: :class:`int`
+        The amount of retries that were denied.
+    """
+    def __init__(self, *, ratio: float = 0.2, min_per_second: float = 10.0, window: int = 10) -> None:
+        if ratio < 0 or min_per_second < 0:
+            raise ValueError('ratio and min_per_second must not be negative')
+
+        if window <= 0:
+            raise ValueError('window must be a positive integer')
+
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self.exhausted = 0
+
+        # One [requests, retries] pair per second.
+        self._buckets: Dict[int, Tuple[int, int]] = {}
+
+    def __repr__(self) -> str:
+        return f'<RetryBudget ratio={self.ratio} min_per_second={self.min_per_second} window={self.window}>'
+
+    def _totals(self, now: int) -> Tuple[int, int]:
+        start = now - self.window
+
+        for second in [second for second in self._buckets if second <= start]:
+            del self._buckets[second]
+
+        requests = sum(bucket[0] for bucket in self._buckets.values())
+        retries = sum(bucket[1] for bucket in self._buckets.values())
+
+        return requests, retries
+
+    def record_request(self) -> None:
+        """
+        Records that a request was sent.
+        """
+        now = int(time.monotonic())
+        requests, retries = self._buckets.get(now, (0, 0))
+
+        self._buckets[now] = (requests + 1, retries)
+
+    def acquire(self) -> bool:
+        """
+        Withdraws a retry from the budget. Returns ``False`` if the budget is exhausted.
+        """
+        now = int(time.monotonic())
+        requests, retries = self._totals(now)
+
+        if retries >= self.min_per_second * self.window + self.ratio * requests:
+            self.exhausted += 1
+            return False
+
+        current = self._buckets.get(now, (0, 0))
+        self._buckets[now] = (current[0], current[1] + 1)
+
+        return True
+
+
+class RetryPolicy:
+    """
+    Decides which requests of an :class:`~subway.http.HTTPSession` are retried and how long to wait in between.
+
+    A request is retried if it raised one of ``exceptions`` or got a response with one of ``statuses``,
+    as long as its method is one of ``methods``, its body can be sent again and the retry budget allows it.
+    Retries wait for an exponentially growing delay with full jitter, and never past the total timeout
+    of the request.
+
+    Parameters
+    ----------
+    attempts: :class:`int`
+        The maximum amount of attempts, including the first one.
+    methods: Collection[:class:`str`]
+        The methods that can be retried. Defaults to the idempotent methods.
+    statuses: Collection[:class:`int`]
+        The response statuses that are retried.
+    exceptions: Tuple[Type[:class:`BaseException`], ...]
+        The exceptions that are retried.
+    backoff: :class:`float`
+        The delay before the first retry, doubled on every retry after it.
+    max_backoff: :class:`float`
+        The maximum delay between two attempts.
+    jitter: :class:`bool`
+        Whether to pick a random delay between 0 and the backoff, so clients that failed together
+        don't retry together.
+    budget: Optional[:class:`~subway.http.RetryBudget`]
+        The budget retries are withdrawn from. ``None`` means retries are only limited by ``attempts``.
+    should_retry_response: Optional[Callable[[:class:`~subway.http.HTTPResponse`], :class:`bool`]]
+        Replaces the status check with a custom one.
+    should_retry_exception: Optional[Callable[[:class:`BaseException`], :class:`bool`]]
+        Replaces the exception check with a custom one.
+
+    Attributes
+    ----------
+    retries: :class:`int`
+        The amount of retries made.
+    """
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        statuses: Collection[int] = RETRY_STATUSES,
+        exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        budget: Optional[RetryBudget] = None,
+        should_retry_response: Optional[Callable[[HTTPResponse], bool]] = None,
+        should_retry_exception: Optional[Callable[[BaseException], bool]] = None
+    ) -> None:
+        if attempts <= 0:
+            raise ValueError('attempts must be a positive integer')
+
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError('backoff and max_backoff must not be negative')
+
+        self.attempts = attempts
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.retries = 0
+
+        self._should_retry_response = should_retry_response
+        self._should_retry_exception = should_retry_exception
+
+    def __repr__(self) -> str:
+        return f'<RetryPolicy attempts={self.attempts} backoff={self.backoff} max_backoff={self.max_backoff}>'
+
+    def is_retryable_method(self, method: str) -> bool:
+        """
+        Whether requests with the given method can be retried.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method.
+        """
+        return method.upper() in self.methods
+
+    def should_retry_response(self, response: HTTPResponse) -> bool:
+        """
+        Whether a request that got the given response should be retried.
+
+        Parameters
+        ----------
+        response: :class:`~subway.http.HTTPResponse`
+            The response.
+        """
+        if self._should_retry_response is not None:
+            return self._should_retry_response(response)
+
+        return int(response.status) in self.statuses
+
+    def should_retry_exception(self, exc: BaseException) -> bool:
+        """
+        Whether a request that raised the given exception should be retried.
+
+        Parameters
+        ----------
+        exc: :class:`BaseException`
+            The exception.
+        """
+        if self._should_retry_exception is not None:
+            return self._should_retry_exception(exc)
+
+        return isinstance(exc, self.exceptions)
+
+    def get_delay(self, retry: int) -> float:
+        """
+        Returns how long to wait before a retry.
+
+        Parameters
+        ----------
+        retry: :class:`int`
+            The number of the retry, starting at 1.
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (retry - 1)))
+        if self.jitter:
+            return random.uniform(0, delay)
+
+        return delay
+
+    def record_request(self) -> None:
+        """
+        Records a request in the budget, if there is one.
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def acquire(self) -> bool:
+        """
+        Withdraws a retry from the budget. Returns ``False`` if the budget is exhausted.
+        """
+        if self.budget is not None and not self.budget.acquire():
+            return False
+
+        self.retries += 1
+        return True
+
+
+class HedgePolicy:
+    """
+    Sends a second copy of a slow request and uses whichever response arrives first, cancelling the other.
+
+    The hedge is sent once the request has been waiting for longer than ``quantile`` of the recent requests,
+    e.g. the 95th percentile, so only the slowest requests are duplicated. Until ``min_samples`` requests were
+    measured, or if ``delay`` is given, a fixed delay is used instead.
+
+    Parameters
+    ----------
+    quantile: :class:`float`
+        The quantile of the recent latencies to wait for before hedging.
+    delay: Optional[:class:`float`]
+        A fixed delay to use instead of the measured quantile.
+    min_delay: :class:`float`
+        The minimum delay before hedging, so requests that are fast anyway aren't duplicated.
+    min_samples: :class:`int`
+        How many latencies have to be measured before the quantile is used. No request is hedged before that,
+        unless ``delay`` is given.
+    samples: :class:`int`
+        How many of the most recent latencies are kept.
+    methods: Collection[:class:`str`]
+        The methods that can be hedged. Defaults to the safe methods.
+
+    Attributes
+    ----------
+    hedged: :class:`int`
+        The amount of hedges sent.
+    won: :class:`int`
+        The amount of times the hedge responded first.
+    """
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        delay: Optional[float] = None,
+        min_delay: float = 0.001,
+        min_samples: int = 20,
+        samples: int = 1000,
+        methods: Collection[str] = SAFE_METHODS
+    ) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError('quantile must be between 0 and 1')
+
+        if samples < min_samples or min_samples <= 0:
+            raise ValueError('samples must be greater than or equal to min_samples, which must be positive')
+
+        self.quantile = quantile
+        self.delay = delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.methods = frozenset(method.upper() for method in methods)
+        self.hedged = 0
+        self.won = 0
+
+        self._latencies: Deque[float] = collections.deque(maxlen=samples)
+        self._cached_delay: Optional[float] = None
+        self._recorded = 0
+
+    def __repr__(self) -> str:
+        return f'<HedgePolicy quantile={self.quantile} delay={self.get_delay()}>'
+
+    def is_hedgeable_method(self, method: str) -> bool:
+        """
+        Whether requests with the given method can be hedged.
+
+        Parameters
+        ----------
+        method: :class:`str`
+            The method.
+        """
+        return method.upper() in self.methods
+
+    def record(self, latency: float) -> None:
+        """
+        Records how long a request took to get its response.
+
+        Parameters
+        ----------
+        latency: :class:`float`
+            The latency in seconds.
+        """
+        self._latencies.append(latency)
+        self._recorded += 1
+
+        # Sorting the samples on every request would cost more than what hedging saves,
+        # so the quantile is refreshed every few requests instead.
+        if self._recorded % max(self.min_samples // 2, 1) == 0:
+            self._cached_delay = None
+
+    def get_delay(self) -> Optional[float]:
+        """
+        Returns how long to wait before sending a hedge, or ``None`` if requests shouldn't be hedged yet.
+        """
+        if self.delay is not None:
+            return max(self.delay, self.min_delay)
+
+        if len(self._latencies) < self.min_samples:
+            return None
+
+        if self._cached_delay is None:
+            latencies = sorted(self._latencies)
+            index = min(len(latencies) - 1, math.ceil(self.quantile * len(latencies)) - 1)
+
+            self._cached_delay = max(latencies[index], self.min_delay)
+
+        return self._cached_delay
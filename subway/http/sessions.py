@@ -1,24 +1,42 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Coroutine, Deque, Dict, Iterable, List, Literal, Optional, Set, Tuple, TypeVar, Union
+import collections
 import asyncio
+import concurrent.futures
 import json as _json
 
+from .bulk import BulkRequest, BulkResult
+from .cache import HTTPCache
+from .connectors import UNIX_SCHEMES, Connector, TCPConnector, UnixConnector
 from .hooker import TCPHooker, WebSocketHooker, WebSocket
+from .payloads import BytesPayload, Payload, get_payload
+from .pool import ConnectionPool
+from .resolver import AbstractResolver, CachingResolver
+from .retries import IDEMPOTENT_METHODS, HedgePolicy, RetryPolicy
 from .response import HTTPResponse
+from .timeouts import Timeout, remaining
 from .utils import RequestContextManager, WebSocketContextManager
 from subway import compat, utils
+from subway.locks import Semaphore
+from subway.errors import PartialRead
 from subway.types import StrURL
+from subway.websockets import PerMessageDeflate, Heartbeat
 
 if TYPE_CHECKING:
     from subway import URL
 
 __all__ = (
+    'DEFAULT_TIMEOUT',
     'HTTPSession',
     'request',
     'ws_connect',
 )
 
+T = TypeVar('T')
+
+DEFAULT_TIMEOUT = Timeout(total=300.0, connect=30.0)
+
 class HTTPSession:
     """
     A class representing an HTTP session.
@@ -27,11 +45,51 @@ class HTTPSession:
     ----------
     loop: :class:`asyncio.AbstractEventLoop`
         The event loop to use.
+    connection_limit: Optional[:class:`int`]
+        The maximum amount of connections the session keeps open at once. ``None`` means no limit.
+    connection_limit_per_host: Optional[:class:`int`]
+        The maximum amount of connections to the same scheme, host and port. ``None`` means no limit.
+    keepalive_timeout: :class:`float`
+        How many seconds an idle connection is kept open for reuse.
+    timeout: Union[:class:`~subway.http.Timeout`, :class:`float`]
+        The default timeouts of requests. A number is used as the total timeout.
+    resolver: Optional[:class:`~subway.http.AbstractResolver`]
+        The resolver used to look up host names. Defaults to a :class:`~subway.http.CachingResolver`,
+        which is closed along with the session.
+    auto_decompress: :class:`bool`
+        Whether to ask for ``gzip`` or ``deflate`` compressed responses and decompress them while they are read.
+    file_workers: :class:`int`
+        The amount of threads used for file operations, like :meth:`~subway.http.HTTPResponse.save_to`.
+    retry: Optional[:class:`~subway.http.RetryPolicy`]
+        The default retry policy of requests. ``None`` means requests aren't retried.
+    hedge: Optional[:class:`~subway.http.HedgePolicy`]
+        The default hedging policy of requests. ``None`` means requests aren't hedged.
+    cache: Optional[:class:`~subway.http.HTTPCache`]
+        The cache of ``GET`` responses. ``None`` means responses aren't cached.
+    connector: Optional[:class:`~subway.http.Connector`]
+        The connector used to open connections. Defaults to a :class:`~subway.http.TCPConnector`
+        using ``resolver``. ``http+unix://`` URLs always go through a :class:`~subway.http.UnixConnector`.
 
     Attributes
     ----------
     loop: :class:`asyncio.AbstractEventLoop`
         The event loop used by the session.
+    pool: :class:`~subway.http.ConnectionPool`
+        The pool of keep-alive connections used by requests.
+    timeout: :class:`~subway.http.Timeout`
+        The default timeouts of requests.
+    resolver: :class:`~subway.http.AbstractResolver`
+        The resolver used to look up host names.
+    auto_decompress: :class:`bool`
+        Whether responses are decompressed while they are read.
+    retry: Optional[:class:`~subway.http.RetryPolicy`]
+        The default retry policy of requests.
+    hedge: Optional[:class:`~subway.http.HedgePolicy`]
+        The default hedging policy of requests.
+    cache: Optional[:class:`~subway.http.HTTPCache`]
+        The cache of ``GET`` responses.
+    connector: :class:`~subway.http.Connector`
+        The connector used to open connections.
 
     Example
     -------
@@ -56,12 +114,73 @@ class HTTPSession:
         self,
         *,
         headers: Optional[Dict[str, Any]] = None,
-        loop: Optional[asyncio.AbstractEventLoop] = None
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        connection_limit: Optional[int] = 100,
+        connection_limit_per_host: Optional[int] = 10,
+        keepalive_timeout: float = 15.0,
+        timeout: Union[Timeout, float] = DEFAULT_TIMEOUT,
+        resolver: Optional[AbstractResolver] = None,
+        auto_decompress: bool = True,
+        file_workers: int = 4,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        cache: Optional[HTTPCache] = None,
+        connector: Optional[Connector] = None
     ) -> None:
+        if file_workers <= 0:
+            raise ValueError('file_workers must be a positive integer')
+
         self.loop = loop or compat.get_event_loop()
         self.headers = headers or {}
+        self.timeout = Timeout.from_value(timeout)
+        self.resolver = resolver or CachingResolver(loop=self.loop)
+        self._owns_resolver = resolver is None
+        self.auto_decompress = auto_decompress
+        self.file_workers = file_workers
+        self.retry = retry
+        self.hedge = hedge
+        self.cache = cache
+        self.connector = connector or TCPConnector(self.resolver)
+        self.pool = ConnectionPool(
+            self,
+            limit=connection_limit,
+            limit_per_host=connection_limit_per_host,
+            keepalive_timeout=keepalive_timeout
+        )
 
         self._hookers: List[TCPHooker] = []
+        self._heartbeat: Optional[Heartbeat] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._unix_connector: Optional[UnixConnector] = None
+
+    def get_connector(self, url: URL) -> Connector:
+        """
+        Returns the connector used to open connections for a URL.
+
+        Parameters
+        ----------
+        url: :class:`~subway.url.URL`
+            The URL.
+        """
+        if url.scheme in UNIX_SCHEMES:
+            if self._unix_connector is None:
+                self._unix_connector = UnixConnector()
+
+            return self._unix_connector
+
+        return self.connector
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        The thread pool used for file operations, created the first time it's needed.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.file_workers, thread_name_prefix='subway-http'
+            )
+
+        return self._executor
 
     @property
     def hookers(self) -> List[TCPHooker]:
@@ -73,18 +192,29 @@ class HTTPSession:
     async def __aenter__(self):
         return self
 
-    async def __aexit__(self, *exc: Any):
+    async def __aexit__(self, *exc: Any) -> None:
         await self.close()
-        return self
 
     async def close(self):
         """
         Closes the session.
         """
+        if self._heartbeat is not None:
+            self._heartbeat.stop()
+
+        await self.pool.close()
+
         for hooker in self._hookers:
             if not hooker.closed:
                 await hooker.close()
 
+        if self._owns_resolver:
+            await self.resolver.close()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     def request(
         self,
         url: StrURL,
@@ -94,7 +224,10 @@ class HTTPSession:
         body: Any = None,
         json: Optional[Dict[str, Any]] = None,
         ignore_redirects: bool = False,
-        hooker: Optional[TCPHooker] = None
+        hooker: Optional[TCPHooker] = None,
+        timeout: Optional[Union[Timeout, float]] = None,
+        retry: Optional[Union[RetryPolicy, Literal[False]]] = None,
+        hedge: Optional[Union[HedgePolicy, Literal[False]]] = None
     ) -> RequestContextManager:
         """
         Sends an HTTP request with the given method.
@@ -105,6 +238,20 @@ class HTTPSession:
             The HTTP method to use.
         url: :class:`str`
             The URL to request.
+        body: Any
+            The body of the request. Can be a :class:`str`, a bytes-like object, a file object,
+            an async iterable of bytes, a :class:`~subway.formdata.FormData` or a :class:`~subway.http.Payload`.
+            Bodies that aren't in memory are streamed, with a ``Content-Length`` if their size is known
+            and with chunked transfer encoding otherwise.
+        json: Optional[:class:`dict`]
+            A JSON body. Can't be used together with ``body``.
+        timeout: Optional[Union[:class:`~subway.http.Timeout`, :class:`float`]]
+            The timeouts of this request, replacing the session's. A number is used as the total timeout.
+            Once one expires, :class:`asyncio.TimeoutError` is raised and the connection is closed.
+        retry: Optional[Union[:class:`~subway.http.RetryPolicy`, Literal[False]]]
+            The retry policy of this request, replacing the session's. ``False`` disables retries.
+        hedge: Optional[Union[:class:`~subway.http.HedgePolicy`, Literal[False]]]
+            The hedging policy of this request, replacing the session's. ``False`` disables hedging.
         **kwargs: Any
             The keyword arguments to pass to the request.
 
@@ -132,11 +279,22 @@ class HTTPSession:
             body=body, 
             json=json, 
             hooker=hooker, 
-            ignore_redirects=ignore_redirects
+            ignore_redirects=ignore_redirects,
+            timeout=timeout,
+            retry=retry,
+            hedge=hedge
         )
         return RequestContextManager(coro)
 
-    def ws_connect(self, url: Union[str, URL], **kwargs: Any) -> WebSocketContextManager:
+    def ws_connect(
+        self, 
+        url: Union[str, URL], 
+        *, 
+        compression: Optional[PerMessageDeflate] = None, 
+        ping_interval: Optional[float] = None,
+        ping_timeout: Optional[float] = 20.0,
+        **kwargs: Any
+    ) -> WebSocketContextManager:
         """
         Connects to a URL using websockets.
 
@@ -144,6 +302,13 @@ class HTTPSession:
         ----------
         url: :class:`str`
             The URL to connect to.
+        compression: Optional[:class:`~subway.websockets.PerMessageDeflate`]
+            The permessage-deflate options to offer to the server.
+        ping_interval: Optional[:class:`float`]
+            How many seconds the websocket can go without receiving anything before it pings the server.
+            ``None`` disables pings. Pongs are only received while the websocket is being read from.
+        ping_timeout: Optional[:class:`float`]
+            How many seconds the server has to respond to a ping before the connection is aborted.
         **kwargs: Any
             The keyword arguments to pass to the websocket request.
 
@@ -166,7 +331,8 @@ class HTTPSession:
             print(data.data)
         
         """
-        return WebSocketContextManager(self._connect(url))
+        coro = self._connect(url, compression=compression, ping_interval=ping_interval, ping_timeout=ping_timeout)
+        return WebSocketContextManager(coro)
 
     def get(self, url: StrURL, **kwargs: Any):
         return self.request(url, 'GET', **kwargs)
@@ -192,68 +358,492 @@ class HTTPSession:
         body: Any = None,
         json: Optional[Dict[str, Any]] = None,
         ignore_redirects: bool = False,
-        hooker: Optional[TCPHooker] = None
+        hooker: Optional[TCPHooker] = None,
+        timeout: Optional[Union[Timeout, float]] = None,
+        retry: Optional[Union[RetryPolicy, Literal[False]]] = None,
+        hedge: Optional[Union[HedgePolicy, Literal[False]]] = None,
+        deadline: Optional[float] = None
     ) -> HTTPResponse:
         self._ensure_hookers()
         url = utils.to_url(url)
 
-        if not hooker:
-            hooker = TCPHooker(self)
+        timeout = self.timeout if timeout is None else Timeout.from_value(timeout)
+        retry = self.retry if retry is None else retry
+        hedge = self.hedge if hedge is None else hedge
+        if deadline is None and timeout.total is not None:
+            deadline = self.loop.time() + timeout.total
 
         if not headers:
             headers = {}
 
+        payload: Optional[Payload] = None
         if json:
-            if body:
+            if body is not None:
                 raise ValueError('body and json cannot be used together')
 
-            body = utils.dumps(json)
-            headers['Content-Type'] = 'application/json'
+            payload = BytesPayload(utils.dumps(json), content_type='application/json')
+        elif body is not None:
+            payload = get_payload(body, executor=self.executor)
 
-        elif body:
-            if not isinstance(body, str):
-                raise TypeError('body must be a string')
+        if payload is None:
+            headers['Content-Length'] = 0
+        else:
+            if 'Content-Type' not in headers and payload.content_type is not None:
+                headers['Content-Type'] = payload.content_type
 
-            if 'Content-Type' not in headers:
-                headers['Content-Type'] = 'text/plain'
-
-        headers['Content-Length'] = len(body) if body else 0
-        await hooker.connect(url)
+            if payload.size is None:
+                headers['Transfer-Encoding'] = 'chunked'
+            else:
+                headers['Content-Length'] = payload.size
 
         assert url.hostname is not None, 'url must have a hostname'
         headers.update(self.headers)
-        
-        request = hooker.build_request(
-            method=method,
-            host=url.hostname,
-            path=url.path or '/',
-            headers=headers,
-            body=body
-        )
 
-        await hooker.write(request)
-        response = await hooker.read_response()
+        if self.auto_decompress:
+            headers.setdefault('Accept-Encoding', 'gzip, deflate')
+
+        if hooker is not None:
+            request = hooker.build_request(
+                method=method,
+                host=self.get_connector(url).get_host(url),
+                path=url.path or '/',
+                headers=headers,
+                body=payload
+            )
+
+            try:
+                await self._wait_for(hooker.connect(url), timeout.connect, deadline)
+                await self._wait_for(hooker.write(request), None, deadline)
+
+                response = await self._wait_for(hooker.read_response(method=method), timeout.first_byte, deadline)
+            except BaseException:
+                await hooker.close()
+                raise
+
+            self._hookers.append(hooker)
+            self._prepare_response(response, timeout, deadline)
+        else:
+            headers.setdefault('Connection', 'keep-alive')
+
+            async def send(headers: Dict[str, Any]) -> HTTPResponse:
+                return await self._send(
+                    url, method, headers, payload, timeout, deadline, retry or None, hedge or None  # type: ignore
+                )
+
+            if self.cache is not None and method == 'GET' and payload is None:
+                response = await self.cache.request(self, method, url, headers, send)
+            else:
+                response = await send(headers)
 
         if not ignore_redirects:
             if 301 <= response.status <= 308:
                 location = response.headers['Location']
+                await response.close()
+
                 return await self._request(
                     url=location,
                     method=method,
                     headers=headers,
-                    body=body,
-                    json=json,
+                    body=payload,
+                    timeout=timeout,
+                    retry=retry,
+                    hedge=hedge,
+                    deadline=deadline
                 )
 
-        self._hookers.append(hooker)
         return response
 
-    async def _connect(self, url: StrURL) -> WebSocket:
+    async def _wait_for(self, coro: Coroutine[Any, Any, T], timeout: Optional[float], deadline: Optional[float]) -> T:
+        timeout = remaining(timeout, deadline, self.loop.time())
+        if timeout is None:
+            return await coro
+
+        return await asyncio.wait_for(coro, timeout)
+
+    def _prepare_response(self, response: HTTPResponse, timeout: Timeout, deadline: Optional[float]) -> None:
+        response.set_timeouts(read=timeout.read, deadline=deadline)
+        response.auto_decompress = self.auto_decompress
+
+    def _get_retry_delay(self, retry: RetryPolicy, attempt: int, deadline: Optional[float]) -> Optional[float]:
+        if attempt >= retry.attempts:
+            return None
+
+        delay = retry.get_delay(attempt)
+        if deadline is not None and self.loop.time() + delay >= deadline:
+            return None
+
+        if not retry.acquire():
+            return None
+
+        return delay
+
+    async def _send(
+        self,
+        url: URL,
+        method: str,
+        headers: Dict[str, Any],
+        payload: Optional[Payload],
+        timeout: Timeout,
+        deadline: Optional[float],
+        retry: Optional[RetryPolicy],
+        hedge: Optional[HedgePolicy]
+    ) -> HTTPResponse:
+        if retry is None or not retry.is_retryable_method(method) or not (payload is None or payload.replayable):
+            return await self._hedged_request(url, method, headers, payload, timeout, deadline, hedge)
+
+        retry.record_request()
+        attempt = 1
+
+        while True:
+            try:
+                response = await self._hedged_request(url, method, headers, payload, timeout, deadline, hedge)
+            except Exception as exc:
+                if not retry.should_retry_exception(exc):
+                    raise
+
+                delay = self._get_retry_delay(retry, attempt, deadline)
+                if delay is None:
+                    raise
+            else:
+                if not retry.should_retry_response(response):
+                    return response
+
+                delay = self._get_retry_delay(retry, attempt, deadline)
+                if delay is None:
+                    return response
+
+                # Reading a short error body keeps the connection warm for the retry.
+                await response.discard()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _hedged_request(
+        self,
+        url: URL,
+        method: str,
+        headers: Dict[str, Any],
+        payload: Optional[Payload],
+        timeout: Timeout,
+        deadline: Optional[float],
+        hedge: Optional[HedgePolicy]
+    ) -> HTTPResponse:
+        # Both copies send the same body at once, so it has to be in memory.
+        if hedge is None or not hedge.is_hedgeable_method(method) or (payload is not None and payload.get_bytes() is None):
+            return await self._timed_request(url, method, headers, payload, timeout, deadline, hedge)
+
+        delay = hedge.get_delay()
+        if delay is None:
+            return await self._timed_request(url, method, headers, payload, timeout, deadline, hedge)
+
+        first = self.loop.create_task(self._timed_request(url, method, headers, payload, timeout, deadline, hedge))
+        pending = {first}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                hedge.hedged += 1
+                pending.add(
+                    self.loop.create_task(self._timed_request(url, method, headers, payload, timeout, deadline, hedge))
+                )
+
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    winner = winners[0]
+                    for task in winners[1:]:
+                        await task.result().close()
+
+                    if winner is not first:
+                        hedge.won += 1
+
+                    return winner.result()
+
+                if not pending:
+                    raise done.pop().exception()  # type: ignore
+
+                done = set()
+        finally:
+            for task in pending:
+                task.cancel()
+
+            if pending:
+                await asyncio.wait(pending)
+
+                # A loser may have gotten its response right as it was cancelled.
+                for task in pending:
+                    if not task.cancelled() and task.exception() is None:
+                        await task.result().close()
+
+    async def _timed_request(
+        self,
+        url: URL,
+        method: str,
+        headers: Dict[str, Any],
+        payload: Optional[Payload],
+        timeout: Timeout,
+        deadline: Optional[float],
+        hedge: Optional[HedgePolicy]
+    ) -> HTTPResponse:
+        start = self.loop.time()
+        response = await self._pooled_request(url, method, headers, payload, timeout, deadline)
+
+        if hedge is not None:
+            hedge.record(self.loop.time() - start)
+
+        self._prepare_response(response, timeout, deadline)
+        return response
+
+    async def _pooled_request(
+        self,
+        url: URL,
+        method: str,
+        headers: Dict[str, Any],
+        payload: Optional[Payload],
+        timeout: Timeout,
+        deadline: Optional[float]
+    ) -> HTTPResponse:
+        while True:
+            hooker = await self._wait_for(self.pool.acquire(url), timeout.connect, deadline)
+            reused = hooker.requests > 0
+
+            request = hooker.build_request(
+                method=method,
+                host=hooker.connector.get_host(url),  # type: ignore
+                path=url.path or '/',
+                headers=headers.copy(),
+                body=payload
+            )
+
+            try:
+                hooker.requests += 1
+
+                await self._wait_for(hooker.write(request), None, deadline)
+                return await self._wait_for(hooker.read_response(method=method), timeout.first_byte, deadline)
+            except asyncio.TimeoutError:
+                # Checked first since it's a subclass of OSError, but a timed out request is never retried.
+                self.pool.release(hooker, reuse=False)
+                raise
+            except (OSError, PartialRead) as exc:
+                self.pool.release(hooker, reuse=False)
+
+                # The server may have closed an idle connection right as it was reused, in which case
+                # the request is sent again on a new one. Only requests that are safe to send twice are,
+                # since the server may have processed it anyway, and only if nothing of the response arrived.
+                if (
+                    reused
+                    and method.upper() in IDEMPOTENT_METHODS
+                    and (payload is None or payload.replayable)
+                    and not self._received_response(hooker, exc)
+                ):
+                    continue
+
+                raise
+            except BaseException:
+                self.pool.release(hooker, reuse=False)
+                raise
+
+    @staticmethod
+    def _received_response(hooker: TCPHooker, exc: BaseException) -> bool:
+        if isinstance(exc, PartialRead) and exc.partial:
+            return True
+
+        return hooker.reader is not None and bool(hooker.reader.buffer)
+
+    async def map(
+        self,
+        requests: Iterable[Union[BulkRequest, StrURL]],
+        *,
+        concurrency: int = 10,
+        concurrency_per_host: Optional[int] = None,
+        ordered: bool = True,
+        fail_fast: bool = True
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Sends many requests with a bounded amount of them in flight at once, reading every response body.
+
+        A request is only started once a slot of the semaphore is free, so ``requests`` can be a lazy iterable
+        and is consumed as requests finish. Connections are taken from the session's pool.
+
+        Parameters
+        ----------
+        requests: Iterable[Union[:class:`~subway.http.BulkRequest`, :class:`str`, :class:`~subway.url.URL`]]
+            The requests to send. URLs are sent as ``GET`` requests.
+        concurrency: :class:`int`
+            The maximum amount of requests in flight.
+        concurrency_per_host: Optional[:class:`int`]
+            The maximum amount of requests in flight to the same host. ``None`` means no limit.
+            Requests to a host at its limit don't take up any of the ``concurrency`` slots while they wait,
+            up to ``concurrency`` of them are held back while requests further along are started.
+        ordered: :class:`bool`
+            Whether to yield the results in the order of the requests. Otherwise they are yielded as they complete.
+        fail_fast: :class:`bool`
+            Whether to raise the exception of the first request that fails and cancel the rest.
+            Otherwise failed requests are yielded as results with their :attr:`~subway.http.BulkResult.exception` set.
+
+        Raises
+        ------
+        ValueError
+            If ``concurrency`` or ``concurrency_per_host`` is not a positive integer.
+
+        Example
+        -------
+        .. code-block:: python3
+
+            urls = [f'https://example.com/shards/{shard}' for shard in range(500)]
+
+            async for result in session.map(urls, concurrency=20, concurrency_per_host=5):
+                body = await result.response.read()
+        """
+        if concurrency <= 0:
+            raise ValueError('concurrency must be a positive integer')
+
+        if concurrency_per_host is not None and concurrency_per_host <= 0:
+            raise ValueError('concurrency_per_host must be a positive integer')
+
+        semaphore = Semaphore(concurrency, loop=self.loop)
+        hosts: Dict[str, Semaphore] = {}
+
+        results: asyncio.Queue[BulkResult] = asyncio.Queue()
+        tasks: Set[asyncio.Task[None]] = set()
+        buffered: Dict[int, BulkResult] = {}
+
+        iterator = iter(requests)
+        started = 0
+        finished = 0
+        exhausted = False
+
+        # Requests to a host that is already at its limit are held back here instead of taking a slot
+        # of the global semaphore they would only spend waiting, so other hosts aren't starved.
+        held: Dict[str, Deque[Tuple[int, BulkRequest]]] = {}
+        holding = 0
+
+        try:
+            while True:
+                while not semaphore.is_locked():
+                    entry = None
+                    for host, queue in held.items():
+                        if not hosts[host].is_locked():
+                            entry = queue.popleft()
+                            holding -= 1
+
+                            if not queue:
+                                del held[host]
+
+                            break
+
+                    if entry is None:
+                        if exhausted or holding >= concurrency:
+                            break
+
+                        try:
+                            request = BulkRequest.from_value(next(iterator))
+                        except StopIteration:
+                            exhausted = True
+                            break
+
+                        entry = (started, request)
+                        started += 1
+
+                        if concurrency_per_host is not None:
+                            host_semaphore = hosts.get(request.host)
+                            if host_semaphore is None:
+                                host_semaphore = hosts[request.host] = Semaphore(concurrency_per_host, loop=self.loop)
+
+                            if host_semaphore.is_locked():
+                                held.setdefault(request.host, collections.deque()).append(entry)
+                                holding += 1
+                                continue
+
+                    index, request = entry
+                    host_semaphore = hosts.get(request.host)
+
+                    await semaphore.acquire(wait=False)
+                    if host_semaphore is not None:
+                        await host_semaphore.acquire(wait=False)
+
+                    task = self.loop.create_task(
+                        self._map_request(index, request, semaphore, host_semaphore, results)
+                    )
+                    task.add_done_callback(tasks.discard)
+
+                    tasks.add(task)
+
+                if exhausted and finished == started:
+                    break
+
+                result = await results.get()
+                finished += 1
+
+                if fail_fast and result.exception is not None:
+                    raise result.exception
+
+                if not ordered:
+                    yield result
+                    continue
+
+                buffered[result.index] = result
+                index = finished - len(buffered)
+
+                while index in buffered:
+                    yield buffered.pop(index)
+                    index += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            if tasks:
+                await asyncio.wait(tasks)
+
+    async def _map_request(
+        self,
+        index: int,
+        request: BulkRequest,
+        semaphore: Semaphore,
+        host_semaphore: Optional[Semaphore],
+        results: asyncio.Queue[BulkResult]
+    ) -> None:
+        try:
+            async with self.request(request.url, request.method, **request.kwargs) as response:
+                await response.read()
+        except Exception as exc:
+            result = BulkResult(index, request, exception=exc)
+        else:
+            result = BulkResult(index, request, response=response)
+        finally:
+            if host_semaphore is not None:
+                host_semaphore.release()
+
+            semaphore.release()
+
+        results.put_nowait(result)
+
+    async def _connect(
+        self, 
+        url: StrURL, 
+        *, 
+        compression: Optional[PerMessageDeflate] = None,
+        ping_interval: Optional[float] = None,
+        ping_timeout: Optional[float] = None
+    ) -> WebSocket:
         url = utils.to_url(url)
 
-        hooker = WebSocketHooker(self)
+        hooker = WebSocketHooker(self, compression=compression)
         websocket = await hooker.connect(url)
 
+        if ping_interval is not None:
+            websocket.ping_interval = ping_interval
+            websocket.ping_timeout = ping_timeout
+
+            if self._heartbeat is None:
+                self._heartbeat = Heartbeat()
+
+            self._heartbeat.add(websocket)
+            self._heartbeat.start()
+
         self._hookers.append(hooker)
         return websocket
 
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Optional, Union
+
+__all__ = (
+    'Timeout',
+)
+
+class Timeout:
+    """
+    The timeouts of an HTTP request. Every timeout is in seconds and ``None`` disables it.
+    When a timeout expires, :class:`asyncio.TimeoutError` is raised and the connection is closed.
+
+    Parameters
+    ----------
+    total: Optional[:class:`float`]
+        How long the whole request can take, from acquiring a connection to reading the last byte of the body.
+    connect: Optional[:class:`float`]
+        How long acquiring a connection can take, including waiting for the pool to have room.
+    first_byte: Optional[:class:`float`]
+        How long to wait for the head of the response once the request has been sent.
+    read: Optional[:class:`float`]
+        How long to wait for more of the response body to arrive.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        session = HTTPSession(timeout=Timeout(total=30, connect=5))
+
+        async with session.get('https://example.com/', timeout=Timeout(total=2)) as response:
+            ...
+    """
+    __slots__ = ('total', 'connect', 'first_byte', 'read')
+
+    def __init__(
+        self,
+        *,
+        total: Optional[float] = None,
+        connect: Optional[float] = None,
+        first_byte: Optional[float] = None,
+        read: Optional[float] = None
+    ) -> None:
+        for name, value in (('total', total), ('connect', connect), ('first_byte', first_byte), ('read', read)):
+            if value is not None and value <= 0:
+                raise ValueError(f'{name} must be a positive number or None')
+
+        self.total = total
+        self.connect = connect
+        self.first_byte = first_byte
+        self.read = read
+
+    def __repr__(self) -> str:
+        return (
+            f'<Timeout total={self.total} connect={self.connect} first_byte={self.first_byte} read={self.read}>'
+        )
+
+    @classmethod
+    def from_value(cls, value: Union[Timeout, float, None]) -> Timeout:
+        """
+        Converts a number into a timeout with only a total limit. Timeouts are returned as is.
+
+        Parameters
+        ----------
+        value: Union[:class:`~subway.http.Timeout`, :class:`float`, None]
+            The value to convert.
+        """
+        if isinstance(value, cls):
+            return value
+
+        return cls(total=value)  # type: ignore
+
+
+def remaining(timeout: Optional[float], deadline: Optional[float], now: float) -> Optional[float]:
+    """
+    Returns the smallest of ``timeout`` and the time left until ``deadline``, or ``None`` if both are ``None``.
+    """
+    if deadline is None:
+        return timeout
+
+    left = max(deadline - now, 0)
+    if timeout is None:
+        return left
+
+    return min(timeout, left)
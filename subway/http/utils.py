@@ -20,7 +20,7 @@ class RequestContextManager:
         return resp
 
     async def __aexit__(self, *args: Any):
-        if not self.response.hooker.closed:
+        if not self.response.is_closed():
             await self.response.close()
 
 class WebSocketContextManager:
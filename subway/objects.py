@@ -1,7 +1,7 @@
 from __future__ import annotations
 from enum import Enum
 
-from typing import TYPE_CHECKING, Callable, List, Any, Literal, Optional, Dict, TypeVar, overload
+from typing import TYPE_CHECKING, Callable, List, Any, Literal, Optional, Dict, Pattern, Tuple, TypeVar, overload
 import inspect
 import re
 
@@ -9,6 +9,7 @@ from .types import CoroFunc, Coro, ResponseMiddleware, RequestMiddleware
 from .responses import HTTPException
 from .request import Request
 from .errors import RegistrationError
+from .url import PathBuilder
 from . import utils
 
 if TYPE_CHECKING:
@@ -135,6 +136,9 @@ class Route(Object):
         self._status_code_handlers: Dict[int, Callable[..., Coro[Any]]] = {}
         self._request_middlewares: List[Middleware] = []
         self._response_middlewares: List[Middleware] = []
+        self._middleware_chains: Dict[MiddlewareType, Tuple[Router, int, Tuple[Middleware, ...]]] = {}
+        self._path_builder: Optional[PathBuilder] = None
+        self._pattern: Optional[Pattern[str]] = None
         self._after_request = None
 
         self.__doc__ = inspect.getdoc(callback)
@@ -195,6 +199,54 @@ class Route(Object):
     def router(self, router: Router) -> None:
         self._router = router
 
+    @property
+    def path_builder(self) -> PathBuilder:
+        """
+        The :class:`~.PathBuilder` compiled from the route's raw path.
+        """
+        builder = self._path_builder
+        if builder is None or builder.template != self.raw_path:
+            builder = self._path_builder = PathBuilder(self.raw_path)
+
+        return builder
+
+    def build_path(self, **params: Any) -> str:
+        """
+        Builds a path for this route by filling in the parameters of its raw path.
+
+        Parameters
+        ----------
+        **params: Any
+            The values of the route's path parameters.
+        """
+        return self.path_builder.build(params)
+
+    def get_middleware_chain(self, type: MiddlewareType, router: Router) -> Tuple[Middleware, ...]:
+        """
+        Returns the route's middlewares followed by the global middlewares of ``router``.
+        The chain is built once and reused until the route's or the router's middlewares change.
+
+        Parameters
+        ----------
+        type: :class:`~subway.objects.MiddlewareType`
+            The type of middlewares to return.
+        router: :class:`~subway.router.Router`
+            The router holding the global middlewares.
+        """
+        version = router.middlewares_version
+        cached = self._middleware_chains.get(type)
+
+        if cached is not None and cached[0] is router and cached[1] == version:
+            return cached[2]
+
+        if type is MiddlewareType.request:
+            chain = (*self._request_middlewares, *router.request_middlewares)
+        else:
+            chain = (*self._response_middlewares, *router.response_middlewares)
+
+        self._middleware_chains[type] = (router, version, chain)
+        return chain
+
     def is_websocket(self) -> bool:
         """
         Checks if the route is a websocket route.
@@ -215,18 +267,30 @@ class Route(Object):
         :class:`dict`
             A dictionary of the matched parameters.
         """
-        match = re.fullmatch(self.path, path)
+        match = self.compile().fullmatch(path)
         if match:
             return match.groupdict()
 
         return None
 
+    def compile(self) -> Pattern[str]:
+        """
+        Compiles the route's path into the regular expression used by :meth:`match`.
+        The compiled expression is kept until the path changes.
+        """
+        pattern = self._pattern
+        if pattern is None or pattern.pattern != self.path:
+            pattern = self._pattern = re.compile(self.path)
+
+        return pattern
+
     def cleanup_middlewares(self):
         """
         Clears all the middlewares registered with the route.
         """
         self._request_middlewares.clear()
         self._response_middlewares.clear()
+        self._middleware_chains.clear()
 
     def add_status_code_handler(
         self, 
@@ -337,6 +401,7 @@ class Route(Object):
 
         middleware = Middleware(MiddlewareType.request, callback, route=self)
         self._request_middlewares.append(middleware)
+        self._middleware_chains.clear()
 
         return middleware
 
@@ -350,6 +415,8 @@ class Route(Object):
                 The middleware to remove.
         """
         self._request_middlewares.remove(middleware)
+        self._middleware_chains.clear()
+
         return middleware
 
     def request_middleware(self, callback: RequestMiddleware) -> Middleware:
@@ -396,6 +463,7 @@ class Route(Object):
 
         middleware = Middleware(MiddlewareType.response, callback, route=self)
         self._response_middlewares.append(middleware)
+        self._middleware_chains.clear()
 
         return middleware
 
@@ -409,6 +477,8 @@ class Route(Object):
             The coroutine function used by the middleware.
         """
         self._response_middlewares.remove(middleware)
+        self._middleware_chains.clear()
+
         return middleware
 
     def response_middleware(self, callback: ResponseMiddleware) -> Middleware:
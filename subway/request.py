@@ -19,7 +19,7 @@ from .responses import HTTPException, Redirection, SwitchingProtocols, redirects
 from .response import StreamResponse
 from .formdata import FormData
 from .streams import StreamReader, StreamWriter, get_address
-from .websockets import WebSocket
+from .websockets import WebSocket, PerMessageDeflate
 from .types import ResponseBody, ResponseStatus, RouteResponse, StrURL, Address
 from .utils import to_url, GUID, CLRF, parse_headers, loads, cached_slot_property
 
@@ -81,9 +81,11 @@ class HTTPConnection(ABC):
         :class:`bytes`
             The body of the request as bytes.
         """
+        body = bytearray(self._body)
         async for chunk in self.stream(timeout=timeout):
-            self._body += chunk
+            body += chunk
 
+        self._body = bytes(body)
         return self._body
 
     async def text(self, *, encoding: Optional[str] = None, timeout: Optional[float] = None) -> str:
@@ -169,7 +171,9 @@ class Request(Generic[AppT], HTTPConnection):
         '_writer', 
         '_url', 
         '_body', 
-        '_closed'
+        '_closed',
+        '_response_status',
+        '_response_size',
         'version', 
         'method', 
         'worker', 
@@ -197,6 +201,8 @@ class Request(Generic[AppT], HTTPConnection):
         self._url = url
         self._body = b''
         self._closed = False
+        self._response_status: Optional[int] = None
+        self._response_size = 0
 
         self.version = version
         self.method = method
@@ -377,12 +383,20 @@ class Request(Generic[AppT], HTTPConnection):
             if not isinstance(response, Response):
                 raise ValueError('When convert is passed in as False, response must be a Response object')
 
+        # The connection is closed after every response, let clients know they can't reuse it.
+        if 'Connection' not in response.headers:
+            response.add_header(key='Connection', value='close')
+
         data = await response.prepare()
         await self.writer.write(data, drain=True)
 
+        self._response_status = int(response.status)
+        self._response_size += len(data)
+
         if isinstance(response, StreamResponse):
             async for chunk in response:
                 await self.writer.write(chunk, drain=True)
+                self._response_size += len(chunk)
 
         self.writer.write_eof()
 
@@ -391,6 +405,8 @@ class Request(Generic[AppT], HTTPConnection):
         Closes the connection.
         """
         if not self.is_closed():
+            self._closed = True
+
             self.writer.close()
             await self.writer.wait_closed()
 
@@ -398,7 +414,8 @@ class Request(Generic[AppT], HTTPConnection):
         self, 
         *, 
         extensions: Optional[Iterable[str]] = None, 
-        subprotocols: Optional[Iterable[str]] = None
+        subprotocols: Optional[Iterable[str]] = None,
+        compression: Optional[PerMessageDeflate] = None
     ) -> WebSocket:
         """
         Performs a websocket handshake.
@@ -409,10 +426,21 @@ class Request(Generic[AppT], HTTPConnection):
             The extensions to use.
         subprotocols: Optional[Iterable[str]]
             The subprotocols to use.
+        compression: Optional[:class:`~subway.websockets.PerMessageDeflate`]
+            The permessage-deflate options to accept the client's offer with, if it sent one.
         """
         key = self.parse_websocket_key()
         response = SwitchingProtocols()
 
+        context = None
+        if compression is not None:
+            offer = self.headers.get('Sec-WebSocket-Extensions')
+            accepted = compression.accept(offer) if offer else None
+
+            if accepted is not None:
+                extension, context = accepted
+                extensions = [extension, *(extensions or ())]
+
         response.add_header(key='Upgrade', value='websocket')
         response.add_header(key='Connection', value='Upgrade')
         response.add_header(key='Sec-WebSocket-Accept', value=key)
@@ -426,7 +454,10 @@ class Request(Generic[AppT], HTTPConnection):
         data = await response.prepare()
         await self.writer.write(data, drain=True)
 
-        return WebSocket(self._writer, self.get_reader())
+        self._response_status = int(response.status)
+        self._response_size += len(data)
+
+        return WebSocket(self._writer, self.get_reader(), compression=context)
 
     async def form(
         self, 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, List, Dict, NamedTuple, Optional, Tuple, Union, TypeVar, Any, NoReturn
+from typing import TYPE_CHECKING, Callable, Iterable, List, Dict, NamedTuple, Optional, Set, Tuple, Union, TypeVar, Any, NoReturn
 from functools import lru_cache
 import re
 import copy
@@ -71,6 +71,19 @@ class Router:
         self.routes: Dict[Tuple[str, str], Union[Route, WebSocketRoute]] = {}
         self.request_middlewares: List[Middleware] = []
         self.response_middlewares: List[Middleware] = []
+        self._middlewares_version = 0
+        self._paths: Dict[str, Dict[str, Union[Route, WebSocketRoute]]] = {}
+        self._names: Dict[str, Union[Route, WebSocketRoute]] = {}
+        self._dynamic_routes: Tuple[Route, ...] = ()
+        self._compiled = False
+
+    @property
+    def middlewares_version(self) -> int:
+        """
+        A counter that gets incremented every time the router's middlewares change.
+        Used by routes to know when their cached middleware chains are stale.
+        """
+        return self._middlewares_version
 
     def union(self, other: Router) -> Router:
         """
@@ -81,10 +94,11 @@ class Router:
         other: :class:`~subway.Router`
             The router to merge with.
         """
-        [self.add_route(route) for route in other]
+        self.add_routes(other)
 
         self.request_middlewares.extend(other.request_middlewares)
         self.response_middlewares.extend(other.response_middlewares)
+        self._middlewares_version += 1
 
         return self
 
@@ -93,13 +107,42 @@ class Router:
         Clears the router.
         """
         self.routes.clear()
+        self._paths.clear()
+        self._names.clear()
+        self._dynamic_routes = ()
+        self._compiled = False
         self.response_middlewares.clear()
         self.request_middlewares.clear()
+        self._middlewares_version += 1
+
+    def is_compiled(self) -> bool:
+        """
+        True if no routes were added or removed since the last call to :meth:`compile`.
+        """
+        return self._compiled
+
+    def compile(self) -> None:
+        """
+        Compiles the regular expressions of every route that has path parameters and clears the resolve caches.
+        This is done by :meth:`~subway.Application.start` and lazily by :meth:`resolve`, so routes can be
+        registered without paying for it one at a time.
+        """
+        dynamic: List[Route] = []
+        for route in self.routes.values():
+            if route.path != route.raw_path:
+                route.compile()
+                dynamic.append(route)
+
+        self._dynamic_routes = tuple(dynamic)
+
+        self._match.cache_clear()
+        self._resolve.cache_clear()
+
+        self._compiled = True
 
-    @lru_cache(maxsize=ROUTE_CACHE_MAXSIZE)
     def match(self, path: str) -> Optional[ResolvedRoute]:
         """
-        Matches a path to a route. Can be slow.
+        Matches a path to a route with path parameters.
 
         Parameters
         ----------
@@ -111,12 +154,20 @@ class Router:
         :class:`~.ResolvedRoute`
             The resolved route.
         """
-        for route in self:
+        if not self._compiled:
+            self.compile()
+
+        return self._match(path)
+
+    @lru_cache(maxsize=ROUTE_CACHE_MAXSIZE)
+    def _match(self, path: str) -> Optional[ResolvedRoute]:
+        for route in self._dynamic_routes:
             params = route.match(path)
             if params is not None:
                 return ResolvedRoute(route, params)
 
-    @lru_cache(maxsize=ROUTE_CACHE_MAXSIZE)
+        return None
+
     def resolve(self, path: str, method: str) -> Optional[ResolvedRoute]:
         """
         Resolves a route.
@@ -133,21 +184,39 @@ class Router:
         :class:`~.ResolvedRoute`
             The resolved route.
         """
+        if not self._compiled:
+            self.compile()
+
+        return self._resolve(path, method)
+
+    @lru_cache(maxsize=ROUTE_CACHE_MAXSIZE)
+    def _resolve(self, path: str, method: str) -> ResolvedRoute:
         if path.endswith('/') and not path == '/':
-            return self.resolve(path[:-1], method)
+            return self._resolve(path[:-1], method)
+
+        methods = self._paths.get(path)
+        if methods is not None:
+            route = methods.get(method)
+            if route is not None:
+                return ResolvedRoute.from_route(route)
+
+            raise MethodNotAllowed(f'Method {method!r} is not allowed for route {path!r}.')
+
+        allowed = False
+        for route in self._dynamic_routes:
+            params = route.match(path)
+            if params is None:
+                continue
 
-        resolved = self.resolve_from_path(path, method)
-        if resolved is not None:
-            return resolved
+            if route.method == method:
+                return ResolvedRoute(route, params)
 
-        resolved = self.match(path)
-        if not resolved:
-            raise NotFound(f'Route {path!r} was not found.')
+            allowed = True
 
-        if resolved.method != method:
+        if allowed:
             raise MethodNotAllowed(f'Method {method!r} is not allowed for route {path!r}.')
 
-        return resolved
+        raise NotFound(f'Route {path!r} was not found.')
 
     def resolve_from_path(self, path: Union[Route, str], method: str) -> Optional[ResolvedRoute]:
         """
@@ -198,8 +267,29 @@ class Router:
             The route to store.
         """
         self.routes[(route.raw_path, route.method)] = route
+
+        self._paths.setdefault(route.raw_path, {})[route.method] = route
+        self._names.setdefault(route.name, route)
+        self._compiled = False
+
         return route
 
+    def _validate_route(self, route: Route) -> None:
+        if not isinstance(route, (Route, WebSocketRoute)):
+            fmt = 'Expected Route or WebSocketRoute but got {0!r} instead'
+            raise RegistrationError(fmt.format(route.__class__.__name__))
+
+        assert route.raw_path is not None
+
+        if not iscoroutinefunction(route.callback) and not isasyncgenfunction(route.callback):
+            raise RegistrationError('Route callbacks must be coroutine functions or async generators')
+
+    def _add_route(self, route: RouteT) -> RouteT:
+        if not isinstance(route, WebSocketRoute):
+            route.path = self.format_path_pattern(route.path)
+
+        return self.store_route(route)
+
     def add_route(self, route: RouteT) -> RouteT:
         """
         Adds a route to the router.
@@ -209,23 +299,36 @@ class Router:
         route: :class:`~subway.objects.Route` 
             The route to add.
         """
-        assert route.raw_path is not None
-
-        if not isinstance(route, (Route, WebSocketRoute)):
-            fmt = 'Expected Route or WebSocketRoute but got {0!r} instead'
-            raise RegistrationError(fmt.format(route.__class__.__name__))
-        
-        if not iscoroutinefunction(route.callback) and not isasyncgenfunction(route.callback):
-            raise RegistrationError('Route callbacks must be coroutine functions or async generators')
+        self._validate_route(route)
 
         if route in self:
-            raise RegistrationError('{0!r} is already a route.'.format(route.path))
+            raise RegistrationError('{0!r} is already a route.'.format(route.raw_path))
 
-        if isinstance(route, WebSocketRoute):
-            return self.store_route(route)
+        return self._add_route(route)
 
-        route.path = self.format_path_pattern(route.path)
-        return self.store_route(route)
+    def add_routes(self, routes: Iterable[RouteT]) -> List[RouteT]:
+        """
+        Adds multiple routes to the router at once.
+        Nothing is added if any of the routes is invalid or already registered.
+
+        Parameters
+        ----------
+        routes: Iterable[:class:`~subway.objects.Route`]
+            The routes to add.
+        """
+        routes = list(routes)
+        seen: Set[Tuple[str, str]] = set()
+
+        for route in routes:
+            self._validate_route(route)
+
+            key = (route.raw_path, route.method)
+            if key in seen or key in self.routes:
+                raise RegistrationError('{0!r} is already a route.'.format(route.raw_path))
+
+            seen.add(key)
+
+        return [self._add_route(route) for route in routes]
 
     def remove_route(self, route: RouteT) -> Optional[RouteT]:
         """
@@ -236,7 +339,53 @@ class Router:
         route: :class:`~subway.objects.Route`
             The route to remove.
         """
-        return self.routes.pop((route.raw_path, route.method), None)  # type: ignore
+        removed = self.routes.pop((route.raw_path, route.method), None)
+        if removed is None:
+            return None
+
+        methods = self._paths.get(removed.raw_path)
+        if methods is not None:
+            methods.pop(removed.method, None)
+            if not methods:
+                del self._paths[removed.raw_path]
+
+        self._compiled = False
+
+        if self._names.get(removed.name) is removed:
+            del self._names[removed.name]
+
+            for other in self.routes.values():
+                if other.name == removed.name:
+                    self._names[other.name] = other
+                    break
+
+        return removed  # type: ignore
+
+    def get_route_by_path(self, path: str) -> Optional[Route]:
+        """
+        Returns a route registered with the given raw path, e.g. ``/users/{id}``, regardless of its method.
+
+        Parameters
+        ----------
+        path: :class:`str`
+            The raw path of the route.
+        """
+        methods = self._paths.get(path)
+        if not methods:
+            return None
+
+        return next(iter(methods.values()))
+
+    def get_route_by_name(self, name: str) -> Optional[Route]:
+        """
+        Returns the first route registered with the given name.
+
+        Parameters
+        ----------
+        name: :class:`str`
+            The name of the route.
+        """
+        return self._names.get(name)
 
     def websocket(
         self, 
@@ -299,6 +448,8 @@ class Router:
         else:
             self.response_middlewares.append(middleware)
 
+        self._middlewares_version += 1
+
     def request_middleware(self, callback: RequestMiddleware) -> Middleware:
         """
         A decorator for registering a middleware callback.
@@ -320,7 +471,8 @@ class Router:
         middleware: :class:`~subway.objects.Middleware`
             The middleware to remove.
         """
-        return self.request_middlewares.remove(middleware)
+        self.request_middlewares.remove(middleware)
+        self._middlewares_version += 1
 
     def response_middleware(self, callback: ResponseMiddleware) -> Middleware:
         """
@@ -343,7 +495,8 @@ class Router:
         middleware: :class:`~subway.objects.Middleware`
             The middleware to remove.
         """
-        return self.response_middlewares.remove(middleware)
+        self.response_middlewares.remove(middleware)
+        self._middlewares_version += 1
 
     def create_route(
         self, 
@@ -416,3 +569,6 @@ class Router:
 
     def __iter__(self):
         return self.routes.values().__iter__()
+
+    def __contains__(self, route: object) -> bool:
+        return isinstance(route, Route) and (route.raw_path, route.method) in self.routes
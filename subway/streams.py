@@ -11,6 +11,7 @@ __all__ = (
     'StreamProtocol',
     'get_address',
     'open_connection',
+    'open_unix_connection',
     'start_server',
     'start_unix_server'
 )
@@ -198,13 +199,35 @@ class StreamReader:
         A bytearray containing the data.
     loop: :class:`asyncio.AbstractEventLoop`
         A reference to the event loop.
+    limit: :class:`int`
+        The amount of buffered bytes reading from the transport resumes at.
     """
-    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None, *, limit: int = 65536) -> None:
         self.buffer: bytearray = bytearray()
         self.loop = loop or compat.get_running_loop()
+        self.limit = limit
 
         self._waiter: Optional[asyncio.Future[None]] = None
         self._eof = False
+        self._transport: Optional[asyncio.Transport] = None
+        self._paused = False
+
+    def set_transport(self, transport: asyncio.Transport) -> None:
+        """
+        Sets the transport the data is read from.
+        Once one is set, reading from it is paused while more than twice :attr:`limit` bytes are buffered.
+
+        Parameters
+        ----------
+        transport: :class:`asyncio.Transport`
+            The transport.
+        """
+        self._transport = transport
+
+    def _maybe_resume(self) -> None:
+        if self._paused and len(self.buffer) <= self.limit:
+            self._paused = False
+            self._transport.resume_reading()  # type: ignore
 
     def __aiter__(self):
         return self
@@ -223,6 +246,11 @@ class StreamReader:
         if self._waiter is not None:
             raise RuntimeError('Already waiting for data')
 
+        # More data is needed than what is buffered, so reading can't stay paused.
+        if self._paused:
+            self._paused = False
+            self._transport.resume_reading()  # type: ignore
+
         self._waiter = self.loop.create_future()
 
         try:
@@ -242,6 +270,7 @@ class StreamReader:
         """
         data = self.buffer
         self.buffer = bytearray()
+        self._maybe_resume()
 
         return bytes(data)
 
@@ -259,6 +288,14 @@ class StreamReader:
 
         self.buffer.extend(data)
 
+        if self._transport is not None and not self._paused and len(self.buffer) > 2 * self.limit:
+            try:
+                self._transport.pause_reading()
+            except NotImplementedError:
+                self._transport = None
+            else:
+                self._paused = True
+
         if self._waiter:
             try:
                 self._waiter.set_result(None)
@@ -317,7 +354,8 @@ class StreamReader:
             await self._wait_for_data(timeout=timeout)
 
         data = self.buffer[:nbytes]
-        self.buffer = self.buffer[nbytes:]
+        del self.buffer[:nbytes]
+        self._maybe_resume()
 
         return bytes(data)
 
@@ -367,7 +405,9 @@ class StreamReader:
         else:
             data = self.buffer[:pos]
 
-        self.buffer = self.buffer[pos + len(delimiter):]
+        del self.buffer[:pos + len(delimiter)]
+        self._maybe_resume()
+
         return bytes(data)
 
     async def readline(
@@ -455,6 +495,7 @@ class StreamProtocol(asyncio.Protocol):
 
     def connection_made(self, transport: Any) -> None:
         self.writer = writer = StreamWriter(transport, self.waiter)
+        self.reader.set_transport(transport)
 
         if utils.iscoroutinefunction(self.connection_callback):
             self.loop.create_task(self.connection_callback(self.reader, writer))
@@ -468,7 +509,10 @@ class StreamProtocol(asyncio.Protocol):
             self.waiter.set_result(None)
 
         self.writer = None
-        self.reader.reset()
+
+        # Data that was received before the connection was lost can still be read.
+        if not self.reader.at_eof():
+            self.reader.feed_eof()
 
     def data_received(self, data: bytes) -> None:
         self.reader.feed_data(data)
@@ -525,6 +569,24 @@ async def open_connection(
     return proto.reader, proto.writer
 
 
+async def open_unix_connection(path: Optional[str] = None, **kwargs: Any) -> Tuple[StreamReader, StreamWriter]:
+    """
+    Opens a connection to a Unix domain socket.
+
+    Parameters
+    -----------
+    path: Optional[:class:`str`]
+        The path of the unix domain socket.
+    **kwargs: Any
+        Additional keyword arguments to pass to :meth:`asyncio.loop.create_unix_connection`.
+    """
+    loop = kwargs.pop('loop', None) or compat.get_running_loop()
+    protocol = StreamProtocol(loop, lambda w, r: None)
+
+    _, proto = await loop.create_unix_connection(protocol, path=path, **kwargs)  # type: ignore
+    return proto.reader, proto.writer
+
+
 async def start_server(
     connection_callback: Callable[[StreamReader, StreamWriter], Any],
     host: Optional[str] = None,
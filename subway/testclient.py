@@ -44,7 +44,7 @@ class TestClient:
     def port(self) -> int:
         return self.app.port
 
-    def ws_connect(self, path: str):
+    def ws_connect(self, path: str, **kwargs: Any):
         """
         Performs a websocket connection.
 
@@ -52,6 +52,8 @@ class TestClient:
         -------------
         path: :class:`str`
             The path to the websocket resource.
+        **kwargs: Any
+            The keyword arguments to pass to :meth:`~subway.http.HTTPSession.ws_connect`.
 
         Example
         ---------
@@ -83,8 +85,8 @@ class TestClient:
             app.loop.run_until_complete(main())
             ```
         """
-        url = self.app.url_for(path, is_websocket=True)
-        return self.session.ws_connect(str(url))
+        url = self.app._build_url(path, is_websocket=True, ignore=True)
+        return self.session.ws_connect(str(url), **kwargs)
 
     def request(self, path: str, method: str, **kwargs: Any):
         """
@@ -123,7 +125,7 @@ class TestClient:
             app.loop.run_until_complete(main())
             
         """
-        url = self.app.url_for(path)
+        url = self.app._build_url(path, ignore=True)
         return self.session.request(url=str(url), method=method, **kwargs)
 
     def get(self, path: str, **kwargs: Any):
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from urllib.parse import SplitResult, urljoin, urlsplit, parse_qsl, urlencode
-from typing import Any, Optional, Dict, Union, overload
+from urllib.parse import SplitResult, urljoin, urlsplit, parse_qsl, urlencode, quote
+from typing import Any, Mapping, Optional, Dict, Tuple, Union, overload
+import re
 
 from multidict import MultiDict
 
-__all__ = 'URL',
+__all__ = 'URL', 'PathBuilder',
 
 SCHEMES = {
     'http': 80,
@@ -14,6 +15,8 @@ SCHEMES = {
     'wss': 443,
 }
 
+PARAM_REGEX = re.compile(r"{(?P<parameter>\w+)}")
+
 class URL:
     """
     Parameters
@@ -285,4 +288,55 @@ class URL:
         if not errors:
             errors = 'strict'
 
-        return self.value.encode(encoding, errors)
\ No newline at end of file
+        return self.value.encode(encoding, errors)
+
+class PathBuilder:
+    """
+    Builds paths out of a route path template such as ``/users/{id}``.
+    The template is parsed once, building a path is a single :meth:`str.format_map` call.
+
+    Parameters
+    ----------
+    template: :class:`str`
+        The path template.
+
+    Attributes
+    -----------
+    template: :class:`str`
+        The path template.
+    parameters: Tuple[:class:`str`, ...]
+        The names of the parameters found in the template.
+    """
+    __slots__ = ('template', 'parameters')
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self.parameters: Tuple[str, ...] = tuple(match.group('parameter') for match in PARAM_REGEX.finditer(template))
+
+    def __repr__(self) -> str:
+        return f'<PathBuilder template={self.template!r} parameters={self.parameters!r}>'
+
+    def build(self, params: Mapping[str, Any]) -> str:
+        """
+        Fills in the template's parameters. Values are converted to strings and percent-encoded,
+        extra values are ignored.
+
+        Parameters
+        ----------
+        params: Mapping[:class:`str`, Any]
+            The values of the parameters.
+
+        Raises
+        ------
+        ValueError
+            If a parameter of the template is missing from ``params``.
+        """
+        if not self.parameters:
+            return self.template
+
+        try:
+            values = {name: quote(str(params[name]), safe='') for name in self.parameters}
+        except KeyError as exc:
+            raise ValueError(f'Missing value for parameter {exc.args[0]!r} of {self.template!r}') from None
+
+        return self.template.format_map(values)
@@ -125,7 +125,8 @@ class HTTPView(metaclass=ViewMeta):
         """
         for route in self.routes:
             route.router = router
-            router.add_route(route)
+
+        router.add_routes(self.routes)
 
     def destroy(self, router: Router):
         """
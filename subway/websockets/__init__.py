@@ -1,4 +1,10 @@
 from .websocket import *
 from .frame import *
+from .compression import *
+from .queues import *
+from .broadcast import *
 from .enums import *
-from .errors import *
\ No newline at end of file
+from .errors import *
+from .hub import *
+from .heartbeat import *
+from .registry import *
\ No newline at end of file
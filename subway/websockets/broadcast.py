@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+import multiprocessing
+import asyncio
+import logging
+import struct
+import time
+import os
+
+from subway import compat
+
+__all__ = (
+    'BroadcastBackend',
+    'UnixSocketBackend',
+    'LocalBroker',
+)
+
+log = logging.getLogger(__name__)
+
+BroadcastCallback = Callable[[Optional[str], bytes], Any]
+
+# A message is a header holding the length of the room name and the length of the payload,
+# followed by the UTF-8 encoded room name and the already encoded websocket frame.
+HEADER = struct.Struct('!HI')
+NO_ROOM = 0xFFFF
+
+def encode_message(room: Optional[str], payload: bytes) -> bytes:
+    if room is None:
+        return HEADER.pack(NO_ROOM, len(payload)) + payload
+
+    name = room.encode()
+    if len(name) >= NO_ROOM:
+        raise ValueError('Room names must be less than 65535 bytes long')
+
+    return HEADER.pack(len(name), len(payload)) + name + payload
+
+def decode_message(message: bytes) -> Tuple[Optional[str], bytes]:
+    length, _ = HEADER.unpack_from(message)
+    start = HEADER.size
+
+    if length == NO_ROOM:
+        return None, message[start:]
+
+    return message[start:start + length].decode(), message[start + length:]
+
+
+class _RelayProtocol(asyncio.Protocol):
+    def __init__(
+        self,
+        on_message: Callable[[_RelayProtocol, bytes], Any],
+        on_connection_made: Optional[Callable[[_RelayProtocol], Any]] = None,
+        on_connection_lost: Optional[Callable[[_RelayProtocol], Any]] = None,
+    ) -> None:
+        self.on_message = on_message
+        self.on_connection_made = on_connection_made
+        self.on_connection_lost = on_connection_lost
+
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+
+    def connection_made(self, transport: Any) -> None:
+        self.transport = transport
+        if self.on_connection_made is not None:
+            self.on_connection_made(self)
+
+    def connection_lost(self, exc: Optional[BaseException]) -> None:
+        self.transport = None
+        self.buffer.clear()
+
+        if self.on_connection_lost is not None:
+            self.on_connection_lost(self)
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self.buffer
+        buffer += data
+
+        offset = 0
+        size = HEADER.size
+        available = len(buffer)
+
+        while available - offset >= size:
+            length, payload_length = HEADER.unpack_from(buffer, offset)
+            if length == NO_ROOM:
+                length = 0
+
+            end = offset + size + length + payload_length
+            if end > available:
+                break
+
+            message = bytes(buffer[offset:end])
+            offset = end
+
+            self.on_message(self, message)
+
+        del buffer[:offset]
+
+    def write(self, message: bytes) -> bool:
+        transport = self.transport
+        if transport is None or transport.is_closing():
+            return False
+
+        transport.write(message)
+        return True
+
+
+class BroadcastBackend(ABC):
+    """
+    Base class for the backends a :class:`~subway.websockets.WebSocketHub` uses to reach websockets
+    held by other processes.
+
+    Broadcasts are delivered to the hub's own websockets directly, and published to the backend at the same time.
+    The backend is responsible for handing the message to the hubs of every other process,
+    which then deliver it to their own websockets. Messages are published already encoded,
+    so a frame is only ever serialized once.
+
+    Subclasses must implement :meth:`start`, :meth:`publish` and :meth:`close`.
+    For example, a backend using Redis' pub/sub would subscribe to a channel in :meth:`start` and
+    publish to it in :meth:`publish`, filtering out its own messages.
+    """
+    @abstractmethod
+    async def start(self, callback: BroadcastCallback) -> None:
+        """
+        Connects the backend.
+
+        Parameters
+        ----------
+        callback: Callable[[Optional[:class:`str`], :class:`bytes`], Any]
+            The callback to call with the room and the encoded frame of every message published by another process.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish(self, room: Optional[str], payload: bytes) -> None:
+        """
+        Publishes an encoded frame to every other process. This must not block,
+        implementations that need to wait should buffer the message instead.
+
+        Parameters
+        ----------
+        room: Optional[:class:`str`]
+            The room the frame is sent to, ``None`` meaning every websocket.
+        payload: :class:`bytes`
+            The encoded frame.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Disconnects the backend.
+        """
+        raise NotImplementedError
+
+
+class UnixSocketBackend(BroadcastBackend):
+    """
+    A broadcast backend connected to a :class:`~subway.websockets.LocalBroker` through a Unix domain socket.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the broker's socket.
+    reconnect_delay: :class:`float`
+        How many seconds to wait before trying to reconnect when the connection to the broker is lost.
+
+    Attributes
+    ----------
+    published: :class:`int`
+        The amount of messages sent to the broker.
+    received: :class:`int`
+        The amount of messages received from the broker.
+    dropped: :class:`int`
+        The amount of messages that could not be published because the broker was unreachable.
+    """
+    def __init__(self, path: str, *, reconnect_delay: float = 1.0) -> None:
+        self.path = path
+        self.reconnect_delay = reconnect_delay
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+
+        self._callback: Optional[BroadcastCallback] = None
+        self._protocol: Optional[_RelayProtocol] = None
+        self._reconnect_task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f'<UnixSocketBackend path={self.path!r} connected={self.is_connected()}>'
+
+    def is_connected(self) -> bool:
+        """
+        True if the backend is connected to the broker.
+        """
+        return self._protocol is not None and self._protocol.transport is not None
+
+    async def _connect(self) -> None:
+        loop = compat.get_running_loop()
+        protocol = _RelayProtocol(self._on_message, on_connection_lost=self._on_connection_lost)
+
+        await loop.create_unix_connection(lambda: protocol, self.path)
+        self._protocol = protocol
+
+    async def start(self, callback: BroadcastCallback) -> None:
+        self._callback = callback
+        self._closed = False
+
+        await self._connect()
+
+    def _on_message(self, protocol: _RelayProtocol, message: bytes) -> None:
+        self.received += 1
+
+        if self._callback is not None:
+            room, payload = decode_message(message)
+            self._callback(room, payload)
+
+    def _on_connection_lost(self, protocol: _RelayProtocol) -> None:
+        if self._protocol is protocol:
+            self._protocol = None
+
+        if not self._closed and self._reconnect_task is None:
+            log.warning('Lost the connection to the broadcast broker at %r, reconnecting', self.path)
+            self._reconnect_task = compat.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        try:
+            while not self._closed:
+                await asyncio.sleep(self.reconnect_delay)
+
+                try:
+                    await self._connect()
+                except OSError:
+                    continue
+
+                log.info('Reconnected to the broadcast broker at %r', self.path)
+                return
+        finally:
+            self._reconnect_task = None
+
+    def publish(self, room: Optional[str], payload: bytes) -> None:
+        protocol = self._protocol
+        if protocol is None or not protocol.write(encode_message(room, payload)):
+            self.dropped += 1
+            return
+
+        self.published += 1
+
+    async def close(self) -> None:
+        self._closed = True
+
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+
+        protocol, self._protocol = self._protocol, None
+        if protocol is not None and protocol.transport is not None:
+            protocol.transport.close()
+
+
+def _run_broker(path: str, kwargs: Dict[str, Any]) -> None:
+    async def main() -> None:
+        broker = LocalBroker(path, **kwargs)
+        await broker.start()
+        await broker.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+class LocalBroker:
+    """
+    A small relay listening on a Unix domain socket, which forwards every message published
+    by a :class:`~subway.websockets.UnixSocketBackend` to every other connected backend.
+
+    The broker is meant to be started by the process that launches the application's worker processes,
+    either in its own event loop with :meth:`start` or in a separate process with :meth:`spawn`.
+    Messages are relayed as is, without being decoded.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the socket to listen on. A stale socket file at this path is removed.
+    max_buffer_size: Optional[:class:`int`]
+        The amount of bytes that can be waiting to be sent to a backend before messages to it are dropped.
+        ``None`` means messages are never dropped.
+
+    Attributes
+    ----------
+    relayed: :class:`int`
+        The amount of messages relayed, counted once per recipient.
+    dropped: :class:`int`
+        The amount of messages dropped because a backend was not reading fast enough.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        process = LocalBroker.spawn('/tmp/subway-broadcast.sock')
+
+        # In every worker process
+        hub = WebSocketHub(backend=UnixSocketBackend('/tmp/subway-broadcast.sock'))
+        await hub.start_backend()
+    """
+    def __init__(self, path: str, *, max_buffer_size: Optional[int] = 16 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_buffer_size = max_buffer_size
+        self.relayed = 0
+        self.dropped = 0
+
+        self._connections: Set[_RelayProtocol] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def __repr__(self) -> str:
+        return f'<LocalBroker path={self.path!r} connections={len(self._connections)}>'
+
+    @classmethod
+    def spawn(cls, path: str, *, timeout: float = 5.0, **kwargs: Any) -> multiprocessing.Process:
+        """
+        Starts a broker in a new daemon process and waits until it is listening.
+
+        Parameters
+        ----------
+        path: :class:`str`
+            The path of the socket to listen on.
+        timeout: :class:`float`
+            How many seconds to wait for the broker to start listening.
+        **kwargs: Any
+            Passed to :class:`~subway.websockets.LocalBroker`.
+
+        Raises
+        ------
+        RuntimeError
+            If the broker did not start listening in time.
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+
+        process = multiprocessing.Process(target=_run_broker, args=(path, kwargs), daemon=True)
+        process.start()
+
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(path):
+            if not process.is_alive() or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f'Broadcast broker did not start listening on {path!r}')
+
+            time.sleep(0.01)
+
+        return process
+
+    def is_serving(self) -> bool:
+        """
+        True if the broker is listening for connections.
+        """
+        return self._server is not None and self._server.is_serving()
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+        """
+        if self.is_serving():
+            raise RuntimeError('Broker is already serving')
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        loop = compat.get_running_loop()
+        self._server = await loop.create_unix_server(self._create_protocol, self.path)
+
+    async def serve_forever(self) -> None:
+        """
+        Blocks until the broker is closed.
+        """
+        if self._server is None:
+            raise RuntimeError('Broker was not started')
+
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self) -> None:
+        """
+        Stops listening and disconnects every backend.
+        """
+        server, self._server = self._server, None
+        if server is None:
+            return
+
+        server.close()
+        for connection in list(self._connections):
+            if connection.transport is not None:
+                connection.transport.close()
+
+        await server.wait_closed()
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _create_protocol(self) -> _RelayProtocol:
+        return _RelayProtocol(self._relay, self._connections.add, self._connections.discard)
+
+    def _relay(self, sender: _RelayProtocol, message: bytes) -> None:
+        max_buffer_size = self.max_buffer_size
+
+        for connection in self._connections:
+            if connection is sender:
+                continue
+
+            transport = connection.transport
+            if transport is None or transport.is_closing():
+                continue
+
+            if max_buffer_size is not None and transport.get_write_buffer_size() > max_buffer_size:
+                self.dropped += 1
+                continue
+
+            transport.write(message)
+            self.relayed += 1
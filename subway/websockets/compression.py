@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set, Tuple
+import zlib
+
+from .errors import InvalidWebSocketFrame, MessageTooLarge
+
+__all__ = (
+    'PerMessageDeflate',
+    'DeflateContext',
+)
+
+EXTENSION_NAME = 'permessage-deflate'
+DEFLATE_TRAILER = b'\x00\x00\xff\xff'
+
+Parameters = List[Tuple[str, Optional[str]]]
+
+def _parse_extensions(header: str) -> List[Tuple[str, Parameters]]:
+    extensions: List[Tuple[str, Parameters]] = []
+
+    for extension in header.split(','):
+        name, *items = [item.strip() for item in extension.split(';')]
+        if not name:
+            continue
+
+        params: Parameters = []
+        for item in items:
+            key, sep, value = item.partition('=')
+            params.append((key.strip().lower(), value.strip().strip('"') if sep else None))
+
+        extensions.append((name.lower(), params))
+
+    return extensions
+
+def _parse_window_bits(value: Optional[str]) -> Optional[int]:
+    if value is None or not value.isdigit():
+        return None
+
+    bits = int(value)
+    if not 8 <= bits <= 15:
+        return None
+
+    return bits
+
+def _validate_window_bits(name: str, bits: Optional[int]) -> None:
+    # zlib doesn't support raw deflate streams with a window of 256 bytes, so 8 isn't accepted here.
+    if bits is not None and not 9 <= bits <= 15:
+        raise ValueError(f'{name} must be between 9 and 15')
+
+
+class DeflateContext:
+    """
+    The negotiated state of a permessage-deflate extension for one side of a connection.
+    Returned by :meth:`PerMessageDeflate.accept` and :meth:`PerMessageDeflate.confirm`.
+
+    Attributes
+    ----------
+    local_no_context_takeover: :class:`bool`
+        Whether the compressor is reset after every message.
+    remote_no_context_takeover: :class:`bool`
+        Whether the decompressor is reset after every message.
+    max_window_bits: :class:`int`
+        The base 2 logarithm of the window size used when compressing.
+    level: :class:`int`
+        The compression level.
+    threshold: :class:`int`
+        The minimum size of a message payload for it to be compressed.
+    """
+    def __init__(
+        self,
+        *,
+        local_no_context_takeover: bool = False,
+        remote_no_context_takeover: bool = False,
+        max_window_bits: int = 15,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        threshold: int = 128
+    ) -> None:
+        self.local_no_context_takeover = local_no_context_takeover
+        self.remote_no_context_takeover = remote_no_context_takeover
+        self.max_window_bits = max_window_bits
+        self.level = level
+        self.threshold = threshold
+
+        self._compressor = None
+        self._decompressor = None
+
+    def __repr__(self) -> str:
+        return (
+            f'<DeflateContext local_no_context_takeover={self.local_no_context_takeover} '
+            f'remote_no_context_takeover={self.remote_no_context_takeover} max_window_bits={self.max_window_bits}>'
+        )
+
+    def should_compress(self, data: bytes) -> bool:
+        """
+        Whether a message payload is big enough to be compressed.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The message payload.
+        """
+        return len(data) >= self.threshold
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses a whole message payload.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The message payload.
+        """
+        compressor = self._compressor
+        if compressor is None:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -self.max_window_bits)
+
+        data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data.endswith(DEFLATE_TRAILER):
+            data = data[:-4]
+
+        self._compressor = None if self.local_no_context_takeover else compressor
+        return data
+
+    def decompress(self, data: bytes, *, final: bool = True, max_size: Optional[int] = None) -> bytes:
+        """
+        Decompresses a frame of a compressed message.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The frame's payload.
+        final: :class:`bool`
+            Whether the frame is the last one of the message.
+        max_size: Optional[:class:`int`]
+            The maximum amount of bytes the frame may inflate to. Inflating stops as soon as it is exceeded,
+            so a small frame can't be used to make the other end allocate a huge amount of memory.
+            ``None`` means no limit.
+
+        Raises
+        ------
+        InvalidWebSocketFrame
+            If the data could not be decompressed.
+        MessageTooLarge
+            If the frame inflates to more than ``max_size`` bytes.
+        """
+        decompressor = self._decompressor
+        if decompressor is None:
+            # A window of 15 bits can inflate anything the peer was allowed to produce.
+            decompressor = self._decompressor = zlib.decompressobj(-15)
+
+        # One byte over the limit is enough to tell that it was exceeded, and a max_length of 0 means no limit.
+        limit = 0 if max_size is None else max_size + 1
+
+        try:
+            data = decompressor.decompress(data, limit)
+            if final and not decompressor.unconsumed_tail and (max_size is None or len(data) <= max_size):
+                data += decompressor.decompress(DEFLATE_TRAILER, 0 if max_size is None else limit - len(data))
+        except zlib.error as exc:
+            raise InvalidWebSocketFrame(f'Received invalid compressed data: {exc}') from None
+
+        if max_size is not None and (len(data) > max_size or decompressor.unconsumed_tail):
+            self._decompressor = None
+            raise MessageTooLarge(len(data), max_size)
+
+        if final and self.remote_no_context_takeover:
+            self._decompressor = None
+
+        return data
+
+
+class PerMessageDeflate:
+    """
+    Options for the permessage-deflate websocket extension, described in :rfc:`7692`.
+
+    The same options are used for both ends, :meth:`accept` is used by servers and :meth:`offer` and :meth:`confirm`
+    by clients.
+
+    Parameters
+    ----------
+    server_no_context_takeover: :class:`bool`
+        Whether the server resets its compressor after every message.
+    client_no_context_takeover: :class:`bool`
+        Whether the client resets its compressor after every message.
+    server_max_window_bits: Optional[:class:`int`]
+        The base 2 logarithm of the server's compression window, between 9 and 15.
+    client_max_window_bits: Optional[:class:`int`]
+        The base 2 logarithm of the client's compression window, between 9 and 15.
+    level: :class:`int`
+        The compression level, see :func:`zlib.compressobj`.
+    threshold: :class:`int`
+        Messages with a payload smaller than this amount of bytes are sent uncompressed.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        app = subway.Application(websocket_compression=PerMessageDeflate(threshold=256))
+
+        async with session.ws_connect('ws://localhost:8080/ws', compression=PerMessageDeflate()) as ws:
+            ...
+    """
+    def __init__(
+        self,
+        *,
+        server_no_context_takeover: bool = False,
+        client_no_context_takeover: bool = False,
+        server_max_window_bits: Optional[int] = None,
+        client_max_window_bits: Optional[int] = None,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        threshold: int = 128
+    ) -> None:
+        _validate_window_bits('server_max_window_bits', server_max_window_bits)
+        _validate_window_bits('client_max_window_bits', client_max_window_bits)
+
+        if threshold < 0:
+            raise ValueError('threshold must be a positive integer')
+
+        self.server_no_context_takeover = server_no_context_takeover
+        self.client_no_context_takeover = client_no_context_takeover
+        self.server_max_window_bits = server_max_window_bits
+        self.client_max_window_bits = client_max_window_bits
+        self.level = level
+        self.threshold = threshold
+
+    def __repr__(self) -> str:
+        return f'<PerMessageDeflate level={self.level} threshold={self.threshold}>'
+
+    def offer(self) -> str:
+        """
+        Builds the ``Sec-WebSocket-Extensions`` header value sent by clients.
+        """
+        params = [EXTENSION_NAME]
+
+        if self.server_no_context_takeover:
+            params.append('server_no_context_takeover')
+
+        if self.client_no_context_takeover:
+            params.append('client_no_context_takeover')
+
+        if self.server_max_window_bits is not None:
+            params.append(f'server_max_window_bits={self.server_max_window_bits}')
+
+        if self.client_max_window_bits is not None:
+            params.append(f'client_max_window_bits={self.client_max_window_bits}')
+        else:
+            params.append('client_max_window_bits')
+
+        return '; '.join(params)
+
+    def accept(self, header: str) -> Optional[Tuple[str, DeflateContext]]:
+        """
+        Picks the first acceptable permessage-deflate offer out of a client's ``Sec-WebSocket-Extensions`` header.
+
+        Parameters
+        ----------
+        header: :class:`str`
+            The header sent by the client.
+
+        Returns
+        -------
+        Optional[Tuple[:class:`str`, :class:`~.DeflateContext`]]
+            The extension to send back to the client and the server's context, or ``None`` if no offer was acceptable.
+        """
+        for name, params in _parse_extensions(header):
+            if name != EXTENSION_NAME:
+                continue
+
+            accepted = self._accept_offer(params)
+            if accepted is not None:
+                return accepted
+
+        return None
+
+    def _accept_offer(self, params: Parameters) -> Optional[Tuple[str, DeflateContext]]:
+        server_no_context_takeover = self.server_no_context_takeover
+        client_no_context_takeover = self.client_no_context_takeover
+        server_max_window_bits = self.server_max_window_bits
+        client_max_window_bits = self.client_max_window_bits
+
+        offers_client_max_window_bits = False
+        seen: Set[str] = set()
+
+        for key, value in params:
+            if key in seen:
+                return None
+
+            seen.add(key)
+
+            if key == 'server_no_context_takeover':
+                if value is not None:
+                    return None
+
+                server_no_context_takeover = True
+            elif key == 'client_no_context_takeover':
+                if value is not None:
+                    return None
+
+                client_no_context_takeover = True
+            elif key == 'server_max_window_bits':
+                bits = _parse_window_bits(value)
+                if bits is None or bits == 8:
+                    return None
+
+                if server_max_window_bits is None or bits < server_max_window_bits:
+                    server_max_window_bits = bits
+            elif key == 'client_max_window_bits':
+                offers_client_max_window_bits = True
+
+                if value is not None:
+                    bits = _parse_window_bits(value)
+                    if bits is None:
+                        return None
+
+                    if client_max_window_bits is not None:
+                        client_max_window_bits = min(bits, client_max_window_bits)
+            else:
+                return None
+
+        if client_max_window_bits is not None and not offers_client_max_window_bits:
+            return None
+
+        response = [EXTENSION_NAME]
+
+        if server_no_context_takeover:
+            response.append('server_no_context_takeover')
+
+        if client_no_context_takeover:
+            response.append('client_no_context_takeover')
+
+        if server_max_window_bits is not None:
+            response.append(f'server_max_window_bits={server_max_window_bits}')
+
+        if client_max_window_bits is not None:
+            response.append(f'client_max_window_bits={client_max_window_bits}')
+
+        context = DeflateContext(
+            local_no_context_takeover=server_no_context_takeover,
+            remote_no_context_takeover=client_no_context_takeover,
+            max_window_bits=server_max_window_bits or 15,
+            level=self.level,
+            threshold=self.threshold
+        )
+
+        return '; '.join(response), context
+
+    def confirm(self, header: str) -> DeflateContext:
+        """
+        Validates the ``Sec-WebSocket-Extensions`` header a server responded with against :meth:`offer`.
+
+        Parameters
+        ----------
+        header: :class:`str`
+            The header sent by the server.
+
+        Raises
+        ------
+        ValueError
+            If the server's response does not match what was offered.
+        """
+        extensions = _parse_extensions(header)
+        if len(extensions) != 1 or extensions[0][0] != EXTENSION_NAME:
+            raise ValueError(f'Unexpected websocket extensions in handshake response: {header!r}')
+
+        server_no_context_takeover = False
+        client_no_context_takeover = self.client_no_context_takeover
+        server_max_window_bits: Optional[int] = None
+        client_max_window_bits = self.client_max_window_bits
+
+        seen: Set[str] = set()
+
+        for key, value in extensions[0][1]:
+            if key in seen:
+                raise ValueError(f'Duplicate permessage-deflate parameter: {key!r}')
+
+            seen.add(key)
+
+            if key == 'server_no_context_takeover' and value is None:
+                server_no_context_takeover = True
+            elif key == 'client_no_context_takeover' and value is None:
+                client_no_context_takeover = True
+            elif key == 'server_max_window_bits':
+                bits = _parse_window_bits(value)
+                if bits is None:
+                    raise ValueError(f'Invalid server_max_window_bits value: {value!r}')
+
+                if self.server_max_window_bits is not None and bits > self.server_max_window_bits:
+                    raise ValueError('Server responded with a bigger server_max_window_bits than requested')
+
+                server_max_window_bits = bits
+            elif key == 'client_max_window_bits':
+                bits = _parse_window_bits(value)
+                if bits is None:
+                    raise ValueError(f'Invalid client_max_window_bits value: {value!r}')
+
+                if client_max_window_bits is not None and bits > client_max_window_bits:
+                    raise ValueError('Server responded with a bigger client_max_window_bits than offered')
+
+                if bits == 8:
+                    raise ValueError('client_max_window_bits=8 is not supported')
+
+                client_max_window_bits = bits
+            else:
+                raise ValueError(f'Unexpected permessage-deflate parameter: {key!r}')
+
+        if self.server_no_context_takeover and not server_no_context_takeover:
+            raise ValueError('Server did not accept server_no_context_takeover')
+
+        if self.server_max_window_bits is not None and server_max_window_bits is None:
+            raise ValueError('Server did not accept server_max_window_bits')
+
+        return DeflateContext(
+            local_no_context_takeover=client_no_context_takeover,
+            remote_no_context_takeover=server_no_context_takeover,
+            max_window_bits=client_max_window_bits or 15,
+            level=self.level,
+            threshold=self.threshold
+        )
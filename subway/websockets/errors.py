@@ -6,7 +6,9 @@ __all__ = (
     'InvalidWebSocketCloseCode',
     'InvalidWebSocketOpcode',
     'InvalidWebSocketControlFrame',
-    'FragmentedControlFrame'
+    'FragmentedControlFrame',
+    'InvalidWebSocketPayload',
+    'MessageTooLarge',
 )
 
 
@@ -63,4 +65,26 @@ class FragmentedControlFrame(InvalidWebSocketControlFrame):
             message = 'Control frames must not be fragmented'
 
         super().__init__(message)
-        
\ No newline at end of file
+
+
+class InvalidWebSocketPayload(WebSocketError):
+    """
+    Raised when a text message received is not valid UTF-8.
+    """
+
+
+class MessageTooLarge(WebSocketError):
+    """
+    Raised when a message received exceeds the maximum message size.
+
+    Attributes
+    ----------
+    size: :class:`int`
+        The amount of bytes received so far.
+    max_size: :class:`int`
+        The maximum message size.
+    """
+    def __init__(self, size: int, max_size: int) -> None:
+        self.size = size
+        self.max_size = max_size
+        super().__init__(f'Received a message of at least {size} bytes, the maximum is {max_size} bytes')
@@ -5,6 +5,7 @@ from typing import (
     Any, 
     Coroutine,
     Callable, 
+    Iterator,
     Literal, 
     Optional, 
     Tuple, 
@@ -15,6 +16,13 @@ from typing import (
 import struct
 import os
 
+try:
+    import numpy  # type: ignore
+except ImportError:
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
 from subway.types import BytesLike
 from subway.utils import loads
 from .enums import WebSocketCloseCode, WebSocketOpcode, VALID_CLOSE_CODES, VALID_OPCODES
@@ -23,7 +31,8 @@ from .errors import (
     InvalidWebSocketControlFrame,
     InvalidWebSocketFrame,
     InvalidWebSocketOpcode,
-    FragmentedControlFrame
+    FragmentedControlFrame,
+    MessageTooLarge
 )
 
 if TYPE_CHECKING:
@@ -37,6 +46,14 @@ SHORT = struct.Struct('!H')
 LONGLONG = struct.Struct('!Q')
 HEAD = struct.Struct('!BB')
 
+# Payloads smaller than this are masked using integers even if NumPy is installed,
+# since the array setup costs more than it saves.
+NUMPY_MASK_THRESHOLD = 4096
+
+# Received payloads smaller than this are copied out of the parser's buffer,
+# since keeping a view on them would mean allocating a new buffer instead.
+MIN_VIEW_PAYLOAD = 1024
+
 FORMATS = {
     'short': SHORT,
     'longlong': LONGLONG,
@@ -54,9 +71,35 @@ def _try_enum(enum: Type[_T], value: int) -> int:
 __all__ = (
     'Data',
     'WebSocketFrame',
+    'WebSocketParser',
 )
 
 
+def _int_mask(data: BytesLike, mask: bytes) -> bytes:
+    length = len(data)
+    key = mask * (length // 4 + 1)
+
+    value = int.from_bytes(data, 'little') ^ int.from_bytes(key[:length], 'little')
+    return value.to_bytes(length, 'little')
+
+
+def _numpy_mask(data: BytesLike, mask: bytes, buffer: bytearray, offset: int) -> None:
+    length = len(data)
+    words = length // 4
+    size = words * 4
+
+    source = numpy.frombuffer(data, dtype=numpy.uint8, count=length)
+    target = numpy.frombuffer(buffer, dtype=numpy.uint8, count=length, offset=offset)
+
+    if words:
+        key = numpy.frombuffer(mask, dtype=numpy.uint32)
+        numpy.bitwise_xor(source[:size].view(numpy.uint32), key, out=target[:size].view(numpy.uint32))
+
+    if size != length:
+        tail = numpy.frombuffer(mask, dtype=numpy.uint8, count=length - size)
+        numpy.bitwise_xor(source[size:], tail, out=target[size:])
+
+
 class Data:
     """
     Returned by :meth:`~subway.websockets.ServerWebSocket.receive`.
@@ -82,9 +125,21 @@ class Data:
     @property
     def data(self) -> bytes:
         """
-        The data received as bytes.
+        The data received as bytes. This copies the payload if it was received as a view, see :attr:`view`.
         """
-        return self.frame.data
+        data = self.frame.data
+        if isinstance(data, bytes):
+            return data
+
+        return bytes(data)
+
+    @property
+    def view(self) -> memoryview:
+        """
+        The data received as a :class:`memoryview`, without copying it.
+        Use :meth:`memoryview.tobytes` to get a copy that outlives the frame.
+        """
+        return self.frame.payload
 
     def is_close_frame(self) -> bool:
         """
@@ -102,7 +157,7 @@ class Data:
         """
         The data received as a string.
         """
-        return self.data.decode()
+        return str(self.frame.data, 'utf-8')
 
     def json(self) -> Any:
         """
@@ -119,12 +174,15 @@ class WebSocketFrame:
     Parameters
     -----------
     data: :class:`bytes`
-        The frame's data. Can be any bytes-like object.
+        The frame's data. Can be any bytes-like object, which is kept as is instead of being copied.
     head: :class:`int`
         The frame's header.
     """
     def __init__(self, *, data: BytesLike, head: int = 0):
-        self.data = bytes(data)
+        if isinstance(data, memoryview) and (data.ndim != 1 or data.itemsize != 1):
+            data = data.cast('B') if data.c_contiguous else memoryview(data.tobytes())
+
+        self.data: BytesLike = data
 
         self._head = head
         self._close_code: Optional[int] = None
@@ -146,7 +204,7 @@ class WebSocketFrame:
         if code not in VALID_CLOSE_CODES:
             raise InvalidWebSocketCloseCode(code)
 
-        self.data = data[2:]
+        self.data = memoryview(data)[2:]
         return _try_enum(WebSocketCloseCode, code)
 
     def _modify_head(self, value: bool, bit: int):
@@ -186,13 +244,12 @@ class WebSocketFrame:
         opcode: :class:`~.WebSocketOpcode`
             The frame's opcode
         """
-        self = cls.create(data=data, opcode=opcode)
-        self.fin = False
-
-        return self
+        return cls.create(data=data, opcode=opcode)
 
     @classmethod
-    async def decode(cls, reader: Reader) -> WebSocketFrame:
+    async def decode(
+        cls, reader: Reader, *, allow_rsv1: bool = False, max_size: Optional[int] = None
+    ) -> WebSocketFrame:
         """
         Decodes a websocket frame.
 
@@ -201,9 +258,15 @@ class WebSocketFrame:
         reader: Callable[[int], Coroutine[Any, Any, bytes]]
             A coroutine function that takes in an integer and returns the data read.
             The data read will be and must be of the length passed in.
+        allow_rsv1: :class:`bool`
+            Whether data frames may have the first reserved bit set, used by permessage-deflate.
+        max_size: Optional[:class:`int`]
+            The maximum length of the payload. ``None`` means no limit.
 
         Raises
         -------
+        MessageTooLarge
+            If the payload is longer than ``max_size``. Nothing of the payload is read.
         InvalidWebSocketOpcode
             If the opcode received is not a valid one.
         InvalidWebSocketFrame
@@ -225,21 +288,53 @@ class WebSocketFrame:
         elif length == 127:
             length, = await cls.unpack(reader, 8, 'longlong')
 
+        if max_size is not None and length > max_size:
+            raise MessageTooLarge(length, max_size)
+
         if masked:
             mask = await reader(4)
 
-        data = await reader(length)
+        # Readers treat a length of 0 as "read everything", which would swallow the next frame.
+        data = await reader(length) if length else b''
 
         if masked:
             assert mask is not None, 'Should never happen'
             data = cls.mask(data, mask)
 
-        opcode = fbyte & 0x0F
+        return cls.from_payload(fbyte, data, allow_rsv1=allow_rsv1)
+
+    @classmethod
+    def from_payload(cls, head: int, data: BytesLike, *, allow_rsv1: bool = False) -> WebSocketFrame:
+        """
+        Creates a frame from its first header byte and its already unmasked payload, validating both.
+
+        Parameters
+        ----------
+        head: :class:`int`
+            The first byte of the frame's header.
+        data: :class:`bytes`
+            The frame's payload. Can be any bytes-like object.
+        allow_rsv1: :class:`bool`
+            Whether data frames may have the first reserved bit set, used by permessage-deflate.
+
+        Raises
+        -------
+        InvalidWebSocketOpcode
+            If the opcode received is not a valid one.
+        InvalidWebSocketFrame
+            If the frame received has reserved bits set to 1 or True.
+        InvalidWebSocketControlFrame
+            If the control frame received's data length is more than 125.
+        """
+        opcode = head & 0x0F
         if opcode not in VALID_OPCODES:
             raise InvalidWebSocketOpcode(opcode)
 
-        frame = cls(head=fbyte, data=data)
-        if any((frame.rsv1, frame.rsv2, frame.rsv3)):
+        frame = cls(head=head, data=data)
+        if frame.rsv2 or frame.rsv3:
+            raise InvalidWebSocketFrame('Received a frame with reserved bits set')
+
+        if frame.rsv1 and (not allow_rsv1 or frame.is_control() or opcode == WebSocketOpcode.CONTINUATION):
             raise InvalidWebSocketFrame('Received a frame with reserved bits set')
 
         if frame.opcode is WebSocketOpcode.CLOSE:
@@ -317,18 +412,62 @@ class WebSocketFrame:
         return fmt.pack(data)
 
     @staticmethod
-    def mask(data: bytes, mask: bytes) -> bytes:
+    def mask(data: BytesLike, mask: bytes) -> bytes:
+        """
+        Masks the data passed in. Masking is symmetric, so this is also used to unmask data.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The data to mask. Can be any bytes-like object.
+        mask: :class:`bytes`
+            The 4 byte mask to use.
+        """
+        length = len(data)
+        if not length:
+            return b''
+
+        if HAS_NUMPY and length >= NUMPY_MASK_THRESHOLD:
+            buffer = bytearray(length)
+            _numpy_mask(data, mask, buffer, 0)
+
+            return bytes(buffer)
+
+        return _int_mask(data, mask)
+
+    @staticmethod
+    def mask_into(data: BytesLike, mask: bytes, buffer: bytearray, offset: int = 0) -> None:
         """
-        Masks the data passed in.
+        Masks the data passed in and writes the result into an already allocated buffer.
+        ``data`` may be a view into ``buffer`` itself, in which case the data is masked in place.
 
         Parameters
         ----------
         data: :class:`bytes`
-            The data to mask.
+            The data to mask. Can be any bytes-like object.
         mask: :class:`bytes`
-            The mask to use.
+            The 4 byte mask to use.
+        buffer: :class:`bytearray`
+            The buffer to write the masked data into.
+        offset: :class:`int`
+            The position in ``buffer`` to start writing at.
+
+        Raises
+        -------
+        ValueError
+            If the buffer is too small to hold the data.
         """
-        return bytes([data[i] ^ mask[i % 4] for i in range(len(data))])
+        length = len(data)
+        if offset + length > len(buffer):
+            raise ValueError('Buffer is too small to hold the masked data')
+
+        if not length:
+            return
+
+        if HAS_NUMPY and length >= NUMPY_MASK_THRESHOLD:
+            return _numpy_mask(data, mask, buffer, offset)
+
+        buffer[offset:offset + length] = _int_mask(data, mask)
 
     @property
     def opcode(self) -> int:
@@ -376,6 +515,13 @@ class WebSocketFrame:
     def rsv3(self, value: bool):
         self._modify_head(value, 4)
 
+    @property
+    def payload(self) -> memoryview:
+        """
+        The frame's data as a :class:`memoryview`, without copying it.
+        """
+        return memoryview(self.data)
+
     @property
     def close_code(self) -> Optional[int]:
         return self._close_code
@@ -398,15 +544,19 @@ class WebSocketFrame:
         -------
         InvalidWebSocketFrame
             If the frame's reserve bits are set to 1 or True, or when the frame has a close code set
-            but the opcode isn't :attr:`.WebSocketOpCode.CLOSE`.
+            but the opcode isn't :attr:`.WebSocketOpCode.CLOSE`. The first reserve bit is allowed on
+            non-continuation data frames since it marks compressed messages.
         InvalidWebSocketControlFrame
             If the control frame's data exceeds the 125 bytes in length
         FragmentedControlFrame
             If the control frame is fragmented
         """
-        if any((self.rsv1, self.rsv2, self.rsv3)):
+        if self.rsv2 or self.rsv3:
             raise InvalidWebSocketFrame('Frame reserve bits must be set to False or 0')
 
+        if self.rsv1 and (self.is_control() or self.opcode == WebSocketOpcode.CONTINUATION):
+            raise InvalidWebSocketFrame('Only the first frame of a data message can have the first reserve bit set')
+
         if self.close_code:
             if self.opcode is not WebSocketOpcode.CLOSE:
                 raise InvalidWebSocketFrame(
@@ -423,26 +573,22 @@ class WebSocketFrame:
             if length > 125:
                 raise InvalidWebSocketControlFrame('Control frames must not exceed 125 bytes in length')
 
-            if self.fin:
+            if not self.fin:
                 raise FragmentedControlFrame(False)
 
-    def encode(self, masked: bool = False) -> bytearray:
+    def encode_header(self, length: int, *, masked: bool = False) -> bytearray:
         """
-        Encodes the frame into a sendable buffer.
+        Encodes the frame's header, without the masking key, for a payload of ``length`` bytes.
+        This can be used to send the header and the payload as separate buffers, without copying the payload.
 
         Parameters
         ----------
+        length: :class:`int`
+            The length of the payload.
         masked: :class:`bool`
-            Whether to mask the data or not.
+            Whether the payload is masked or not.
         """
-        self.ensure()
-        data = self.data
-
-        if self.close_code is not None:
-            data = self.pack(self.close_code, 'short') + data
-
         buffer = bytearray(2)
-        length = len(data)
 
         buffer[0] = self._head
         buffer[1] = masked << 7
@@ -460,12 +606,141 @@ class WebSocketFrame:
             packed = self.pack(length, 'longlong')
             buffer.extend(packed)
 
+        return buffer
+
+    def encode(self, masked: bool = False) -> bytearray:
+        """
+        Encodes the frame into a sendable buffer.
+
+        Parameters
+        ----------
+        masked: :class:`bool`
+            Whether to mask the data or not.
+        """
+        self.ensure()
+        data = self.data
+
+        if self.close_code is not None:
+            data = self.pack(self.close_code, 'short') + data
+
+        buffer = self.encode_header(len(data), masked=masked)
+
         if masked:
             mask = os.urandom(4)
-
             buffer.extend(mask)
-            data = self.mask(data, mask)
+
+            offset = len(buffer)
+            buffer.extend(data)
+
+            self.mask_into(data, mask, buffer, offset)
+            return buffer
 
         buffer.extend(data)
         return buffer
 
+
+class WebSocketParser:
+    """
+    An incremental websocket frame parser.
+    Data is fed in as it arrives and every complete frame buffered is parsed in a single pass,
+    partial frames are kept until the rest of their data is fed.
+    Large frames that end the buffered data keep a :class:`memoryview` into the buffer as their payload
+    instead of a copy, and masked payloads are unmasked in place.
+
+    Parameters
+    ----------
+    allow_rsv1: :class:`bool`
+        Whether data frames may have the first reserved bit set, used by permessage-deflate.
+    max_size: Optional[:class:`int`]
+        The maximum length of a frame's payload. Longer frames are rejected as soon as their header is parsed,
+        before any of their payload is buffered. ``None`` means no limit.
+    """
+    def __init__(self, *, allow_rsv1: bool = False, max_size: Optional[int] = None) -> None:
+        self.buffer = bytearray()
+        self.allow_rsv1 = allow_rsv1
+        self.max_size = max_size
+
+    def __repr__(self) -> str:
+        return f'<WebSocketParser buffered={len(self.buffer)}>'
+
+    def feed(self, data: BytesLike) -> Iterator[WebSocketFrame]:
+        """
+        Feeds data into the parser and returns an iterator over the frames that are now complete.
+        The iterator must be exhausted before data is fed again.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The data received. Can be any bytes-like object.
+
+        Raises
+        -------
+        InvalidWebSocketFrame
+            While iterating, if an invalid frame is received. Frames before it are still returned.
+        MessageTooLarge
+            While iterating, if a frame is longer than :attr:`max_size`. Frames before it are still returned.
+        """
+        self.buffer.extend(data)
+        return self._parse()
+
+    def _parse(self) -> Iterator[WebSocketFrame]:
+        buffer = self.buffer
+        size = len(buffer)
+        position = 0
+        released = False
+
+        try:
+            with memoryview(buffer) as view:
+                while size - position >= 2:
+                    fbyte, sbyte = HEAD.unpack_from(view, position)
+
+                    length = sbyte & 0x7F
+                    offset = position + 2
+
+                    if length == 126:
+                        if size - offset < 2:
+                            break
+
+                        length, = SHORT.unpack_from(view, offset)
+                        offset += 2
+                    elif length == 127:
+                        if size - offset < 8:
+                            break
+
+                        length, = LONGLONG.unpack_from(view, offset)
+                        offset += 8
+
+                    if self.max_size is not None and length > self.max_size:
+                        raise MessageTooLarge(length, self.max_size)
+
+                    mask = None
+                    if sbyte & 0x80:
+                        if size - offset < 4:
+                            break
+
+                        mask = bytes(view[offset:offset + 4])
+                        offset += 4
+
+                    end = offset + length
+                    if end > size:
+                        break
+
+                    if mask is not None:
+                        WebSocketFrame.mask_into(view[offset:end], mask, buffer, offset)
+
+                    payload: BytesLike
+                    if end == size and length >= MIN_VIEW_PAYLOAD:
+                        # The frame is the last thing buffered, so instead of copying its payload the buffer
+                        # is handed over to the frame and the parser starts over with a new one.
+                        payload = memoryview(buffer)[offset:end]
+
+                        self.buffer = bytearray()
+                        released = True
+                    else:
+                        payload = bytes(view[offset:end])
+
+                    position = end
+                    yield WebSocketFrame.from_payload(fbyte, payload, allow_rsv1=self.allow_rsv1)
+        finally:
+            if position and not released:
+                del buffer[:position]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+from subway import compat
+from .frame import WebSocketFrame
+from .enums import WebSocketOpcode
+from .websocket import BaseWebSocket
+
+__all__ = (
+    'Heartbeat',
+)
+
+log = logging.getLogger(__name__)
+
+class Heartbeat:
+    """
+    Keeps websockets alive by pinging them from a single task, instead of one task per connection.
+
+    Every ``resolution`` seconds, all websockets are walked once. A ping is sent to those that haven't received
+    anything for their :attr:`~subway.websockets.BaseWebSocket.ping_interval`, and those that haven't received
+    anything within their :attr:`~subway.websockets.BaseWebSocket.ping_timeout` after a ping are aborted.
+    Websockets are removed once they are closed.
+
+    Parameters
+    ----------
+    resolution: :class:`float`
+        How often, in seconds, the websockets are walked.
+
+    Attributes
+    ----------
+    pings: :class:`int`
+        The amount of pings sent.
+    reaped: :class:`int`
+        The amount of websockets aborted because they did not respond in time.
+    """
+    def __init__(self, *, resolution: float = 1.0) -> None:
+        if resolution <= 0:
+            raise ValueError('resolution must be a positive number')
+
+        self.resolution = resolution
+        self.pings = 0
+        self.reaped = 0
+
+        self._websockets: Dict[BaseWebSocket, Optional[float]] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __repr__(self) -> str:
+        return f'<Heartbeat websockets={len(self._websockets)} running={self.is_running()}>'
+
+    def __len__(self) -> int:
+        return len(self._websockets)
+
+    def __contains__(self, websocket: object) -> bool:
+        return websocket in self._websockets
+
+    def is_running(self) -> bool:
+        """
+        True if the heartbeat task is running.
+        """
+        return self._task is not None and not self._task.done()
+
+    def add(self, websocket: BaseWebSocket) -> None:
+        """
+        Starts keeping a websocket alive. Websockets without a ping interval are still tracked
+        but never pinged.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.BaseWebSocket`
+            The websocket to add.
+        """
+        if websocket in self._websockets or websocket.is_closed():
+            return
+
+        self._websockets[websocket] = None
+        websocket.add_close_callback(self.remove)
+
+    def remove(self, websocket: BaseWebSocket) -> None:
+        """
+        Stops keeping a websocket alive.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.BaseWebSocket`
+            The websocket to remove.
+        """
+        if self._websockets.pop(websocket, False) is not False:
+            websocket.remove_close_callback(self.remove)
+
+    def start(self) -> None:
+        """
+        Starts the heartbeat task.
+        """
+        if self.is_running():
+            return
+
+        self._task = compat.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """
+        Stops the heartbeat task. The websockets are kept.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.resolution)
+
+            try:
+                self.tick()
+            except Exception:
+                log.exception('Unhandled exception in websocket heartbeat')
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """
+        Walks every websocket once, sending pings and aborting dead connections.
+        This is called by the heartbeat task.
+
+        Parameters
+        ----------
+        now: Optional[:class:`float`]
+            The current :func:`time.monotonic` timestamp.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        websockets = self._websockets
+        ping: Optional[bytes] = None
+
+        for websocket, sent in list(websockets.items()):
+            if websocket.is_closed():
+                self.remove(websocket)
+                continue
+
+            last_activity = websocket.last_activity
+
+            if sent is not None:
+                if last_activity >= sent:
+                    websockets[websocket] = sent = None
+                else:
+                    timeout = websocket.ping_timeout
+                    if timeout is not None and now - sent >= timeout:
+                        log.debug('Aborting %r since it did not respond to a ping in %ss', websocket, timeout)
+
+                        self.reaped += 1
+                        websocket.abort()
+
+                    continue
+
+            interval = websocket.ping_interval
+            if interval is None or now - last_activity < interval:
+                continue
+
+            if websocket._masked:
+                data = WebSocketFrame.create_control_frame(b'', opcode=WebSocketOpcode.PING).encode(masked=True)
+            else:
+                if ping is None:
+                    ping = bytes(WebSocketFrame.create_control_frame(b'', opcode=WebSocketOpcode.PING).encode(masked=False))
+
+                data = ping
+
+            if websocket.write_nowait(data):
+                websockets[websocket] = now
+                self.pings += 1
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Literal, Optional, Set
+import logging
+
+from subway.utils import dumps
+from .frame import WebSocketFrame
+from .broadcast import BroadcastBackend
+from .enums import WebSocketOpcode
+from .websocket import BaseWebSocket, ServerWebSocket, WebSocketData
+
+__all__ = (
+    'WebSocketHub',
+)
+
+log = logging.getLogger(__name__)
+
+SlowConsumerPolicy = Literal['skip', 'queue']
+
+class WebSocketHub:
+    """
+    A publish/subscribe hub for server websockets, with named rooms.
+
+    Messages are serialized and framed once, then the same bytes are written to the transport of every recipient.
+    Websockets are removed from the hub once they are closed.
+
+    Parameters
+    ----------
+    max_buffer_size: Optional[:class:`int`]
+        The amount of bytes a websocket can have waiting to be sent before it is considered a slow consumer.
+        ``None`` means no websocket is ever considered slow.
+    slow_consumer: :class:`str`
+        What to do with slow consumers. ``skip`` drops the message for them while ``queue``
+        writes it anyway, leaving it buffered until the peer catches up.
+        Websockets with a send queue enabled always get the message queued and their queue's policy applies.
+    backend: Optional[:class:`~subway.websockets.BroadcastBackend`]
+        A backend used to also deliver broadcasts to the hubs of other processes.
+        It has to be started with :meth:`start_backend`.
+
+    Attributes
+    ----------
+    skipped: :class:`int`
+        The amount of deliveries skipped because the recipient was a slow consumer.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        hub = WebSocketHub()
+
+        @app.websocket('/ticks')
+        async def ticks(request, websocket):
+            hub.join(websocket, 'ticks')
+            async for message in websocket:
+                ...
+
+        async def publish(tick):
+            hub.broadcast({'price': tick.price}, room='ticks')
+    """
+    def __init__(
+        self,
+        *,
+        max_buffer_size: Optional[int] = 1024 * 1024,
+        slow_consumer: SlowConsumerPolicy = 'skip',
+        backend: Optional[BroadcastBackend] = None
+    ) -> None:
+        if slow_consumer not in ('skip', 'queue'):
+            raise ValueError(f'Invalid slow consumer policy {slow_consumer!r}. Must be either skip or queue.')
+
+        self.max_buffer_size = max_buffer_size
+        self.slow_consumer = slow_consumer
+        self.backend = backend
+        self.skipped = 0
+
+        self._websockets: Dict[ServerWebSocket, Set[str]] = {}
+        self._rooms: Dict[str, Set[ServerWebSocket]] = {}
+
+    def __repr__(self) -> str:
+        return f'<WebSocketHub websockets={len(self._websockets)} rooms={len(self._rooms)}>'
+
+    def __len__(self) -> int:
+        return len(self._websockets)
+
+    def __contains__(self, websocket: object) -> bool:
+        return websocket in self._websockets
+
+    @property
+    def rooms(self) -> List[str]:
+        """
+        The names of all the rooms that have at least one member.
+        """
+        return list(self._rooms)
+
+    def members(self, room: str) -> List[ServerWebSocket]:
+        """
+        Returns the websockets in a room.
+
+        Parameters
+        ----------
+        room: :class:`str`
+            The name of the room.
+        """
+        return list(self._rooms.get(room, ()))
+
+    def rooms_of(self, websocket: ServerWebSocket) -> List[str]:
+        """
+        Returns the rooms a websocket is in.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        """
+        return list(self._websockets.get(websocket, ()))
+
+    def add(self, websocket: ServerWebSocket) -> None:
+        """
+        Adds a websocket to the hub without joining any room.
+        It receives messages broadcasted to the whole hub.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket to add.
+
+        Raises
+        ------
+        TypeError
+            If the websocket is not a server websocket.
+        """
+        if websocket in self._websockets:
+            return
+
+        if not isinstance(websocket, ServerWebSocket):
+            raise TypeError('Only server websockets can be added to a hub since client frames must be masked')
+
+        self._websockets[websocket] = set()
+        websocket.add_close_callback(self._on_close)
+
+    def join(self, websocket: ServerWebSocket, *rooms: str) -> None:
+        """
+        Adds a websocket to one or more rooms, adding it to the hub if needed.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        *rooms: :class:`str`
+            The names of the rooms to join.
+        """
+        self.add(websocket)
+        if websocket.is_closed():
+            return
+
+        memberships = self._websockets[websocket]
+        for room in rooms:
+            memberships.add(room)
+            self._rooms.setdefault(room, set()).add(websocket)
+
+    def leave(self, websocket: ServerWebSocket, *rooms: str) -> None:
+        """
+        Removes a websocket from one or more rooms. The websocket stays in the hub.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        *rooms: :class:`str`
+            The names of the rooms to leave.
+        """
+        memberships = self._websockets.get(websocket)
+        if memberships is None:
+            return
+
+        for room in rooms:
+            memberships.discard(room)
+
+            members = self._rooms.get(room)
+            if members is None:
+                continue
+
+            members.discard(websocket)
+            if not members:
+                del self._rooms[room]
+
+    def remove(self, websocket: ServerWebSocket) -> None:
+        """
+        Removes a websocket from the hub and all of its rooms.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket to remove.
+        """
+        memberships = self._websockets.get(websocket)
+        if memberships is None:
+            return
+
+        self.leave(websocket, *memberships)
+        del self._websockets[websocket]
+
+        websocket.remove_close_callback(self._on_close)
+
+    async def start_backend(self) -> None:
+        """
+        Starts the hub's broadcast backend, if there is one.
+        """
+        if self.backend is not None:
+            await self.backend.start(self._receive_remote)
+
+    async def close_backend(self) -> None:
+        """
+        Closes the hub's broadcast backend, if there is one. The websockets of the hub are left open.
+        """
+        if self.backend is not None:
+            await self.backend.close()
+
+    def _receive_remote(self, room: Optional[str], payload: bytes) -> None:
+        if room is None:
+            websockets: Iterable[ServerWebSocket] = tuple(self._websockets)
+        else:
+            websockets = tuple(self._rooms.get(room, ()))
+
+        self._deliver(payload, websockets, None)
+
+    def _on_close(self, websocket: BaseWebSocket) -> None:
+        self.remove(websocket)  # type: ignore
+
+    @staticmethod
+    def encode(data: WebSocketData, *, opcode: Optional[WebSocketOpcode] = None) -> bytes:
+        """
+        Serializes and frames a message the same way :meth:`~subway.websockets.ServerWebSocket.send` would.
+
+        Parameters
+        ----------
+        data: Any
+            The data to encode. Can be a string, any bytes-like object, a list or a dict.
+        opcode: :class:`~subway.websockets.WebSocketOpcode`
+            The opcode to use. Defaults to :attr:`~subway.websockets.WebSocketOpcode.TEXT`.
+        """
+        if isinstance(data, (list, dict)):
+            data = dumps(data)
+        if isinstance(data, str):
+            data = data.encode()
+
+        frame = WebSocketFrame.create(data, opcode=opcode or WebSocketOpcode.TEXT)
+        return bytes(frame.encode(masked=False))
+
+    def broadcast(
+        self,
+        data: WebSocketData,
+        *,
+        room: Optional[str] = None,
+        opcode: Optional[WebSocketOpcode] = None,
+        exclude: Optional[ServerWebSocket] = None
+    ) -> int:
+        """
+        Sends a message to every websocket in a room, or in the hub if no room is given.
+        If the hub has a backend, the message is also published to the other processes.
+
+        Parameters
+        ----------
+        data: Any
+            The data to send. Can be a string, any bytes-like object, a list or a dict.
+        room: Optional[:class:`str`]
+            The room to send the message to.
+        opcode: :class:`~subway.websockets.WebSocketOpcode`
+            The opcode to use. Defaults to :attr:`~subway.websockets.WebSocketOpcode.TEXT`.
+        exclude: Optional[:class:`~subway.websockets.ServerWebSocket`]
+            A websocket to leave out, usually the sender.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of websockets of this process the message was written to.
+        """
+        payload = self.encode(data, opcode=opcode)
+        return self.send_encoded(payload, room=room, exclude=exclude)
+
+    def send_encoded(
+        self,
+        payload: bytes,
+        *,
+        room: Optional[str] = None,
+        exclude: Optional[ServerWebSocket] = None
+    ) -> int:
+        """
+        Sends an already encoded frame, as returned by :meth:`encode`, to every websocket in a room
+        or in the hub if no room is given.
+
+        Parameters
+        ----------
+        payload: :class:`bytes`
+            The encoded frame.
+        room: Optional[:class:`str`]
+            The room to send the frame to.
+        exclude: Optional[:class:`~subway.websockets.ServerWebSocket`]
+            A websocket to leave out, usually the sender.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of websockets of this process the frame was written to.
+        """
+        if self.backend is not None:
+            self.backend.publish(room, payload)
+
+        if room is None:
+            websockets: Iterable[ServerWebSocket] = tuple(self._websockets)
+        else:
+            websockets = tuple(self._rooms.get(room, ()))
+
+        return self._deliver(payload, websockets, exclude)
+
+    def _deliver(self, payload: bytes, websockets: Iterable[ServerWebSocket], exclude: Optional[ServerWebSocket]) -> int:
+        max_buffer_size = self.max_buffer_size
+        if self.slow_consumer == 'queue':
+            max_buffer_size = None
+
+        written = 0
+        skipped = 0
+
+        for websocket in websockets:
+            if websocket is exclude or websocket.is_closed():
+                continue
+
+            queue = websocket.send_queue
+            if queue is not None:
+                if queue.put_nowait(payload):
+                    written += 1
+                else:
+                    skipped += 1
+
+                continue
+
+            transport = websocket.writer.transport
+            if transport.is_closing():
+                continue
+
+            if max_buffer_size is not None and transport.get_write_buffer_size() > max_buffer_size:
+                skipped += 1
+                continue
+
+            transport.write(payload)
+            written += 1
+
+        if skipped:
+            self.skipped += skipped
+            log.debug('Skipped %s slow consumers while broadcasting', skipped)
+
+        return written
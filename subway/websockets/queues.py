@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from typing import Deque, Literal, Optional
+import collections
+import asyncio
+
+from subway import compat
+from subway.streams import StreamWriter
+
+__all__ = (
+    'SendQueue',
+)
+
+SendQueuePolicy = Literal['block', 'drop-oldest', 'drop-newest', 'disconnect']
+
+POLICIES = ('block', 'drop-oldest', 'drop-newest', 'disconnect')
+
+class SendQueue:
+    """
+    A bounded queue of encoded frames waiting to be written to a websocket.
+
+    A single writer task drains the queue, writing everything queued at once with
+    :meth:`~subway.streams.StreamWriter.writelines` and then waiting for the transport to drain.
+    Frames are always dropped whole, so the stream of frames stays valid.
+
+    Parameters
+    ----------
+    writer: :class:`~subway.streams.StreamWriter`
+        The writer of the websocket.
+    maxsize: :class:`int`
+        The maximum amount of frames that can be queued.
+    policy: :class:`str`
+        What to do when the queue is full:
+
+        - ``block``: :meth:`put` waits for room, :meth:`put_nowait` drops the new frame.
+        - ``drop-oldest``: the oldest queued frame is dropped to make room.
+        - ``drop-newest``: the new frame is dropped.
+        - ``disconnect``: the connection is aborted.
+
+        Control frames queued with :meth:`put_control` are never subject to the policy.
+
+    Attributes
+    ----------
+    sent: :class:`int`
+        The amount of frames written to the transport.
+    dropped: :class:`int`
+        The amount of frames dropped because the queue was full.
+    max_depth: :class:`int`
+        The highest amount of frames that were queued at once.
+    """
+    def __init__(self, writer: StreamWriter, *, maxsize: int = 1024, policy: SendQueuePolicy = 'block') -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be a positive integer')
+
+        if policy not in POLICIES:
+            raise ValueError(f'Invalid send queue policy {policy!r}. Must be one of {", ".join(POLICIES)}.')
+
+        self.writer = writer
+        self.maxsize = maxsize
+        self.policy = policy
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+        self._frames: Deque[bytes] = collections.deque()
+        self._size = 0
+        self._waiter: Optional[asyncio.Future[None]] = None
+        self._putters: Deque[asyncio.Future[None]] = collections.deque()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f'<SendQueue depth={self.depth} maxsize={self.maxsize} policy={self.policy!r} dropped={self.dropped}>'
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def depth(self) -> int:
+        """
+        The amount of frames currently queued.
+        """
+        return len(self._frames)
+
+    @property
+    def size(self) -> int:
+        """
+        The amount of bytes currently queued.
+        """
+        return self._size
+
+    def full(self) -> bool:
+        """
+        True if the queue is full.
+        """
+        return len(self._frames) >= self.maxsize
+
+    def is_closed(self) -> bool:
+        """
+        True if the queue was closed.
+        """
+        return self._closed
+
+    def _wakeup_writer(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _wakeup_putters(self) -> None:
+        putters = self._putters
+        while putters:
+            putter = putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+
+    def _ensure_writer(self) -> None:
+        if self._task is None:
+            self._task = compat.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        frames = self._frames
+        writer = self.writer
+
+        while not self._closed:
+            if not frames:
+                self._waiter = compat.get_running_loop().create_future()
+                try:
+                    await self._waiter
+                finally:
+                    self._waiter = None
+
+                continue
+
+            if writer.transport.is_closing():
+                break
+
+            batch = list(frames)
+            frames.clear()
+
+            self._size = 0
+            self._wakeup_putters()
+
+            writer.writelines(batch)
+            self.sent += len(batch)
+
+            await writer.drain()
+
+    def put_nowait(self, data: bytes) -> bool:
+        """
+        Queues an encoded frame without waiting, applying the queue's policy if it is full.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The encoded frame.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the frame was queued.
+        """
+        if self._closed:
+            return False
+
+        frames = self._frames
+        if len(frames) >= self.maxsize:
+            self.dropped += 1
+
+            policy = self.policy
+            if policy == 'drop-oldest':
+                self._size -= len(frames.popleft())
+            elif policy == 'disconnect':
+                self.abort()
+                return False
+            else:
+                return False
+
+        self._append(data)
+        return True
+
+    def put_control(self, data: bytes) -> bool:
+        """
+        Queues an encoded control frame, like a close frame or a pong, even if the queue is full.
+        It is queued after the frames already in the queue, so a close frame doesn't cut them off,
+        but it is never dropped and never waits for room.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The encoded frame.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the frame was queued, which is only ``False`` if the queue is closed.
+        """
+        if self._closed:
+            return False
+
+        self._append(data)
+        return True
+
+    def _append(self, data: bytes) -> None:
+        frames = self._frames
+        frames.append(data)
+        self._size += len(data)
+
+        depth = len(frames)
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        self._ensure_writer()
+        self._wakeup_writer()
+
+    async def put(self, data: bytes) -> bool:
+        """
+        Queues an encoded frame. With the ``block`` policy, this waits until there is room.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The encoded frame.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether the frame was queued.
+        """
+        if self.policy == 'block':
+            while not self._closed and self.full():
+                putter = compat.get_running_loop().create_future()
+                self._putters.append(putter)
+
+                try:
+                    await putter
+                except asyncio.CancelledError:
+                    putter.cancel()
+                    raise
+
+        return self.put_nowait(data)
+
+    def close(self) -> None:
+        """
+        Stops the writer task and hands whatever is left in the queue to the transport.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        frames = self._frames
+        if frames and not self.writer.transport.is_closing():
+            self.writer.writelines(list(frames))
+            self.sent += len(frames)
+
+        frames.clear()
+        self._size = 0
+
+        self._wakeup_putters()
+
+    def abort(self) -> None:
+        """
+        Drops everything queued and aborts the connection.
+        """
+        self._frames.clear()
+        self.close()
+
+        self.writer.transport.abort()
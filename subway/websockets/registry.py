@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Set
+import itertools
+import asyncio
+import logging
+
+from subway import compat
+from .enums import WebSocketCloseCode
+from .hub import WebSocketHub
+from .websocket import ServerWebSocket
+
+__all__ = (
+    'WebSocketRegistry',
+)
+
+log = logging.getLogger(__name__)
+
+class WebSocketRegistry(WebSocketHub):
+    """
+    Keeps track of open server websockets, with lookups by id, tag and room.
+
+    Websockets are removed as soon as they are closed, so membership checks, lookups and :func:`len`
+    are constant time and the registry never grows past the amount of open connections.
+    Since this is a :class:`~subway.websockets.WebSocketHub`, messages can be broadcasted to every registered
+    websocket or to a room.
+
+    Parameters
+    ----------
+    **kwargs: Any
+        Passed to :class:`~subway.websockets.WebSocketHub`.
+
+    Example
+    -------
+    .. code-block:: python3
+
+        @app.websocket('/chat/{user_id}')
+        async def chat(request, websocket, user_id: int):
+            app.websocket_registry.tag(websocket, f'user:{user_id}')
+            ...
+
+        async def kick(user_id: int):
+            for websocket in app.websocket_registry.tagged(f'user:{user_id}'):
+                await websocket.close()
+    """
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+
+        self._counter = itertools.count(1)
+        self._ids: Dict[int, ServerWebSocket] = {}
+        self._ids_of: Dict[ServerWebSocket, int] = {}
+        self._tags: Dict[str, Set[ServerWebSocket]] = {}
+        self._tags_of: Dict[ServerWebSocket, Set[str]] = {}
+
+    def __repr__(self) -> str:
+        return f'<WebSocketRegistry websockets={len(self._websockets)} rooms={len(self._rooms)} tags={len(self._tags)}>'
+
+    def __iter__(self) -> Iterator[ServerWebSocket]:
+        return iter(tuple(self._websockets))
+
+    @property
+    def tags(self) -> List[str]:
+        """
+        All the tags that at least one websocket has.
+        """
+        return list(self._tags)
+
+    def add(self, websocket: ServerWebSocket) -> None:
+        """
+        Registers a websocket, giving it an id.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket to add.
+
+        Raises
+        ------
+        TypeError
+            If the websocket is not a server websocket.
+        """
+        if websocket in self._websockets:
+            return
+
+        super().add(websocket)
+        if websocket not in self._websockets:
+            # Closed websockets are removed right away by the close callback.
+            return
+
+        id = next(self._counter)
+        self._ids[id] = websocket
+        self._ids_of[websocket] = id
+
+    def remove(self, websocket: ServerWebSocket) -> None:
+        """
+        Unregisters a websocket, removing it from all of its rooms and tags.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket to remove.
+        """
+        id = self._ids_of.pop(websocket, None)
+        if id is not None:
+            del self._ids[id]
+
+        tags = self._tags_of.pop(websocket, None)
+        if tags is not None:
+            for tag in tags:
+                self._discard(self._tags, tag, websocket)
+
+        super().remove(websocket)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[ServerWebSocket]], key: str, websocket: ServerWebSocket) -> None:
+        members = index.get(key)
+        if members is None:
+            return
+
+        members.discard(websocket)
+        if not members:
+            del index[key]
+
+    def get(self, id: int) -> Optional[ServerWebSocket]:
+        """
+        Returns the websocket with the given id, or ``None`` if there is no such websocket.
+
+        Parameters
+        ----------
+        id: :class:`int`
+            The id of the websocket.
+        """
+        return self._ids.get(id)
+
+    def id_of(self, websocket: ServerWebSocket) -> Optional[int]:
+        """
+        Returns the id of a websocket, or ``None`` if it is not registered.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        """
+        return self._ids_of.get(websocket)
+
+    def tag(self, websocket: ServerWebSocket, *tags: str) -> None:
+        """
+        Adds tags to a websocket, registering it if needed.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        *tags: :class:`str`
+            The tags to add.
+        """
+        self.add(websocket)
+        if websocket.is_closed():
+            return
+
+        current = self._tags_of.setdefault(websocket, set())
+        for tag in tags:
+            current.add(tag)
+            self._tags.setdefault(tag, set()).add(websocket)
+
+    def untag(self, websocket: ServerWebSocket, *tags: str) -> None:
+        """
+        Removes tags from a websocket.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        *tags: :class:`str`
+            The tags to remove.
+        """
+        current = self._tags_of.get(websocket)
+        if current is None:
+            return
+
+        for tag in tags:
+            current.discard(tag)
+            self._discard(self._tags, tag, websocket)
+
+    def tagged(self, tag: str) -> List[ServerWebSocket]:
+        """
+        Returns the websockets with a tag.
+
+        Parameters
+        ----------
+        tag: :class:`str`
+            The tag.
+        """
+        return list(self._tags.get(tag, ()))
+
+    def tags_of(self, websocket: ServerWebSocket) -> List[str]:
+        """
+        Returns the tags of a websocket.
+
+        Parameters
+        ----------
+        websocket: :class:`~subway.websockets.ServerWebSocket`
+            The websocket.
+        """
+        return list(self._tags_of.get(websocket, ()))
+
+    async def close_all(
+        self,
+        *,
+        code: WebSocketCloseCode = WebSocketCloseCode.GOING_AWAY,
+        batch_size: int = 1000,
+        timeout: Optional[float] = 10.0
+    ) -> int:
+        """
+        Closes every registered websocket.
+
+        Websockets are closed concurrently, ``batch_size`` at a time. Once ``timeout`` seconds have passed,
+        the websockets that are still open are aborted instead of waiting for their closing handshakes.
+
+        Parameters
+        ----------
+        code: :class:`~subway.websockets.WebSocketCloseCode`
+            The close code sent to the websockets.
+        batch_size: :class:`int`
+            The maximum amount of websockets being closed at once.
+        timeout: Optional[:class:`float`]
+            The amount of seconds to wait for, in total. ``None`` means no deadline.
+
+        Returns
+        -------
+        :class:`int`
+            The amount of websockets that had to be aborted.
+        """
+        if batch_size <= 0:
+            raise ValueError('batch_size must be a positive integer')
+
+        loop = compat.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        websockets = [websocket for websocket in self._websockets if not websocket.is_closed()]
+
+        for start in range(0, len(websockets), batch_size):
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+
+            tasks = [loop.create_task(websocket.close(code=code)) for websocket in websockets[start:start + batch_size]]
+            done, pending = await asyncio.wait(tasks, timeout=remaining)
+
+            for task in pending:
+                task.cancel()
+
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    log.debug('Failed to close a websocket', exc_info=task.exception())
+
+        aborted = 0
+        for websocket in websockets:
+            if not websocket.is_closed():
+                websocket.abort()
+                aborted += 1
+
+            self.remove(websocket)
+
+        if aborted:
+            log.warning('Aborted %s websockets that did not close in time', aborted)
+
+        return aborted
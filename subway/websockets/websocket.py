@@ -1,31 +1,163 @@
-from typing import Any, Dict, List, Optional, Union
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, NoReturn, Optional, Union
+import collections
 import asyncio
+import codecs
+import time
 
 from subway.streams import StreamProtocol, StreamReader, StreamWriter, get_address
 from subway.utils import clear_docstring, warn, dumps
 from subway.types import BytesLike
-from .frame import WebSocketFrame, WebSocketOpcode, Data, WebSocketCloseCode
+from .frame import WebSocketFrame, WebSocketOpcode, WebSocketParser, Data, WebSocketCloseCode
+from .compression import DeflateContext
+from .queues import SendQueue, SendQueuePolicy
 from .enums import WebSocketState
-from .errors import WebSocketError, WebSocketWarning
+from .errors import (
+    WebSocketError, 
+    WebSocketWarning, 
+    InvalidWebSocketFrame, 
+    InvalidWebSocketPayload, 
+    MessageTooLarge
+)
 
 __all__ = (
     'WebSocketProtocol',
     'ServerWebSocket',
     'ClientWebSocket',
-    'WebSocket'
+    'WebSocket',
+    'DEFAULT_MAX_MESSAGE_SIZE',
 )
 
 WebSocketData = Union[str, BytesLike, Dict[Any, Any], List[Any]]
 
+DEFAULT_MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+# Unmasked payloads at least this big are written separately from their header instead of being copied after it.
+# Below that, the copy is cheaper than the extra write.
+ZERO_COPY_THRESHOLD = 16 * 1024
+
 class WebSocketProtocol(StreamProtocol):
-    def __init__(self, reader: StreamReader, writer: StreamWriter, waiter: asyncio.Future[None]) -> None:
+    """
+    The protocol installed on a connection once it has been upgraded to a websocket.
+    Once a websocket is attached, incoming data is parsed into frames as it arrives
+    instead of going through the reader. Reading from the transport is paused while more than twice ``limit``
+    bytes of frames are waiting to be received, and resumed once the websocket is down to ``limit``.
+
+    Parameters
+    -----------
+    reader: :class:`~subway.streams.StreamReader`
+        The reader used by the connection before the upgrade.
+    writer: :class:`~subway.streams.StreamWriter`
+        The writer of the connection.
+    waiter: :class:`asyncio.Future`
+        The future resolved when the connection is lost.
+    websocket: Optional[:class:`~.BaseWebSocket`]
+        The websocket to deliver the frames to.
+    limit: :class:`int`
+        The amount of bytes of queued frames reading from the transport resumes at.
+
+    Attributes
+    -----------
+    buffered: :class:`int`
+        The amount of bytes of frames parsed but not received by the websocket yet.
+    """
+    def __init__(
+        self, 
+        reader: StreamReader, 
+        writer: StreamWriter, 
+        waiter: asyncio.Future[None],
+        websocket: Optional[BaseWebSocket] = None,
+        *,
+        limit: int = 65536
+    ) -> None:
         self.reader = reader
         self.writer = writer
         self.waiter = waiter
+        self.paused = False
+        self.limit = limit
+        self.buffered = 0
+        self.reading_paused = False
+        self.parser = WebSocketParser()
+        self.websocket: Optional[BaseWebSocket] = None
+
+        if websocket is not None:
+            self.attach(websocket)
 
     async def wait_until_connected(self) -> None:
         await asyncio.sleep(0)
 
+    def attach(self, websocket: BaseWebSocket) -> None:
+        """
+        Starts delivering frames to the given websocket. Anything left in the reader's buffer is parsed first.
+
+        Parameters
+        -----------
+        websocket: :class:`~.BaseWebSocket`
+            The websocket to deliver the frames to.
+        """
+        self.websocket = websocket
+        self.parser.allow_rsv1 = websocket.compression is not None
+        websocket._protocol = self
+
+        data = self.reader.reset()
+        if data:
+            self.data_received(data)
+
+        if self.reader.at_eof():
+            self.eof_received()
+
+    def data_received(self, data: bytes) -> None:
+        websocket = self.websocket
+        if websocket is None:
+            return self.reader.feed_data(data)
+
+        if websocket._exception is not None:
+            return
+
+        self.parser.max_size = websocket.max_message_size
+
+        try:
+            for frame in self.parser.feed(data):
+                self.buffered += len(frame.data)
+                websocket._feed_frame(frame)
+        except WebSocketError as exc:
+            websocket._set_exception(exc)
+
+        # A peer that sends faster than the frames are received would otherwise grow the queue without limit.
+        if not self.reading_paused and self.buffered > self.limit * 2:
+            self.reading_paused = True
+            self.writer.transport.pause_reading()
+
+    def frame_received(self, frame: WebSocketFrame) -> None:
+        """
+        Called by the websocket once it took a frame out of its queue, resumes reading if it was paused
+        and the queue is small enough again.
+
+        Parameters
+        -----------
+        frame: :class:`~subway.websockets.frame.WebSocketFrame`
+            The frame.
+        """
+        self.buffered -= len(frame.data)
+
+        if self.reading_paused and self.buffered <= self.limit:
+            self.reading_paused = False
+            self.writer.transport.resume_reading()
+
+    def eof_received(self) -> None:
+        if self.websocket is not None:
+            self.websocket._set_exception(WebSocketError('Connection closed by the remote endpoint'))
+
+        self.reader.feed_eof()
+
+    def connection_lost(self, exc: Optional[BaseException]) -> None:
+        if self.websocket is not None:
+            self.websocket._set_exception(exc or WebSocketError('Connection lost'))
+            self.websocket._mark_closed()
+
+        super().connection_lost(exc)
+
 
 class BaseWebSocket:
     """
@@ -38,14 +170,60 @@ class BaseWebSocket:
         The writer to use.
     reader: :class:`~subway.streams.StreamReader`
         The reader to use.
+    compression: Optional[:class:`~subway.websockets.DeflateContext`]
+        The negotiated permessage-deflate state, if any.
+    max_message_size: Optional[:class:`int`]
+        The maximum size of a message received through :meth:`receive_message`. ``None`` means no limit.
+        Frames longer than it are rejected by every receive method before their payload is buffered.
+    ping_interval: Optional[:class:`float`]
+        How many seconds without receiving anything before a ping is sent. ``None`` disables pings.
+    ping_timeout: Optional[:class:`float`]
+        How many seconds to wait for the peer to respond to a ping before the connection is aborted.
+        ``None`` means the connection is never aborted.
+
+    Attributes
+    -----------
+    max_message_size: Optional[:class:`int`]
+        The maximum size of a message received through :meth:`receive_message`.
+    ping_interval: Optional[:class:`float`]
+        How many seconds without receiving anything before a ping is sent.
+        Pings are sent by a :class:`~subway.websockets.Heartbeat` the websocket was added to.
+    ping_timeout: Optional[:class:`float`]
+        How many seconds to wait for the peer to respond to a ping before the connection is aborted.
     """
-    def __init__(self, writer: StreamWriter, reader: StreamReader) -> None:
+    _masked = True
+
+    def __init__(
+        self, 
+        writer: StreamWriter, 
+        reader: StreamReader, 
+        *, 
+        compression: Optional[DeflateContext] = None,
+        max_message_size: Optional[int] = DEFAULT_MAX_MESSAGE_SIZE,
+        ping_interval: Optional[float] = None,
+        ping_timeout: Optional[float] = None
+    ) -> None:
+        self.max_message_size = max_message_size
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+
         self._writer = writer
         self._reader = reader
+        self._compression = compression
+        self._inflating = False
+        self._inflated = 0
         self._closed = False
         self._received_close_frame = False
         self._state = WebSocketState.OPEN
 
+        self._protocol: Optional[WebSocketProtocol] = None
+        self._frames: Deque[WebSocketFrame] = collections.deque()
+        self._frame_waiter: Optional[asyncio.Future[None]] = None
+        self._exception: Optional[BaseException] = None
+        self._close_callbacks: List[Callable[[BaseWebSocket], Any]] = []
+        self._send_queue: Optional[SendQueue] = None
+        self._last_activity = time.monotonic()
+
     def __repr__(self) -> str:
         return f'<WebSocket state={self.state}>'
 
@@ -53,7 +231,7 @@ class BaseWebSocket:
         return self
 
     async def __anext__(self) -> Data:
-        data = await self.receive()
+        data = await self.receive_message()
         if data.opcode is WebSocketOpcode.CLOSE:
             raise StopAsyncIteration
 
@@ -69,6 +247,115 @@ class BaseWebSocket:
     def _set_state(self, state: WebSocketState):
         self._state = state
 
+    def _mark_closed(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._set_state(WebSocketState.CLOSED)
+
+        if self._send_queue is not None:
+            self._send_queue.close()
+
+        callbacks, self._close_callbacks = self._close_callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_close_callback(self, callback: Callable[[BaseWebSocket], Any]) -> None:
+        """
+        Registers a callback that gets called with the websocket once it is closed,
+        either through :meth:`close` or because the connection was lost.
+        The callback is called right away if the websocket is already closed.
+
+        Parameters
+        -----------
+        callback: Callable[[:class:`~.BaseWebSocket`], Any]
+            The callback to register.
+        """
+        if self._closed:
+            callback(self)
+            return
+
+        self._close_callbacks.append(callback)
+
+    def remove_close_callback(self, callback: Callable[[BaseWebSocket], Any]) -> None:
+        """
+        Removes a callback registered with :meth:`add_close_callback`.
+
+        Parameters
+        -----------
+        callback: Callable[[:class:`~.BaseWebSocket`], Any]
+            The callback to remove.
+        """
+        try:
+            self._close_callbacks.remove(callback)
+        except ValueError:
+            pass
+
+    def _wakeup_waiter(self) -> None:
+        waiter = self._frame_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _feed_frame(self, frame: WebSocketFrame) -> None:
+        self._last_activity = time.monotonic()
+        self._frames.append(frame)
+        self._wakeup_waiter()
+
+    def _set_exception(self, exc: BaseException) -> None:
+        if self._exception is None:
+            self._exception = exc
+
+        self._wakeup_waiter()
+
+    async def _receive_frame(self) -> WebSocketFrame:
+        frames = self._frames
+
+        while not frames:
+            if self._exception is not None:
+                raise self._exception
+
+            if self._frame_waiter is not None:
+                raise RuntimeError('Already waiting for a frame')
+
+            self._frame_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._frame_waiter
+            finally:
+                self._frame_waiter = None
+
+        frame = frames.popleft()
+        if self._protocol is not None:
+            self._protocol.frame_received(frame)
+
+        return frame
+
+    def _inflate(self, frame: WebSocketFrame, max_size: Optional[int]) -> WebSocketFrame:
+        if frame.is_control():
+            return frame
+
+        if frame.opcode != WebSocketOpcode.CONTINUATION:
+            self._inflating = frame.rsv1
+            self._inflated = 0
+
+        if self._inflating:
+            assert self._compression is not None
+
+            # The limit applies to the whole message, so later frames only get what earlier ones left.
+            allowance = None if max_size is None else max_size - self._inflated
+            try:
+                frame.data = self._compression.decompress(frame.data, final=frame.fin, max_size=allowance)
+            except MessageTooLarge as exc:
+                raise MessageTooLarge(self._inflated + exc.size, max_size) from None  # type: ignore
+
+            self._inflated += len(frame.data)
+            frame.rsv1 = False
+
+        if frame.fin:
+            self._inflating = False
+
+        return frame
+
     @property
     def state(self):
         """
@@ -76,6 +363,39 @@ class BaseWebSocket:
         """
         return self._state
 
+    @property
+    def compression(self) -> Optional[DeflateContext]:
+        """
+        The negotiated permessage-deflate state, ``None`` if messages are not compressed.
+        """
+        return self._compression
+
+    @property
+    def send_queue(self) -> Optional[SendQueue]:
+        """
+        The outbound queue of the websocket, ``None`` unless :meth:`enable_send_queue` was called.
+        """
+        return self._send_queue
+
+    def enable_send_queue(self, maxsize: int = 1024, *, policy: SendQueuePolicy = 'block') -> SendQueue:
+        """
+        Makes frames go through a bounded queue drained by a writer task instead of being written directly,
+        so a slow peer doesn't stall the task sending to it.
+
+        Parameters
+        -----------
+        maxsize: :class:`int`
+            The maximum amount of frames that can be queued.
+        policy: :class:`str`
+            What to do when the queue is full. One of ``block``, ``drop-oldest``, ``drop-newest`` or ``disconnect``.
+            See :class:`~subway.websockets.SendQueue`.
+        """
+        if self._send_queue is not None:
+            raise RuntimeError('Send queue is already enabled')
+
+        self._send_queue = queue = SendQueue(self.writer, maxsize=maxsize, policy=policy)
+        return queue
+
     @property
     def writer(self):
         """
@@ -145,6 +465,53 @@ class BaseWebSocket:
         """
         await self.writer.wait_closed()
 
+    @property
+    def last_activity(self) -> float:
+        """
+        The :func:`time.monotonic` timestamp of the last frame received.
+        """
+        return self._last_activity
+
+    def write_nowait(self, data: BytesLike) -> bool:
+        """
+        Writes an already encoded frame without waiting, through the send queue if one is enabled.
+
+        Parameters
+        -----------
+        data: :class:`bytes`
+            The encoded frame.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether the frame was written or queued.
+        """
+        if self.is_closed():
+            return False
+
+        if self._send_queue is not None:
+            return self._send_queue.put_nowait(data)  # type: ignore
+
+        transport = self.writer.transport
+        if transport.is_closing():
+            return False
+
+        transport.write(data)
+        return True
+
+    def abort(self) -> None:
+        """
+        Closes the connection right away, without the closing handshake.
+        """
+        self._set_exception(WebSocketError('websocket was aborted'))
+
+        if self._send_queue is not None:
+            self._send_queue.abort()
+        else:
+            self.writer.transport.abort()
+
+        self._mark_closed()
+
     async def send_frame(self, frame: WebSocketFrame, *, masked: bool = True) -> int:
         """
         Sends a frame.
@@ -160,7 +527,35 @@ class BaseWebSocket:
         if self.should_close() and frame.opcode is not WebSocketOpcode.CLOSE:
             warn('websocket is closing, sending frame anyway.', WebSocketWarning, stacklevel=5)
 
+        compression = self._compression
+        if (
+            compression is not None and frame.fin and not frame.rsv1
+            and frame.opcode in (WebSocketOpcode.TEXT, WebSocketOpcode.BINARY)
+            and compression.should_compress(frame.data)
+        ):
+            frame.data = compression.compress(frame.data)
+            frame.rsv1 = True
+
+        queue = self._send_queue
+        if queue is None and not masked and frame.close_code is None and len(frame.data) >= ZERO_COPY_THRESHOLD:
+            frame.ensure()
+            return await self._send_parts(frame.encode_header(len(frame.data)), frame.data)
+
         data = frame.encode(masked=masked)
+
+        if queue is not None:
+            # Control frames skip the queue's policy, a full queue must not drop or hold up a close frame.
+            if frame.is_control():
+                return len(data) if queue.put_control(data) else 0
+
+            if not await queue.put(data):
+                if queue.policy == 'disconnect':
+                    raise WebSocketError('websocket was disconnected because its send queue was full')
+
+                return 0
+
+            return len(data)
+
         self._set_state(WebSocketState.SENDING)
 
         await self.writer.write(data, drain=True)
@@ -168,6 +563,16 @@ class BaseWebSocket:
 
         return len(data)
 
+    async def _send_parts(self, header: bytearray, payload: BytesLike) -> int:
+        self._set_state(WebSocketState.SENDING)
+
+        # Writing the payload on its own lets the transport send it without copying it into the header's buffer.
+        self.writer.write(header)
+        await self.writer.write(payload, drain=True)
+
+        self._set_state(WebSocketState.OPEN)
+        return len(header) + len(payload)
+
     async def send_bytes(self, data: BytesLike, *, opcode: Optional[WebSocketOpcode]=None):
         """
         Sends bytes.
@@ -175,7 +580,8 @@ class BaseWebSocket:
         Parameters
         -----------
         data: :class:`bytes`
-            The data to send. Can be any bytes-like object.
+            The data to send. Can be any bytes-like object. Large payloads are written without being copied,
+            so a :class:`memoryview` over an existing buffer can be sent as is.
         opcode: :class:`~subway.websockets.frame.WebSocketOpcode`
             The opcode to use. Defaults to :attr:`~subway.websockets.frame.WebSocketOpcode.TEXT`.
         """
@@ -285,16 +691,29 @@ class BaseWebSocket:
         frame.close_code = code.value
 
         await self.send_frame(frame) 
+
+        if self._send_queue is not None:
+            self._send_queue.close()
+
         self.writer.close()
 
-        self._set_state(WebSocketState.CLOSED)
-        self._closed = True  
+        self._mark_closed()
 
     async def receive(self) -> Data:
         """
-        Receives data.
+        Receives a single frame, as is. See :meth:`receive_message` for receiving whole messages.
+        Compressed messages are inflated up to :attr:`max_message_size`.
+
+        Raises
+        -------
+        MessageTooLarge
+            If a frame is longer than :attr:`max_message_size` or a compressed message inflates to more than it,
+            the websocket is closed.
         """
-        if self.is_closed():
+        return await self._receive(self.max_message_size)
+
+    async def _receive(self, max_size: Optional[int]) -> Data:
+        if self.is_closed() and not self._frames:
             raise WebSocketError('websocket is closed')
 
         if self.should_close():
@@ -302,7 +721,23 @@ class BaseWebSocket:
             warn(msg, WebSocketWarning, stacklevel=5)
 
         self._set_state(WebSocketState.RECEIVING)
-        frame = await WebSocketFrame.decode(self.reader.read)
+
+        try:
+            if self._protocol is not None:
+                frame = await self._receive_frame()
+            else:
+                frame = await WebSocketFrame.decode(
+                    self.reader.read, allow_rsv1=self._compression is not None, max_size=self.max_message_size
+                )
+                self._last_activity = time.monotonic()
+        except MessageTooLarge as exc:
+            await self._fail(WebSocketCloseCode.TOO_LARGE, exc)
+
+        if self._compression is not None:
+            try:
+                frame = self._inflate(frame, max_size)
+            except MessageTooLarge as exc:
+                await self._fail(WebSocketCloseCode.TOO_LARGE, exc)
 
         self._set_state(WebSocketState.OPEN)
         data = Data(frame)
@@ -313,25 +748,193 @@ class BaseWebSocket:
 
         return data
 
+    async def _fail(self, code: WebSocketCloseCode, exc: WebSocketError) -> NoReturn:
+        if not self.is_closed():
+            await self.close(code=code)
+
+        raise exc
+
+    async def _receive_data_frame(self, max_size: Optional[int]) -> WebSocketFrame:
+        while True:
+            data = await self._receive(max_size)
+            frame = data.frame
+
+            opcode = frame.opcode
+            if opcode is WebSocketOpcode.PING:
+                if not self.is_closed():
+                    await self.pong(frame.data)
+
+                continue
+            elif opcode is WebSocketOpcode.PONG:
+                continue
+            elif opcode not in (
+                WebSocketOpcode.TEXT, WebSocketOpcode.BINARY, WebSocketOpcode.CONTINUATION, WebSocketOpcode.CLOSE
+            ):
+                error = InvalidWebSocketFrame(f'Received a frame with an unsupported opcode: {opcode}')
+                await self._fail(WebSocketCloseCode.PROTOCOL_ERROR, error)
+
+            return frame
+
+    async def _receive_first_frame(self, max_size: Optional[int]) -> WebSocketFrame:
+        frame = await self._receive_data_frame(max_size)
+        if frame.opcode is WebSocketOpcode.CONTINUATION:
+            error = InvalidWebSocketFrame('Received a continuation frame without a message to continue')
+            await self._fail(WebSocketCloseCode.PROTOCOL_ERROR, error)
+
+        return frame
+
+    async def _receive_continuation_frame(self, max_size: Optional[int]) -> WebSocketFrame:
+        frame = await self._receive_data_frame(max_size)
+        if frame.opcode is not WebSocketOpcode.CONTINUATION and frame.opcode is not WebSocketOpcode.CLOSE:
+            error = InvalidWebSocketFrame('Received a new message before the previous one was finished')
+            await self._fail(WebSocketCloseCode.PROTOCOL_ERROR, error)
+
+        return frame
+
+    async def _validate_text(self, decoder: codecs.IncrementalDecoder, data: bytes, final: bool) -> None:
+        try:
+            decoder.decode(data, final)
+        except UnicodeDecodeError:
+            error = InvalidWebSocketPayload('Received a text message that is not valid UTF-8')
+            await self._fail(WebSocketCloseCode.UNSUPPORTED_PAYLOAD, error)
+
+    async def receive_message(self, *, max_size: Optional[int] = None) -> Data:
+        """
+        Receives a whole message, reassembling it if it was fragmented.
+        Pings received in the meantime are answered and pongs are skipped.
+        If a close frame is received it is returned as is, dropping any partially received message.
+
+        Parameters
+        -----------
+        max_size: Optional[:class:`int`]
+            The maximum size of the message. Defaults to :attr:`max_message_size`.
+            Single frames are always limited to :attr:`max_message_size`, they are rejected as soon as their
+            header is received so their payload is never buffered.
+
+        Raises
+        -------
+        MessageTooLarge
+            If the message exceeds the maximum size, the websocket is closed.
+        InvalidWebSocketPayload
+            If a text message is not valid UTF-8, the websocket is closed.
+        InvalidWebSocketFrame
+            If the frames received don't form a valid message, the websocket is closed.
+        """
+        if max_size is None:
+            max_size = self.max_message_size
+
+        frame = await self._receive_first_frame(max_size)
+        opcode = frame.opcode
+
+        if opcode is WebSocketOpcode.CLOSE:
+            return Data(frame)
+
+        decoder = None
+        if opcode is WebSocketOpcode.TEXT:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+
+        chunks: List[bytes] = []
+        size = 0
+
+        while True:
+            size += len(frame.data)
+            if max_size is not None and size > max_size:
+                await self._fail(WebSocketCloseCode.TOO_LARGE, MessageTooLarge(size, max_size))
+
+            if decoder is not None:
+                await self._validate_text(decoder, frame.data, frame.fin)
+
+            if frame.fin and not chunks:
+                return Data(frame)
+
+            chunks.append(frame.data)
+            if frame.fin:
+                break
+
+            frame = await self._receive_continuation_frame(max_size)
+            if frame.opcode is WebSocketOpcode.CLOSE:
+                return Data(frame)
+
+        return Data(WebSocketFrame.create(b''.join(chunks), opcode=opcode))
+
+    async def receive_stream(self) -> AsyncIterator[bytes]:
+        """
+        Receives a message fragment by fragment, yielding the payload of each frame as it arrives.
+        The message isn't buffered so :attr:`max_message_size` only limits the size of each frame.
+        Pings received in the meantime are answered and pongs are skipped.
+
+        Example
+        --------
+        .. code-block:: python3
+
+            with open('upload.bin', 'wb') as f:
+                async for chunk in websocket.receive_stream():
+                    f.write(chunk)
+
+        Raises
+        -------
+        WebSocketError
+            If a close frame is received before the message is finished.
+        InvalidWebSocketPayload
+            If a text message is not valid UTF-8, the websocket is closed.
+        InvalidWebSocketFrame
+            If the frames received don't form a valid message, the websocket is closed.
+        """
+        frame = await self._receive_first_frame(self.max_message_size)
+        if frame.opcode is WebSocketOpcode.CLOSE:
+            return
+
+        decoder = None
+        if frame.opcode is WebSocketOpcode.TEXT:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+
+        while True:
+            if decoder is not None:
+                await self._validate_text(decoder, frame.data, frame.fin)
+
+            yield frame.data if isinstance(frame.data, bytes) else bytes(frame.data)
+            if frame.fin:
+                return
+
+            # Every frame gets the whole allowance, since the frames before it weren't kept.
+            self._inflated = 0
+
+            frame = await self._receive_continuation_frame(self.max_message_size)
+            if frame.opcode is WebSocketOpcode.CLOSE:
+                raise WebSocketError('Received a close frame before the message was finished')
+
     async def receive_bytes(self):
         """
-        Receives bytes.
+        Receives a whole message as bytes.
         """
-        data = await self.receive()
+        data = await self.receive_message()
         return data.data
 
+    async def receive_view(self, *, max_size: Optional[int] = None) -> memoryview:
+        """
+        Receives a whole message as a :class:`memoryview` into the buffer it was received in,
+        without copying unfragmented messages. Use :meth:`memoryview.tobytes` to get a copy of it.
+
+        Parameters
+        -----------
+        max_size: Optional[:class:`int`]
+            The maximum size of the message. Defaults to :attr:`max_message_size`.
+        """
+        data = await self.receive_message(max_size=max_size)
+        return data.view
+
     async def receive_str(self):
         """
-        Receives a string.
+        Receives a whole message as a string.
         """
-        data = await self.receive()
+        data = await self.receive_message()
         return data.text()
 
     async def receive_json(self):
         """
-        Receives a JSON object.
+        Receives a whole message as a JSON object.
         """
-        data = await self.receive()
+        data = await self.receive_message()
         return data.json()
 
 
@@ -339,6 +942,8 @@ class ServerWebSocket(BaseWebSocket):
     """
     A server-side websocket.
     """
+    _masked = False
+
     @clear_docstring
     def send_frame(self, frame: WebSocketFrame):
         return super().send_frame(frame, masked=False)
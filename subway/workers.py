@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any
 import asyncio
 import logging
 import datetime
+import time
 
 from .utils import CLRF
 from .server import TCPServer
@@ -39,10 +40,13 @@ class Worker(TCPServer):
         The application instance.
     id: :class:`int`
         The id of the worker.
+    heartbeat: :class:`~subway.websockets.Heartbeat`
+        The heartbeat that keeps the websockets of this worker alive.
     """
     def __init__(self, app: Application, id: int):
         self.app: Application = app
         self.id: int = id
+        self.heartbeat = websockets.Heartbeat()
 
         self._ready = asyncio.Event()
         self._serving = False
@@ -73,6 +77,7 @@ class Worker(TCPServer):
 
     async def serve(self) -> None: 
         await super().serve(sock=self.app.socket)
+        self.heartbeat.start()
 
         self._ready.set()
         self._serving = True
@@ -86,6 +91,7 @@ class Worker(TCPServer):
         except ValueError:
             pass
 
+        self.heartbeat.stop()
         self._ready.clear()
         self.app.dispatch('worker_shutdown', self)
         log.info(f'[Worker-{self.id}] Stopped serving.')
@@ -101,22 +107,32 @@ class Worker(TCPServer):
         except (asyncio.TimeoutError, KeyboardInterrupt, PartialRead):
             return writer.close()
 
-        peername = writer.get_extra_info('peername')
+        start = time.perf_counter()
         created_at = datetime.datetime.utcnow()
 
         request = await Request.parse(status_line, reader, writer, self, created_at)
         
         if request.version != 'HTTP/1.1':
             response = HTTPVersionNotSupported()
-            return await request.send(response, convert=False)
+            await request.send(response, convert=False)
+
+            return self._log_access(request, start)
 
         self.app.dispatch('request', request, self)
-        log.info(f'[Worker-{self.id}] Received a {request.method!r} request to {request.url.path!r} from {peername}')
+
+        if log.isEnabledFor(logging.INFO):
+            peername = writer.get_extra_info('peername')
+            log.info('[Worker-%s] Received a %r request to %r from %s', self.id, request.method, request.url.path, peername)
 
         websocket = None
 
         if request.is_websocket():
-            websocket = await request.handshake()
+            websocket = await request.handshake(compression=self.app.websocket_compression)
 
         await self.app._request_handler(request=request, websocket=websocket)
-        
\ No newline at end of file
+        self._log_access(request, start)
+
+    def _log_access(self, request: Request[Application], start: float) -> None:
+        access_log = self.app.access_log
+        if access_log is not None:
+            access_log.log(request, time.perf_counter() - start)